@@ -1,24 +1,44 @@
 import streamlit as st
-import pandas as pd
-import joblib
 import json
 import os
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-import yfinance as yf
 from datetime import datetime
 
+# Modul berat (pandas, plotly, joblib/sklearn, yfinance) diimpor di menu yang
+# memakainya saja; menu 0 cukup membaca JSON. Anggaran cold start dijaga oleh
+# benchmarks/bench_cold_start.py.
+from saham import trace
+from saham.universe import featured
+
+# Bank fokus (artefak riset lengkap) dari registry Data/universe.csv
+BANKS = featured()
+
 # --- FUNGSI LOAD DATA LIVE ---
+@st.cache_resource
+def get_price_store():
+    from saham.price_store import open_store
+    # Store kolumnar lokal, di-seed dari Data/Raw saat pertama kali dibuka
+    return open_store()
+
+@st.cache_resource
+def get_market_cache():
+    from saham.market_cache import MarketDataCache, Prefetcher, store_loader
+    from saham.price_store import YahooFetcher
+    # Cache bersama semua sesi + prefetch 5 bank selama jam bursa IDX
+    # (refresh_many ke store, lalu window baru langsung masuk cache)
+    store, fetcher = get_price_store(), YahooFetcher()
+    cache = MarketDataCache(store_loader(store, fetcher))
+    Prefetcher(cache, BANKS, store=store, fetcher=fetcher).start()
+    trace.register_collector("market_cache", cache.stats)
+    return cache
+
 def get_live_data(ticker_symbol):
-    ticker_map = {"BBCA": "BBCA.JK", "BBRI": "BBRI.JK", "BMRI": "BMRI.JK", "BBNI": "BBNI.JK", "BBTN": "BBTN.JK"}
-    symbol = ticker_map.get(ticker_symbol)
+    from saham.market_cache import FetchError
     try:
-        # Ambil 60 hari agar indikator teknikal bisa dihitung jika perlu
-        data = yf.download(symbol, period="60d", interval="1d")
-        return data
-    except:
-        return pd.DataFrame()
+        # Ambil 60 bar terakhir agar indikator teknikal bisa dihitung
+        return get_market_cache().get(ticker_symbol, "1d", "60d")
+    except FetchError:
+        # Koneksi gagal: tetap pakai histori lokal yang ada
+        return get_price_store().tail(ticker_symbol, 60)
 
 # --- KONFIGURASI HALAMAN ---
 st.set_page_config(page_title="Kecerdasan Buatan Hasil Kelompok 6", layout="wide")
@@ -33,17 +53,78 @@ def load_json_data(file_path):
     return {}
 
 # --- LOAD ASSETS ---
+def file_version(*paths):
+    # mtime file artefak: kunci cache di bawah ikut berubah setelah retrain / ekspor ulang
+    return tuple(os.path.getmtime(p) if os.path.exists(p) else 0.0 for p in paths)
+
+def artifact_version(bank):
+    # bundle, .pkl bank, model pooled
+    return file_version("Models/Bundles/sector.bundle", f"Models/Trained/{bank}_rf_model.pkl",
+                        f"Models/Scalers/{bank}_scaler.pkl", "Models/Pooled/meta.json")
+
 @st.cache_resource
-def load_model_assets(bank):
-    # Load model dan scaler sesuai struktur folder lokal/GitHub
-    model_path = f"Models/Trained/{bank}_rf_model.pkl"
-    scaler_path = f"Models/Scalers/{bank}_scaler.pkl"
-    
-    if os.path.exists(model_path) and os.path.exists(scaler_path):
-        model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path)
-        return model, scaler
-    return None, None
+def get_model_bundle(version=None):
+    from saham.bundle import BundleError, open_bundle
+    # Bundle mmap (python -m saham.bundle): hanya header yang dibaca di sini.
+    # version = mtime file bundle, agar bundle hasil ekspor ulang dibuka kembali
+    try:
+        return open_bundle()
+    except BundleError as e:
+        st.warning(f"Bundle model diabaikan: {e}")
+        return None
+
+@st.cache_resource
+def load_model_assets(bank, version=None):
+    from saham.bundle import BundleError
+    from saham.inference import load_assets
+    # version = artifact_version(bank); bundle yang sumber .pkl-nya berubah ditolak (BundleError)
+    bundle = get_model_bundle(version[0] if version else None)
+    if bundle is not None and bank in bundle:
+        try:
+            return bundle.assets(bank)
+        except BundleError as e:
+            st.warning(f"Bundle {bank} ditolak, memakai file .pkl: {e}")
+    # Load model dan scaler sesuai struktur folder lokal/GitHub,
+    # forest dikompilasi ke array datar untuk skoring latensi rendah
+    model, scaler = load_assets(bank, compiled=True)
+    if model is None:
+        # Tanpa model per bank: pakai forest pooled + scaler ticker ini
+        pooled = get_pooled_model(version[3] if version else None)
+        if pooled is not None and bank in pooled:
+            return pooled.assets(bank)
+    return model, scaler
+
+@st.cache_resource
+def get_pooled_model(version=None):
+    from saham.pooled import load_pooled
+    # Satu forest untuk seluruh universe (python -m saham.pooled); None bila belum dilatih
+    try:
+        return load_pooled()
+    except (OSError, ValueError) as e:
+        st.warning(f"Model pooled diabaikan: {e}")
+        return None
+
+@st.cache_resource
+def get_drift_monitor(version=None):
+    from saham.drift import DriftMonitor
+    # State drift app (Models/drift_state.npz; layanan memakai file sendiri). version =
+    # mtime referensi: setelah retrain monitor dimuat ulang dan ticker yang referensinya berubah direset
+    monitor = DriftMonitor.load()
+    monitor.refresh_references()
+    return monitor
+
+# --- GRAFIK ON-DEMAND ---
+def show_chart(chart, caption=None):
+    from saham import charts
+    # Dibangun dari CSV/JSON, di-downsample & di-memo di saham.charts
+    fig = charts.figure(chart, bank_pilihan)
+    if fig is None:
+        st.warning("Data sumber grafik belum tersedia.")
+        return
+    with trace.span("render", chart=chart):
+        st.plotly_chart(fig, use_container_width=True)
+    if caption:
+        st.caption(caption)
 
 # Inisialisasi data
 all_metrics = load_json_data('Models/metrics.json')
@@ -59,7 +140,12 @@ menu = st.sidebar.radio("Pilih Tahapan Implementasi:", [
     "4. Demo Prediksi Real-time"
 ])
 
-bank_pilihan = st.sidebar.selectbox("Pilih Bank Fokus:", ["BBCA", "BBRI", "BMRI", "BBNI", "BBTN"])
+bank_pilihan = st.sidebar.selectbox("Pilih Bank Fokus:", BANKS)
+
+# Span waktu per tahap (fetch, fitur, inferensi, grafik); nonaktif = tanpa overhead.
+# Tracing berlaku untuk seluruh proses sehingga hanya diatur saat start
+# (env SAHAM_TRACE=1); checkbox per sesi sekadar menampilkan panel.
+diagnostik = st.sidebar.checkbox("Diagnostik kinerja", value=False)
 
 # --- DATA BINDING ---
 # Ambil metrik performa dan ringkasan dataset sesuai pilihan bank
@@ -126,7 +212,7 @@ elif menu == "1. Pengumpulan Data":
         st.error("Metadata dataset tidak ditemukan. Pastikan data_summary.json sudah di-upload.")
 
     st.subheader("Visualisasi Data Mentah")
-    st.image("Visual/01_Analisis_Data_Mentah.png", use_container_width=True)
+    show_chart("raw")
     
     with st.expander("Penjelasan Detail Grafik"):
         st.markdown("""
@@ -138,6 +224,8 @@ elif menu == "1. Pengumpulan Data":
 
 # MENU 2: PRAPEMROSESAN & FITUR
 elif menu == "2. Prapemrosesan Data":
+    import pandas as pd
+
     st.header("Tahap 2: Prapemrosesan & Rekayasa Fitur")
     
     tab1, tab2, tab3, tab4 = st.tabs([
@@ -171,9 +259,7 @@ elif menu == "2. Prapemrosesan Data":
         * **Seleksi Fitur**: Menghapus kolom `Adj Close` dan `Unnamed` untuk menyederhanakan struktur dataset mentah.
         """)
         
-        img_02 = "Visual/02_Komparasi_Data_Cleaning.png"
-        if os.path.exists(img_02):
-            st.image(img_02, caption="Interpretasi: Grafik menunjukkan transisi dari data mentah yang terputus (kiri) menjadi data kontinu yang bersih (kanan).", use_container_width=True)
+        show_chart("cleaning", "Interpretasi: Grafik menunjukkan transisi dari data mentah yang terputus (kiri) menjadi data kontinu yang bersih (kanan).")
 
     with tab2:
         st.subheader("Ekstraksi 22 Indikator Teknikal")
@@ -185,9 +271,7 @@ elif menu == "2. Prapemrosesan Data":
         * **Lainnya**: Volume MA, Daily Return, dan HL Range (selisih High-Low).
         """)
         
-        img_03 = f"Visual/03_Technical_Indicators_{bank_pilihan}.png"
-        if os.path.exists(img_03):
-            st.image(img_03, caption=f"Interpretasi: Visualisasi 22 fitur teknikal untuk {bank_pilihan} yang akan menjadi prediktor bagi algoritma Random Forest.", use_container_width=True)
+        show_chart("indicators", f"Interpretasi: Visualisasi 22 fitur teknikal untuk {bank_pilihan} yang akan menjadi prediktor bagi algoritma Random Forest.")
 
     with tab3:
         st.subheader("Normalisasi dengan MinMaxScaler")
@@ -219,15 +303,13 @@ elif menu == "2. Prapemrosesan Data":
 
         st.divider()
         st.subheader(f"Analisis Distribusi & Outlier: {bank_pilihan}")
-        img_dist = f"Visual/05_Distribusi_{bank_pilihan}.png"
-        if os.path.exists(img_dist):
-            st.image(img_dist, use_container_width=True)
-            with st.expander("Interpretasi Grafik"):
-                st.markdown(f"""
-                **Analisis untuk {bank_pilihan}:**
-                * **Histogram**: Memperlihatkan bahwa setelah normalisasi, bentuk asli distribusi data tetap terjaga, namun sumbu X kini berada di rentang 0-1.
-                * **Box Plot**: Memvalidasi bahwa tidak ada nilai yang keluar dari batas 0 atau 1.
-                """)
+        show_chart("distribution")
+        with st.expander("Interpretasi Grafik"):
+            st.markdown(f"""
+            **Analisis untuk {bank_pilihan}:**
+            * **Histogram**: Memperlihatkan bahwa setelah normalisasi, bentuk asli distribusi data tetap terjaga, namun sumbu X kini berada di rentang 0-1.
+            * **Box Plot**: Memvalidasi bahwa tidak ada nilai yang keluar dari batas 0 atau 1.
+            """)
 
     with tab4:
         st.subheader("Pembagian Data Training & Testing")
@@ -243,9 +325,7 @@ elif menu == "2. Prapemrosesan Data":
             c_split2.metric("Data Latih (Train)", f"{sd['train_rows']} Baris", sd['train_pct'])
             c_split3.metric("Data Uji (Test)", f"{sd['test_rows']} Baris", sd['test_pct'])
         
-        img_06 = "Visual/06_Visualisasi_Pembagian_Pelatihan_Uji.png"
-        if os.path.exists(img_06):
-            st.image(img_06, caption="Interpretasi: Area Biru (80%) adalah data historis untuk pelatihan, area oranye (20%) adalah data simulasi masa depan.")
+        show_chart("split", "Interpretasi: Area Biru (80%) adalah data historis untuk pelatihan, area oranye (20%) adalah data simulasi masa depan.")
 
         if 'split_stats' in s:
             ss = s['split_stats']
@@ -297,17 +377,14 @@ elif menu == "3. Evaluasi Performa Model":
 
     with tab2:
         st.header(f"Analisis Prediksi & Validasi: {bank_pilihan}")
-        img_09 = f"Visual/09_Prediction_{bank_pilihan}.png"
-        if os.path.exists(img_09):
-            st.image(img_09, use_container_width=True)
-            st.info("Garis merah (prediksi) yang berhimpit dengan biru (aktual) menunjukkan akurasi tinggi.")
+        show_chart("prediction")
+        st.info("Garis merah (prediksi) yang berhimpit dengan biru (aktual) menunjukkan akurasi tinggi.")
         
         st.divider()
-        st.image("Visual/11_Scatter_Aktual_vs_Prediksi.png", use_container_width=True)
-        st.image("Visual/12_Residual_Analysis.png", use_container_width=True)
-        st.image("Visual/13_Perbandingan_Error_Metrics.png", use_container_width=True)
-        img_14 = f"Visual/14_Full_Timeline_{bank_pilihan}.png"
-        if os.path.exists(img_14): st.image(img_14, use_container_width=True)
+        show_chart("scatter")
+        show_chart("residual")
+        show_chart("error_metrics")
+        show_chart("timeline")
 
     with tab3:
         st.header(f"Laporan Evaluasi Komprehensif: {bank_pilihan}")
@@ -321,8 +398,8 @@ elif menu == "3. Evaluasi Performa Model":
             col_m4.metric("MAPE", f"{m_comp['test']['mape']:.2f}%")
             
             st.divider()
-            st.image("Visual/15_Metrik_Evaluasi_Model.png")
-            st.image("Visual/17_Performa_Train_vs_Test.png")
+            show_chart("evaluation")
+            show_chart("train_test")
             st.info(f"**Status:** {m_comp['gap_analysis']['status']}")
 
     with tab4:
@@ -335,13 +412,17 @@ elif menu == "3. Evaluasi Performa Model":
                 c1.metric("Kontribusi Top 5", f"{fi['top_5_contribution']:.2f}%")
                 c2.metric("Fitur 80% Imp", f"{fi['features_80_count']} / 20")
                 c3.metric("Fitur Terpenting", fi['top_10'][0]['Feature'])
-                img_18 = f"Visual/18_Feature_Importance_{bank_pilihan}.png"
-                if os.path.exists(img_18): st.image(img_18)
-                img_20 = "Visual/20_Category_Importance_Analysis.png"
-                if os.path.exists(img_20): st.image(img_20)
+                if s.get('pruning'):
+                    pr = s['pruning']
+                    st.info(f"Model dilatih dalam mode pruning ({pr['mode']}): {pr['n_features']}/20 fitur "
+                            f"({', '.join(pr['features'])}). R² test model penuh {pr['test_r2_full']:.4f} → "
+                            f"pruned {pr['test_r2_pruned']:.4f}; indikator lain tidak dihitung saat inferensi. "
+                            "Importance di bawah berasal dari model penuh 20 fitur.")
+                show_chart("importance")
+                show_chart("category")
         with sub2:
-            st.image("Visual/19_Feature_Importance_Comparison.png")
-            st.image("Visual/21_Feature_Consistency_Analysis.png")
+            show_chart("importance_comparison")
+            show_chart("consistency")
         with sub3:
             if s and 'global_importance' in s:
                 gi = s['global_importance']
@@ -369,63 +450,69 @@ Potensi pengurangan fitur ke ~{gi['reduction_potential']['to']} fitur.
 
 # --- MENU 4: DEMO PREDIKSI REAL-TIME ---
 elif menu == "4. Demo Prediksi Real-time":
+    import math
+    import pandas as pd
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    from saham.data import clean_ohlcv
+    from saham.indicators import compute_features
+    from saham.inference import predict_batch
+    from saham.trading_calendar import covered_until, day_label, next_trading_days
+
     st.header(f"Live Trading & Technical Analysis: {bank_pilihan}")
+    horizon = st.slider("Horizon prakiraan (hari bursa)", 1, 20, 5)
     
     if st.button(f"Jalankan Analisis Terpadu {bank_pilihan}"):
         with st.spinner('Menghubungkan ke Yahoo Finance & Menghitung Indikator...'):
             # 1. Scraping Data (Ambil 60 hari terakhir)
-            df_live = get_live_data(bank_pilihan)
+            with trace.span("fetch", bank=bank_pilihan):
+                df_live = get_live_data(bank_pilihan)
             
             if not df_live.empty:
-                # Memastikan data menjadi 1D Series (flatten)
-                actual_close = df_live['Close'].iloc[:, 0] if isinstance(df_live['Close'], pd.DataFrame) else df_live['Close']
-                actual_high = df_live['High'].iloc[:, 0] if isinstance(df_live['High'], pd.DataFrame) else df_live['High']
-                actual_low = df_live['Low'].iloc[:, 0] if isinstance(df_live['Low'], pd.DataFrame) else df_live['Low']
-                actual_open = df_live['Open'].iloc[:, 0] if isinstance(df_live['Open'], pd.DataFrame) else df_live['Open']
-                actual_vol = df_live['Volume'].iloc[:, 0] if isinstance(df_live['Volume'], pd.DataFrame) else df_live['Volume']
-
-                # 2. Simulasi Perhitungan Indikator (SMA, RSI, MACD)
-                sma_20 = actual_close.rolling(window=20).mean()
-                ema_20 = actual_close.ewm(span=20, adjust=False).mean()
-                
-                # RSI Calculation
-                delta = actual_close.diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rsi = 100 - (100 / (1 + (gain / loss)))
-
-                # MACD Calculation
-                exp1 = actual_close.ewm(span=12, adjust=False).mean()
-                exp2 = actual_close.ewm(span=26, adjust=False).mean()
-                macd = exp1 - exp2
-                signal = macd.ewm(span=9, adjust=False).mean()
+                # Kolom sudah dinormalisasi satu level (Close/High/Low/Open/Volume)
+                actual_close = df_live['Close']
+                actual_high = df_live['High']
+                actual_low = df_live['Low']
+                actual_open = df_live['Open']
+                actual_vol = df_live['Volume']
+
+                # 2. Perhitungan Indikator (mesin indikator yang sama dengan fitur model)
+                with trace.span("features", bank=bank_pilihan):
+                    ohlcv = clean_ohlcv(df_live)
+                    feats = compute_features(ohlcv)
+                sma_20 = feats["SMA_20"]
+                ema_20 = feats["EMA_20"]
+                rsi = feats["RSI"]
+                macd = feats["MACD"]
+                signal = feats["MACD_Signal"]
 
                 # 3. Pembuatan 4 Subplot Terintegrasi (Visualisasi Utama)
-                from plotly.subplots import make_subplots
-                fig = make_subplots(rows=4, cols=1, shared_xaxes=True, 
-                                    vertical_spacing=0.05, 
-                                    subplot_titles=("Price Action & Trend", "Momentum: RSI", "Trend: MACD", "Market Activity: Volume"))
+                with trace.span("figure", bank=bank_pilihan):
+                    fig = make_subplots(rows=4, cols=1, shared_xaxes=True, 
+                                        vertical_spacing=0.05, 
+                                        subplot_titles=("Price Action & Trend", "Momentum: RSI", "Trend: MACD", "Market Activity: Volume"))
 
-                # Row 1: Candlestick & SMA/EMA
-                fig.add_trace(go.Candlestick(x=df_live.index, open=actual_open, high=actual_high, low=actual_low, close=actual_close, name="Price"), row=1, col=1)
-                fig.add_trace(go.Scatter(x=df_live.index, y=sma_20, name="SMA 20", line=dict(color='blue', width=1)), row=1, col=1)
-                fig.add_trace(go.Scatter(x=df_live.index, y=ema_20, name="EMA 20", line=dict(color='orange', width=1)), row=1, col=1)
+                    # Row 1: Candlestick & SMA/EMA
+                    fig.add_trace(go.Candlestick(x=df_live.index, open=actual_open, high=actual_high, low=actual_low, close=actual_close, name="Price"), row=1, col=1)
+                    fig.add_trace(go.Scatter(x=df_live.index, y=sma_20, name="SMA 20", line=dict(color='blue', width=1)), row=1, col=1)
+                    fig.add_trace(go.Scatter(x=df_live.index, y=ema_20, name="EMA 20", line=dict(color='orange', width=1)), row=1, col=1)
 
-                # Row 2: RSI
-                fig.add_trace(go.Scatter(x=df_live.index, y=rsi, name="RSI", line=dict(color='purple')), row=2, col=1)
-                fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
-                fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
+                    # Row 2: RSI
+                    fig.add_trace(go.Scatter(x=df_live.index, y=rsi, name="RSI", line=dict(color='purple')), row=2, col=1)
+                    fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
+                    fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
 
-                # Row 3: MACD
-                fig.add_trace(go.Scatter(x=df_live.index, y=macd, name="MACD", line=dict(color='blue')), row=3, col=1)
-                fig.add_trace(go.Scatter(x=df_live.index, y=signal, name="Signal", line=dict(color='orange')), row=3, col=1)
-                fig.add_trace(go.Bar(x=df_live.index, y=macd-signal, name="Histogram"), row=3, col=1)
+                    # Row 3: MACD
+                    fig.add_trace(go.Scatter(x=df_live.index, y=macd, name="MACD", line=dict(color='blue')), row=3, col=1)
+                    fig.add_trace(go.Scatter(x=df_live.index, y=signal, name="Signal", line=dict(color='orange')), row=3, col=1)
+                    fig.add_trace(go.Bar(x=df_live.index, y=macd-signal, name="Histogram"), row=3, col=1)
 
-                # Row 4: Volume
-                fig.add_trace(go.Bar(x=df_live.index, y=actual_vol, name="Volume", marker_color='teal'), row=4, col=1)
+                    # Row 4: Volume
+                    fig.add_trace(go.Bar(x=df_live.index, y=actual_vol, name="Volume", marker_color='teal'), row=4, col=1)
 
-                fig.update_layout(height=900, template="plotly_dark", showlegend=False, xaxis_rangeslider_visible=False)
-                st.plotly_chart(fig, use_container_width=True)
+                    fig.update_layout(height=900, template="plotly_dark", showlegend=False, xaxis_rangeslider_visible=False)
+                with trace.span("render", chart="live"):
+                    st.plotly_chart(fig, use_container_width=True)
 
                 # 4. INTERPRETASI DINAMIS
                 st.subheader("Interpretasi Analisis Teknikal (Dinamis)")
@@ -455,31 +542,134 @@ elif menu == "4. Demo Prediksi Real-time":
                 # 5. PREDIKSI (ROUND UP & WEEKEND HANDLING)
                 st.divider()
                 
-                # Logika Penentuan Hari Besok (Handling Jumat-Sabtu-Minggu)
-                dt_now = datetime.now()
-                weekday = dt_now.weekday() # 0=Senin, 4=Jumat, 5=Sabtu, 6=Minggu
-                
-                if weekday == 4: # Hari Jumat
-                    label_besok = "Prediksi Hari Senin"
-                elif weekday == 5: # Hari Sabtu
-                    label_besok = "Prediksi Hari Senin"
-                else:
-                    label_besok = "Estimasi Closing Besok"
+                # Hari bursa berikutnya setelah data terakhir (akhir pekan & libur IDX dilewati)
+                label_besok = f"Prediksi {day_label(next_trading_days(df_live.index[-1], 1)[0])}"
 
                 st.subheader(f"{label_besok} (Model RFR)")
                 
-                import math
-                noise_today = np.random.uniform(-0.001, 0.001)
-                noise_tomorrow = np.random.uniform(-0.004, 0.004)
-                
+                model, scaler = load_model_assets(bank_pilihan, artifact_version(bank_pilihan))
+                if model is None:
+                    st.error("Model/scaler belum tersedia. Pastikan file .pkl di Models/ sudah di-upload.")
+                    st.stop()
+
+                # Fitur 60 hari -> MinMaxScaler -> Random Forest -> Rupiah
+                with trace.span("inference", bank=bank_pilihan):
+                    hasil = predict_batch({bank_pilihan: (model, scaler)}, {bank_pilihan: ohlcv}).loc[bank_pilihan]
+
                 # Round Up Prediksi
-                pred_today = math.ceil(last_price * (1 + noise_today))
-                pred_tomorrow = math.ceil(pred_today * (1 + noise_tomorrow))
+                pred_today = math.ceil(hasil["pred_today"])
+                pred_tomorrow = math.ceil(hasil["pred_next"])
 
                 c1, c2 = st.columns(2)
                 c1.metric("Estimasi Harga Hari Ini", f"Rp {pred_today:,}")
                 c2.metric(label_besok, f"Rp {pred_tomorrow:,}", delta=f"{pred_tomorrow - pred_today:,}")
                 
                 st.caption(f"Catatan: Prediksi menggunakan pola historis 2022-2025. Data terakhir diperbarui pada: {df_live.index[-1].strftime('%Y-%m-%d')}")
+
+                # 6. PRAKIRAAN REKURSIF N HARI BURSA
+                if horizon > 1:
+                    from saham.forecast import forecast
+                    st.subheader(f"Prakiraan {horizon} Hari Bursa (Rekursif)")
+                    with trace.span("forecast", bank=bank_pilihan, horizon=horizon):
+                        jalur = forecast({bank_pilihan: (model, scaler)}, {bank_pilihan: ohlcv}, horizon)
+                    fig_fc = go.Figure()
+                    fig_fc.add_trace(go.Scatter(x=ohlcv.index, y=ohlcv["Close"], name="Close Aktual", line=dict(color='teal')))
+                    fig_fc.add_trace(go.Scatter(x=jalur["date"], y=jalur["pred_close"], name="Prakiraan", mode="lines+markers", line=dict(color='orange', dash='dash')))
+                    fig_fc.update_layout(height=400, template="plotly_dark")
+                    st.plotly_chart(fig_fc, use_container_width=True)
+                    st.dataframe(pd.DataFrame({
+                        "Hari Bursa": [day_label(d) for d in jalur["date"]],
+                        "Prediksi Close": [f"Rp {math.ceil(v):,}" for v in jalur["pred_close"]],
+                        "Perubahan": [f"{v:+.2f}%" for v in jalur["change_pct"]],
+                    }), hide_index=True, use_container_width=True)
+                    batas = covered_until()
+                    if batas is None or jalur["date"].iloc[-1].date() > batas:
+                        st.caption("Sebagian tanggal melewati kalender libur bursa yang tersedia (Data/idx_holidays.csv); hanya akhir pekan yang dilewati.")
+                    st.caption("Setiap hari memakai prediksi hari sebelumnya sebagai input; ketidakpastian bertambah seiring horizon.")
+
+                # 7. PEMANTAUAN DRIFT FITUR (vs statistik data latih)
+                with st.expander("Pemantauan Drift Fitur"):
+                    from saham.drift import MIN_BARS
+                    monitor = get_drift_monitor(file_version("Models/data_summary.json",
+                                                             "Models/Pooled/drift_reference.json"))
+                    with trace.span("drift", bank=bank_pilihan):
+                        if monitor.observe_windows({bank_pilihan: ohlcv}):
+                            monitor.save()
+                    laporan = monitor.report([bank_pilihan])
+                    if laporan.empty:
+                        st.info("Referensi data latih untuk ticker ini tidak tersedia.")
+                    else:
+                        info = monitor.summary()[bank_pilihan]
+                        if info["status"] == "drift":
+                            st.warning(f"{len(info['flagged'])} fitur keluar dari rentang/distribusi data latih. "
+                                       f"Pertimbangkan retrain: python -m saham.training --banks {bank_pilihan}")
+                        elif info["status"] == "warmup":
+                            st.info(f"Baru {info['bars']:.0f} bar efektif teramati; evaluasi drift mulai setelah {MIN_BARS} bar.")
+                        else:
+                            st.success("Fitur live masih dalam rentang dan distribusi data latih.")
+                        st.dataframe(laporan[["feature", "mean", "ref_mean", "shift", "out_of_range", "min", "max", "psi", "status"]]
+                                     .sort_values("psi", ascending=False).round(3), hide_index=True, use_container_width=True)
+                        st.caption("Nilai dalam skala MinMax model (data latih = 0-1). out_of_range = fraksi bar di luar 0-1; "
+                                   "psi = pergeseran histogram vs data latih.")
             else:
                 st.error("Koneksi gagal atau data tidak ditemukan.")
+
+    # --- SCREENING UNIVERSE (MODEL POOLED) ---
+    st.divider()
+    st.subheader("Screening Universe (Model Pooled)")
+    pooled = get_pooled_model(file_version("Models/Pooled/meta.json")[0])
+    if pooled is None:
+        st.info("Model pooled belum dilatih. Jalankan: python -m saham.pooled")
+    elif st.button(f"Screening {len(pooled.tickers)} Ticker"):
+        from saham.market_fetch import YahooBulkFetcher, fetch_many, store_fallback
+        with st.spinner("Mengambil data seluruh universe & memprediksi..."):
+            # Satu unduhan multi-simbol (~120 hari kalender >= 60 bar bursa); ticker yang
+            # gagal diambil dari histori lokal. Lalu satu panggilan predict untuk semua ticker.
+            akhir = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+            with trace.span("fetch", bank="universe"):
+                frames, laporan_fetch = fetch_many(pooled.tickers, akhir - pd.Timedelta(days=120), akhir,
+                                                   bulk=YahooBulkFetcher(), fallback=store_fallback(get_price_store()))
+            windows = {t: df.tail(60) for t, df in frames.items()}
+            with trace.span("inference", bank="universe"):
+                hasil = predict_batch({t: pooled.assets(t) for t in windows}, windows)
+        hasil = hasil.dropna(subset=["pred_next"])
+        hasil["Perubahan (%)"] = (hasil["pred_next"] / hasil["last_close"] - 1) * 100
+        hasil = hasil.sort_values("Perubahan (%)", ascending=False)
+        st.dataframe(hasil.rename(columns={
+            "last_date": "Data Terakhir", "last_close": "Close Terakhir",
+            "pred_today": "Estimasi Hari Ini", "pred_next": "Estimasi Besok",
+        }).style.format({"Close Terakhir": "Rp {:,.0f}", "Estimasi Hari Ini": "Rp {:,.0f}",
+                         "Estimasi Besok": "Rp {:,.0f}", "Perubahan (%)": "{:+.2f}%"}), use_container_width=True)
+        test = pooled.metrics.get("test", {})
+        lokal = sum(v == "fallback" for v in laporan_fetch["sources"].values())
+        st.caption(f"{len(hasil)}/{len(pooled.tickers)} ticker berhasil diprediksi ({lokal} dari histori lokal). "
+                   f"MAPE test model pooled: {test.get('mape', float('nan')):.2f}%")
+
+# --- PANEL DIAGNOSTIK KINERJA ---
+# Dirender terakhir agar span dari run ini ikut tampil
+if diagnostik:
+    with st.sidebar.expander("Diagnostik Kinerja", expanded=True):
+        if not trace.enabled():
+            st.caption("Tracing nonaktif. Jalankan app dengan SAHAM_TRACE=1 untuk mencatat span.")
+        snap = trace.snapshot()
+        if snap["spans"]:
+            st.dataframe([{
+                "Tahap": sp["stage"],
+                "Label": ", ".join(f"{k}={v}" for k, v in sp["labels"].items()),
+                "N": sp["count"],
+                "Terakhir (ms)": round(sp["last_ms"], 1),
+                "Rata-rata (ms)": round(sp["avg_ms"], 1),
+                "Maks (ms)": round(sp["max_ms"], 1),
+            } for sp in snap["spans"]], hide_index=True)
+        else:
+            st.caption("Belum ada span tercatat; buka menu lain atau jalankan analisis.")
+        for counter in snap["counters"]:
+            label = ", ".join(f"{k}={v}" for k, v in counter["labels"].items())
+            st.write(f"**{counter['name']}** {label}: {counter['value']}")
+        if "market_cache" in snap["collectors"]:
+            mc = snap["collectors"]["market_cache"]
+            st.write(f"**Cache pasar**: hit ratio {mc['hit_ratio']:.0%}, fetch rata-rata {mc['fetch_ms_avg']:.0f} ms")
+        st.download_button("Unduh JSON", json.dumps(snap, indent=2), file_name="saham_trace.json")
+        st.download_button("Unduh Prometheus", trace.prometheus(), file_name="saham_metrics.prom")
+        if st.button("Reset Span"):
+            trace.reset()
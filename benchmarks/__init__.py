@@ -0,0 +1 @@
+"""Skrip benchmark & verifikasi. Jalankan dari root repo: python -m benchmarks.<nama>"""
@@ -0,0 +1,32 @@
+"""Aset model untuk benchmark.
+
+Memakai Models/Trained & Models/Scalers bila file .pkl tersedia. Jika yang ada
+hanya pointer Git LFS (repo belum `git lfs pull`), dibuat model pengganti
+dengan hyperparameter tuning_results.best_params dari data_summary.json agar
+ukuran forest dan latensi tetap representatif.
+"""
+import json
+
+from sklearn.ensemble import RandomForestRegressor
+
+from saham.data import load_raw_csv
+from saham.indicators import FEATURE_COLUMNS, TARGET_COLUMN
+from saham.inference import load_assets, prepare_model
+from saham.training import SUMMARY_FILE as SUMMARY_PATH, prepare_dataset
+
+
+def fit_stand_in(bank, df=None, random_state=42):
+    with open(SUMMARY_PATH) as f:
+        params = json.load(f).get(bank, {}).get("tuning_results", {}).get("best_params", {})
+    df = load_raw_csv(bank) if df is None else df
+    _, _, scaler, scaled, n_train = prepare_dataset(df)
+    model = RandomForestRegressor(random_state=random_state, **params)
+    model.fit(scaled[FEATURE_COLUMNS].iloc[:n_train], scaled[TARGET_COLUMN].iloc[:n_train])
+    return prepare_model(model), scaler
+
+
+def load_or_fit_assets(bank):
+    model, scaler = load_assets(bank)
+    if model is None:
+        model, scaler = fit_stand_in(bank)
+    return model, scaler
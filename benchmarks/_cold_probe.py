@@ -0,0 +1,102 @@
+"""Probe cold start satu menu app.py, dijalankan di proses baru oleh bench_cold_start.
+
+Sengaja hanya mengimpor modul stdlib ringan di tingkat atas agar laporan
+`-X importtime` hanya berisi impor milik menu yang diukur.
+
+Jalankan: python -X importtime -m benchmarks._cold_probe MENU [BANK]
+"""
+import json
+import os
+import sys
+import time
+
+MENUS = [
+    "0. Ringkasan Proyek",
+    "1. Pengumpulan Data",
+    "2. Prapemrosesan Data",
+    "3. Evaluasi Performa Model",
+    "4. Demo Prediksi Real-time",
+]
+MENU_CHARTS = {
+    1: ["raw"],
+    2: ["cleaning", "indicators", "distribution", "split"],
+    3: ["prediction", "scatter", "residual", "error_metrics", "timeline", "evaluation", "train_test",
+        "importance", "category", "importance_comparison", "consistency"],
+}
+HEAVY_MODULES = ["pandas", "plotly", "sklearn", "joblib", "yfinance", "matplotlib", "seaborn"]
+
+
+def render_without_streamlit(menu, bank):
+    # Pekerjaan data per menu, dengan impor yang sama dengan cabang app.py
+    from saham.universe import featured
+
+    featured()
+
+    for path in ("Models/metrics.json", "Models/data_summary.json"):
+        if os.path.exists(path):
+            with open(path) as f:
+                json.load(f)
+    if menu in MENU_CHARTS:
+        if menu == 2:
+            import pandas  # noqa: F401
+        from saham import charts
+        for chart in MENU_CHARTS[menu]:
+            charts.figure(chart, bank)
+    elif menu == 4:
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        from saham.bundle import BundleError, open_bundle
+        from saham.data import clean_ohlcv
+        from saham.indicators import compute_features
+        from saham.inference import load_assets
+        from saham.pooled import load_pooled
+        from saham.price_store import open_store
+
+        ohlcv = clean_ohlcv(open_store().tail(bank, 60))
+        feats = compute_features(ohlcv)
+        fig = make_subplots(rows=4, cols=1, shared_xaxes=True)
+        fig.add_trace(go.Candlestick(x=ohlcv.index, open=ohlcv["Open"], high=ohlcv["High"],
+                                     low=ohlcv["Low"], close=ohlcv["Close"]), row=1, col=1)
+        for row, col in ((1, "SMA_20"), (2, "RSI"), (3, "MACD"), (4, "Volume")):
+            fig.add_trace(go.Scatter(x=ohlcv.index, y=feats[col]), row=row, col=1)
+        fig.to_plotly_json()
+        try:
+            bundle = open_bundle()
+        except BundleError:
+            bundle = None
+        if bundle is None or bank not in bundle:
+            load_assets(bank, compiled=True)
+        load_pooled()
+
+
+def render_with_streamlit(menu, AppTest):
+    # Run pertama selalu menu 0 (default radio), lalu pindah ke menu tujuan
+    at = AppTest.from_file("app.py", default_timeout=300)
+    at.run()
+    if menu:
+        at.sidebar.radio[0].set_value(MENUS[menu]).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def main():
+    menu = int(sys.argv[1])
+    bank = sys.argv[2] if len(sys.argv) > 2 else "BBCA"
+    t0 = time.perf_counter()
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        AppTest = None
+    if AppTest is not None:
+        render_with_streamlit(menu, AppTest)
+    else:
+        render_without_streamlit(menu, bank)
+    print(json.dumps({
+        "ms": (time.perf_counter() - t0) * 1e3,
+        "streamlit": AppTest is not None,
+        "heavy": [m for m in HEAVY_MODULES if m in sys.modules],
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Generator OHLCV sintetis deterministik untuk uji skala.
+
+Harga mengikuti random walk log-normal dengan volatilitas yang berganti
+rezim, gap pembukaan, rentang High/Low dan volume yang ikut membesar saat
+return besar. Seed berasal dari crc32 nama ticker, jadi ticker yang sama
+selalu menghasilkan histori yang sama di mesin mana pun.
+
+* bars_per_day=1 -> bar harian pada hari kerja (index tanggal, seperti
+  Data/Raw); >1 -> bar intraday sesi IDX 09:00-16:00 dibagi rata.
+* write_raw_csv menulis format Data/Raw (baris header kedua berisi simbol),
+  sehingga read_raw_csv / saham.charts membacanya tanpa perubahan.
+"""
+import os
+import zlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from saham.data import PRICE_COLUMNS
+
+# Data/Raw: 718 bar untuk 3 tahun kalender
+TRADING_DAYS_PER_YEAR = 240
+START_DATE = "2000-01-03"
+SESSION_OPEN = pd.Timedelta(hours=9)
+SESSION_LENGTH = pd.Timedelta(hours=7)
+_REGIME_BARS = 60
+
+
+@lru_cache(maxsize=8)
+def synthetic_index(years, bars_per_day=1, start=START_DATE):
+    # Dipakai bersama semua ticker (bdate_range lambat untuk ribuan panggilan)
+    days = pd.bdate_range(start, periods=int(years * TRADING_DAYS_PER_YEAR), name="Date")
+    if bars_per_day == 1:
+        return days
+    offsets = pd.to_timedelta(np.arange(bars_per_day) * (SESSION_LENGTH / bars_per_day)) + SESSION_OPEN
+    stamps = (days.to_numpy()[:, None] + offsets.to_numpy()[None, :]).reshape(-1)
+    return pd.DatetimeIndex(stamps, name="Date")
+
+
+def synthetic_ohlcv(ticker, years=3, bars_per_day=1, seed=0):
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()) ^ seed)
+    index = synthetic_index(years, bars_per_day)
+    n = len(index)
+    per_year = TRADING_DAYS_PER_YEAR * bars_per_day
+
+    # Volatilitas tahunan 15-60% yang berganti tiap ~60 bar (rezim)
+    regimes = rng.uniform(0.15, 0.6, size=n // _REGIME_BARS + 1)
+    sigma = np.repeat(regimes, _REGIME_BARS)[:n] / np.sqrt(per_year)
+    drift = rng.normal(0.05, 0.1) / per_year
+    shocks = rng.standard_t(5, size=n) * np.sqrt(3 / 5)
+    log_ret = drift - 0.5 * sigma ** 2 + sigma * shocks
+    close = np.exp(np.log(rng.uniform(100, 12000)) + np.cumsum(log_ret))
+
+    prev = np.concatenate([[close[0]], close[:-1]])
+    open_ = prev * np.exp(sigma * 0.3 * rng.standard_normal(n))
+    wick = np.abs(sigma * rng.standard_normal((2, n)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = np.round(rng.uniform(1e6, 1e8) / bars_per_day * np.exp(0.4 * rng.standard_normal(n))
+                      * (1 + 20 * np.abs(log_ret)))
+    return pd.DataFrame({"Close": close, "High": high, "Low": low, "Open": open_, "Volume": volume},
+                        index=index)[PRICE_COLUMNS]
+
+
+def synthetic_tickers(n):
+    return [f"S{i:04d}" for i in range(n)]
+
+
+def synthetic_market(n_tickers, years=3, bars_per_day=1, seed=0):
+    return {t: synthetic_ohlcv(t, years, bars_per_day, seed) for t in synthetic_tickers(n_tickers)}
+
+
+def write_raw_csv(ticker, df, raw_dir):
+    os.makedirs(raw_dir, exist_ok=True)
+    path = os.path.join(raw_dir, f"{ticker}_raw.csv")
+    with open(path, "w") as f:
+        f.write("Date," + ",".join(PRICE_COLUMNS) + "\n")
+        f.write("," + ",".join([f"{ticker}.JK"] * len(PRICE_COLUMNS)) + "\n")
+        df.to_csv(f, header=False)
+    return path
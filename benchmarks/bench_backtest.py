@@ -0,0 +1,71 @@
+"""Backtest walk-forward skala besar: 45 ticker x ribuan window.
+
+Histori tiruan 45 emiten dibangun dari 5 CSV Data/Raw (lihat
+bench_market_fetch). Diukur:
+* biaya fitur: sekali per ticker + slicing vs membangun ulang indikator
+  untuk setiap window;
+* jumlah worker yang diizinkan beberapa anggaran memori (plan_memory);
+* throughput window/detik dan puncak memori (VmHWM) proses induk.
+
+Jalankan: python -m benchmarks.bench_backtest [--jobs 4]
+"""
+import argparse
+import time
+
+from benchmarks.bench_market_fetch import sector_frames
+from saham.backtest import backtest_many, feature_matrix, plan_memory, plan_windows
+from saham.indicators import compute_features
+
+REFIT_EVERY = 10
+TRAIN_SIZE = 250
+PARAMS = {"n_estimators": 10, "max_depth": 12}
+
+
+def peak_rss_mb():
+    with open("/proc/self/status") as f:
+        return int(next(line.split()[1] for line in f if line.startswith("VmHWM:"))) / 1024
+
+
+def feature_cost(frames):
+    t0 = time.perf_counter()
+    sliced = 0
+    for df in frames.values():
+        _, X, _ = feature_matrix(df)
+        sliced += len(plan_windows(len(X), TRAIN_SIZE, REFIT_EVERY))
+    once = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for df in frames.values():
+        for lo, hi, _, pred_hi in plan_windows(len(df) - 19, TRAIN_SIZE, REFIT_EVERY):
+            compute_features(df.iloc[lo:pred_hi + 19]).dropna()
+    rebuild = time.perf_counter() - t0
+    return sliced, once, rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--memory-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    frames = sector_frames()
+    windows, once, rebuild = feature_cost(frames)
+    print(f"{len(frames)} ticker, {windows} window (train {TRAIN_SIZE}, refit tiap {REFIT_EVERY} hari)")
+    print(f"fitur sekali per ticker: {once * 1e3:.0f} ms | dibangun ulang per window: {rebuild * 1e3:.0f} ms "
+          f"({rebuild / once:.0f}x)")
+
+    for budget in (8, 32, 128):
+        workers, per_worker = plan_memory(64, budget, {"n_estimators": 100}, TRAIN_SIZE)
+        print(f"  anggaran {budget:>3} MB, 100 pohon: {workers:>2} dari 64 worker "
+              f"({per_worker / 2 ** 20:.2f} MB/worker)")
+
+    _, report = backtest_many(frames, TRAIN_SIZE, REFIT_EVERY, params=PARAMS, n_jobs=args.jobs,
+                              memory_budget_mb=args.memory_mb)
+    print(f"backtest: {report['workers']} worker, {report['windows'] / report['seconds']:.0f} window/s, "
+          f"{report['seconds']:.1f}s, puncak RSS induk {peak_rss_mb():.0f} MB")
+    mape = sorted(m["mape"] for m in report["metrics"].values())
+    print(f"MAPE OOS per ticker: median {mape[len(mape) // 2]:.2f}%, maks {mape[-1]:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Start-up & prediksi pertama: bundle mmap vs pasangan .pkl per ticker.
+
+Untuk 5 dan 500 ticker (model 5 bank dipakai bergiliran) diukur di
+subprocess baru, setelah import, dengan page cache hangat:
+* pkl    : parse metrics.json penuh + joblib.load model & scaler satu
+           ticker + kompilasi forest (seperti load_model_assets di app);
+* pkl-sk : sama, tanpa kompilasi (predict sklearn);
+* bundle : buka header + metrik satu ticker, lalu assets() (view mmap +
+           checksum) untuk ticker tsb.
+"prediksi pertama" = waktu sampai predict_batch pertama selesai. Dicek juga
+bahwa prediksi bundle sama dengan forest terkompilasi dan bundle rusak /
+urutan fitur lama ditolak.
+
+Jalankan: python -m benchmarks.bench_bundle
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import joblib
+import numpy as np
+
+from benchmarks._assets import load_or_fit_assets
+from saham.bundle import BundleError, ModelBundle, write_bundle
+from saham.compiled_forest import compile_forest
+from saham.data import BANKS, load_raw_csv
+from saham.inference import predict_batch
+
+SIZES = (5, 500)
+REPEATS = 5
+
+_STARTUP_SCRIPT = """
+import json, os, sys, time
+import joblib
+from saham.bundle import open_bundle
+from saham.compiled_forest import compile_forest
+from saham.data import load_raw_csv
+from saham.inference import predict_batch, prepare_model
+mode, root, ticker, bank = sys.argv[1:5]
+window = load_raw_csv(bank).tail(60)
+t0 = time.perf_counter()
+if mode.startswith("pkl"):
+    with open(os.path.join(root, "metrics.json")) as f:
+        metrics = json.load(f)[ticker]
+    model = joblib.load(os.path.join(root, "Trained", f"{ticker}_rf_model.pkl"))
+    model = compile_forest(model) if mode == "pkl" else prepare_model(model)
+    scaler = joblib.load(os.path.join(root, "Scalers", f"{ticker}_scaler.pkl"))
+    ready = time.perf_counter()
+else:
+    bundle = open_bundle(os.path.join(root, "sector.bundle"))
+    metrics = bundle.metrics(ticker)
+    ready = time.perf_counter()
+    model, scaler = bundle.assets(ticker)
+predict_batch({ticker: (model, scaler)}, {ticker: window})
+done = time.perf_counter()
+with open("/proc/self/status") as f:
+    rss = next(line.split()[1] for line in f if line.startswith("VmRSS:"))
+print(ready - t0, done - t0, rss)
+"""
+
+
+def build_layout(root, n, assets, compiled, metrics):
+    os.makedirs(os.path.join(root, "Trained"))
+    os.makedirs(os.path.join(root, "Scalers"))
+    sources = {}
+    for bank in BANKS:
+        model_path = os.path.join(root, f"{bank}.model")
+        scaler_path = os.path.join(root, f"{bank}.scaler")
+        joblib.dump(assets[bank][0], model_path)
+        joblib.dump(assets[bank][1], scaler_path)
+        sources[bank] = (model_path, scaler_path)
+    tickers = {f"T{i:03d}": BANKS[i % len(BANKS)] for i in range(n)}
+    entries, all_metrics = {}, {}
+    for ticker, bank in tickers.items():
+        # Hardlink: isi file sama persis dengan pickle asli tanpa menggandakan disk
+        os.link(sources[bank][0], os.path.join(root, "Trained", f"{ticker}_rf_model.pkl"))
+        os.link(sources[bank][1], os.path.join(root, "Scalers", f"{ticker}_scaler.pkl"))
+        entries[ticker] = (compiled[bank], assets[bank][1], metrics.get(bank, {}))
+        all_metrics[ticker] = metrics.get(bank, {})
+    with open(os.path.join(root, "metrics.json"), "w") as f:
+        json.dump(all_metrics, f)
+    size = write_bundle(os.path.join(root, "sector.bundle"), entries)
+    return tickers, size
+
+
+def measure(mode, root, ticker, bank):
+    runs = []
+    for _ in range(REPEATS):
+        out = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT, mode, root, ticker, bank],
+                             capture_output=True, text=True, check=True)
+        runs.append([float(v) for v in out.stdout.split()])
+    ready, first, rss = np.median(np.array(runs), axis=0)
+    return ready * 1e3, first * 1e3, rss / 1024
+
+
+def check_rejects(root, ticker):
+    path = os.path.join(root, "sector.bundle")
+    bundle = ModelBundle(path)
+    spec = bundle.header["tickers"][ticker]["arrays"]["value"]
+    broken = os.path.join(root, "broken.bundle")
+    shutil.copyfile(path, broken)
+    with open(broken, "r+b") as f:
+        f.seek(bundle._data_start + spec["offset"])
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    results = {}
+    try:
+        ModelBundle(broken).assets(ticker)
+        results["checksum"] = False
+    except BundleError:
+        results["checksum"] = True
+
+    stale = ModelBundle(path)
+    stale.header["tickers"][ticker]["columns"]["scaler"] = ["Close"] + list(reversed(stale.header["feature_columns"]))
+    try:
+        stale.assets(ticker)
+        results["feature_order"] = False
+    except BundleError:
+        results["feature_order"] = True
+    return results
+
+
+def main():
+    assets = {bank: load_or_fit_assets(bank) for bank in BANKS}
+    compiled = {bank: compile_forest(model, "float32") for bank, (model, _) in assets.items()}
+    with open("Models/metrics.json") as f:
+        metrics = json.load(f)
+    windows = {bank: load_raw_csv(bank).tail(60) for bank in BANKS}
+
+    for n in SIZES:
+        root = tempfile.mkdtemp(prefix="saham_bundle_")
+        try:
+            tickers, size = build_layout(root, n, assets, compiled, metrics)
+            ticker = list(tickers)[-1]
+            bank = tickers[ticker]
+            if n == SIZES[0]:
+                bundle = ModelBundle(os.path.join(root, "sector.bundle"))
+                got = predict_batch({b: bundle.assets(t) for t, b in tickers.items()}, windows)
+                ref = predict_batch({b: (compiled[b], assets[b][1]) for b in BANKS}, windows)
+                diff = np.max(np.abs(got[["pred_today", "pred_next"]].to_numpy() - ref[["pred_today", "pred_next"]].to_numpy()))
+                print(f"prediksi bundle vs forest terkompilasi: selisih maks Rp {diff:.1e}")
+                print(f"ditolak: {check_rejects(root, ticker)}")
+            pkl_bytes = sum(os.path.getsize(os.path.join(root, d, f)) for d in ("Trained", "Scalers")
+                            for f in os.listdir(os.path.join(root, d)))
+            print(f"\n{n} ticker: pkl {pkl_bytes / 2 ** 20:.0f} MB, bundle {size / 2 ** 20:.0f} MB")
+            print(f"{'format':<8}{'siap (ms)':>11}{'prediksi pertama (ms)':>23}{'RSS (MB)':>10}")
+            for mode in ("pkl", "pkl-sk", "bundle"):
+                ready, first, rss = measure(mode, root, ticker, bank)
+                print(f"{mode:<8}{ready:>11.1f}{first:>23.1f}{rss:>10.0f}")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
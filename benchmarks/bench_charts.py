@@ -0,0 +1,81 @@
+"""Payload & waktu render per halaman: PNG statis vs grafik on-demand.
+
+Sebelum: bytes PNG di Visual/ yang dikirim st.image per halaman (menu 1-3,
+bank terpilih). Sesudah: JSON figure Plotly yang dikirim st.plotly_chart,
+setelah LTTB ke MAX_POINTS titik per trace. Waktu render = baca PNG dari
+disk vs build figure pertama (cold) dan dari memo (warm). Grafik CV
+(08_Skor_Cross_Validation.png) tetap PNG karena skor per fold tidak
+tersimpan di CSV/JSON, jadi dihitung di kedua kolom.
+
+Jalankan: python -m benchmarks.bench_charts [--bank BBCA]
+"""
+import argparse
+import os
+import time
+
+from saham import charts
+
+CV_PNG = "08_Skor_Cross_Validation.png"
+# Halaman -> [(png lama, grafik baru)]
+PAGES = {
+    "1. Pengumpulan Data": [("01_Analisis_Data_Mentah.png", "raw")],
+    "2. Prapemrosesan Data": [
+        ("02_Komparasi_Data_Cleaning.png", "cleaning"),
+        ("03_Technical_Indicators_{bank}.png", "indicators"),
+        ("05_Distribusi_{bank}.png", "distribution"),
+        ("06_Visualisasi_Pembagian_Pelatihan_Uji.png", "split"),
+    ],
+    "3. Evaluasi Performa Model": [
+        (CV_PNG, None),
+        ("09_Prediction_{bank}.png", "prediction"),
+        ("11_Scatter_Aktual_vs_Prediksi.png", "scatter"),
+        ("12_Residual_Analysis.png", "residual"),
+        ("13_Perbandingan_Error_Metrics.png", "error_metrics"),
+        ("14_Full_Timeline_{bank}.png", "timeline"),
+        ("15_Metrik_Evaluasi_Model.png", "evaluation"),
+        ("17_Performa_Train_vs_Test.png", "train_test"),
+        ("18_Feature_Importance_{bank}.png", "importance"),
+        ("20_Category_Importance_Analysis.png", "category"),
+        ("19_Feature_Importance_Comparison.png", "importance_comparison"),
+        ("21_Feature_Consistency_Analysis.png", "consistency"),
+    ],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", default="BBCA")
+    args = parser.parse_args()
+
+    print(f"{'halaman':<28}{'PNG (KB)':>10}{'baca (ms)':>11}{'JSON (KB)':>11}{'cold (ms)':>11}{'memo (ms)':>11}")
+    totals = [0, 0]
+    for page, items in PAGES.items():
+        png_bytes = json_bytes = 0
+        read_s = cold_s = warm_s = 0.0
+        for png, chart in items:
+            path = os.path.join("Visual", png.format(bank=args.bank))
+            t0 = time.perf_counter()
+            with open(path, "rb") as f:
+                size = len(f.read())
+            read_s += time.perf_counter() - t0
+            png_bytes += size
+            if chart is None:
+                json_bytes += size
+                continue
+            t0 = time.perf_counter()
+            payload = charts.figure(chart, args.bank).to_json()
+            cold_s += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            charts.figure(chart, args.bank).to_json()
+            warm_s += time.perf_counter() - t0
+            json_bytes += len(payload)
+        totals[0] += png_bytes
+        totals[1] += json_bytes
+        print(f"{page:<28}{png_bytes / 1024:>10.0f}{read_s * 1e3:>11.1f}{json_bytes / 1024:>11.0f}"
+              f"{cold_s * 1e3:>11.0f}{warm_s * 1e3:>11.1f}")
+    print(f"total payload: {totals[0] / 2 ** 20:.1f} MB -> {totals[1] / 2 ** 20:.2f} MB "
+          f"({totals[0] / totals[1]:.0f}x lebih kecil); memo: {charts.memo_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Anggaran cold start app.py: waktu impor + time-to-first-render per menu.
+
+Setiap menu diukur di proses Python baru dengan `python -X importtime`:
+* impor: jumlah waktu kumulatif modul tingkat atas dari laporan importtime;
+* render: waktu sampai menu selesai dirender pertama kali. Bila streamlit
+  terpasang, app.py dijalankan dengan streamlit.testing (AppTest): run
+  pertama (menu 0) lalu pindah ke menu tujuan. Tanpa streamlit, dijalankan
+  pekerjaan data yang sama dengan menu tersebut (JSON, grafik saham.charts,
+  indikator + subplot menu 4) dengan impor yang sama dengan app.py.
+Juga dicek bahwa menu 0 tidak memuat modul berat (pandas, plotly, sklearn,
+joblib, yfinance).
+
+Jalankan: python -m benchmarks.bench_cold_start [--check] [--repeat 3]
+--check keluar dengan kode 1 bila median melewati BUDGET_MS (mis. di CI).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks._cold_probe import HEAVY_MODULES, MENUS
+
+# Median render (ms, termasuk impor) per menu tanpa streamlit di kontainer
+# 1 CPU, ~2x hasil ukur. Dengan streamlit, anggaran dihitung setelah biaya
+# run dasar menu 0 (impor streamlit + skrip) yang punya anggaran sendiri.
+BUDGET_MS = {0: 100, 1: 1500, 2: 2500, 3: 2000, 4: 1500}
+STREAMLIT_BASE_BUDGET_MS = 4000
+# Menu 0 hanya membaca JSON, jadi tidak boleh memuat modul berat
+MENU0_FORBIDDEN = HEAVY_MODULES
+
+
+# --- PENGUKURAN ---
+def parse_importtime(stderr):
+    # Return (total ms modul tingkat atas, [(ms, modul)] terberat)
+    top = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name[1:].startswith(" "):
+            top.append((int(cumulative) / 1e3, name.strip()))
+    return sum(ms for ms, _ in top), sorted(top, reverse=True)[:3]
+
+
+def measure(menu, bank):
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "benchmarks._cold_probe", str(menu), bank],
+                          capture_output=True, text=True)
+    wall = (time.perf_counter() - t0) * 1e3
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    import_ms, heaviest = parse_importtime(proc.stderr)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result.update(import_ms=import_ms, heaviest=heaviest, wall=wall)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", default="BBCA")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="Exit 1 bila melewati anggaran")
+    args = parser.parse_args()
+
+    # Store harga disiapkan dulu agar menu 4 mengukur pembukaan, bukan seeding
+    from saham.price_store import open_store
+    open_store()
+
+    failures, base_ms = [], 0.0
+    print(f"{'menu':<30}{'impor ms':>9}{'render ms':>10}{'proses ms':>10}{'budget':>8}  modul berat / impor terberat")
+    for menu, name in enumerate(MENUS):
+        runs = [measure(menu, args.bank) for _ in range(args.repeat)]
+        import_ms = statistics.median(r["import_ms"] for r in runs)
+        render_ms = statistics.median(r["ms"] for r in runs)
+        wall = statistics.median(r["wall"] for r in runs)
+        heavy = runs[0]["heavy"]
+        heaviest = ", ".join(f"{n} {ms:.0f}" for ms, n in runs[0]["heaviest"])
+        streamlit = runs[0]["streamlit"]
+        budget = STREAMLIT_BASE_BUDGET_MS if streamlit and menu == 0 else BUDGET_MS[menu]
+        print(f"{name:<30}{import_ms:>9.0f}{render_ms:>10.0f}{wall:>10.0f}{budget:>8}  "
+              f"{','.join(heavy) or '-'} | {heaviest}")
+        if render_ms - base_ms > budget:
+            failures.append(f"{name}: render {render_ms - base_ms:.0f} ms > anggaran {budget} ms")
+        if menu == 0 and streamlit:
+            base_ms = render_ms
+        if menu == 0 and not streamlit:
+            forbidden = [m for m in heavy if m in MENU0_FORBIDDEN]
+            if forbidden:
+                failures.append(f"{name}: memuat modul berat {forbidden}")
+    print("mode: " + ("streamlit AppTest" if runs[0]["streamlit"] else "tanpa streamlit (pekerjaan data per menu)"))
+
+    for failure in failures:
+        print("MELEWATI ANGGARAN: " + failure)
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
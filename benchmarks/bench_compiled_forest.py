@@ -0,0 +1,112 @@
+"""Forest terkompilasi vs joblib.load + model.predict.
+
+Untuk setiap bank: kecocokan prediksi tiap mode threshold terhadap sklearn,
+throughput (baris/detik) pada beberapa ukuran batch, serta RSS puncak proses
+terpisah yang hanya memuat model dan memprediksi (agar impor sklearn ikut
+terhitung di sisi joblib). Evaluator level-per-level unggul jauh untuk batch
+kecil (skoring live per tick); pada batch ~1000 baris traversal Cython
+sklearn kembali lebih cepat, sehingga skoring massal offline tetap boleh
+memakai model.predict.
+
+Jalankan: python -m benchmarks.bench_compiled_forest
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from benchmarks._assets import load_or_fit_assets
+from saham.compiled_forest import (
+    PREDICT_ATOL, PREDICT_ATOL_F32, THRESHOLD_MODES, compile_forest, load_compiled, save_compiled,
+)
+from saham.data import BANKS, load_raw_csv
+from saham.indicators import FEATURE_COLUMNS, SCALER_COLUMNS, compute_features
+
+BATCH_SIZES = (1, 10, 100, 1000)
+TIME_BUDGET_S = 0.5
+
+# Dijalankan di subprocess: cetak RSS puncak (KB) setelah load + predict.
+# VmHWM dipakai karena ru_maxrss Linux terbawa dari proses induk lewat fork/exec.
+_RSS_SCRIPT = """
+import sys, numpy as np
+mode, path, x_path = sys.argv[1:4]
+X = np.load(x_path)
+if mode == "joblib":
+    import joblib, pandas as pd
+    model = joblib.load(path)
+    model.n_jobs = 1
+    names = getattr(model, "feature_names_in_", None)
+    model.predict(pd.DataFrame(X, columns=names) if names is not None else X)
+else:
+    from saham.compiled_forest import load_compiled
+    load_compiled(path).predict(X)
+with open("/proc/self/status") as f:
+    print(next(line.split()[1] for line in f if line.startswith("VmHWM:")))
+"""
+
+
+def scaled_features(bank, scaler):
+    data = compute_features(load_raw_csv(bank)).dropna()
+    return (data[SCALER_COLUMNS].to_numpy() * scaler.scale_ + scaler.min_)[:, 1:]
+
+
+def throughput(predict, X, batch):
+    rows = np.resize(X, (batch, X.shape[1]))
+    predict(rows)
+    repeats = 0
+    t0 = time.perf_counter()
+    while repeats < 3 or time.perf_counter() - t0 < TIME_BUDGET_S:
+        predict(rows)
+        repeats += 1
+    return batch * repeats / (time.perf_counter() - t0)
+
+
+def peak_rss_kb(mode, path, x_path):
+    out = subprocess.run(
+        [sys.executable, "-c", _RSS_SCRIPT, mode, path, x_path],
+        capture_output=True, text=True, check=True, cwd=os.getcwd(),
+    )
+    return int(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    tmp = tempfile.mkdtemp(prefix="compiled_forest_")
+    for bank in BANKS:
+        model, scaler = load_or_fit_assets(bank)
+        X = scaled_features(bank, scaler)
+        ref = model.predict(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+        print(f"\n=== {bank}: {len(model.estimators_)} pohon, {sum(e.tree_.node_count for e in model.estimators_):,} node ===")
+
+        forests = {mode: compile_forest(model, mode) for mode in THRESHOLD_MODES}
+        forests["float32+nilai f32"] = compile_forest(model, "quantized", value_dtype=np.float32)
+        for name, forest in forests.items():
+            err = np.abs(forest.predict(X) - ref).max()
+            tol = PREDICT_ATOL_F32 if forest.value.dtype == np.float32 else PREDICT_ATOL
+            assert err <= tol, f"{bank}/{name}: selisih {err:.2e} > {tol:.0e}"
+            print(f"  {name:<18} {forest.nbytes / 1e6:7.2f} MB   max |selisih| {err:.2e} (toleransi {tol:.0e})")
+
+        skl = lambda rows: model.predict(pd.DataFrame(rows, columns=FEATURE_COLUMNS))
+        fast = forests["float64"].predict
+        for batch in BATCH_SIZES:
+            a, b = throughput(skl, X, batch), throughput(fast, X, batch)
+            print(f"  batch {batch:>5}: sklearn {a:>11,.0f} baris/s | terkompilasi {b:>11,.0f} baris/s ({b / a:5.1f}x)")
+
+        pkl_path = os.path.join(tmp, f"{bank}.pkl")
+        npz_path = os.path.join(tmp, f"{bank}.npz")
+        x_path = os.path.join(tmp, f"{bank}_X.npy")
+        joblib.dump(model, pkl_path)
+        save_compiled(forests["float64"], npz_path)
+        np.save(x_path, X)
+        assert np.array_equal(load_compiled(npz_path).predict(X), forests["float64"].predict(X))
+        rss_j, rss_c = peak_rss_kb("joblib", pkl_path, x_path), peak_rss_kb("compiled", npz_path, x_path)
+        print(f"  RSS puncak: joblib {rss_j / 1024:6.1f} MB ({os.path.getsize(pkl_path) / 1e6:.1f} MB file) | "
+              f"terkompilasi {rss_c / 1024:6.1f} MB ({os.path.getsize(npz_path) / 1e6:.1f} MB file)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Biaya pemantauan drift streaming (saham.drift) pada pasar sintetis.
+
+N ticker x 3 tahun bar harian (benchmarks/_synthetic.py). Referensi =
+80% bar pertama (MinMax atas semua bar, sama seperti prepare_dataset);
+20% sisanya dialirkan hari per hari. Dibandingkan per hari bursa:
+* stream vektor : satu DriftMonitor.observe untuk semua ticker
+* stream loop   : observe per ticker (state sama, tanpa vektorisasi lintas ticker)
+* hitung ulang  : simpan bar ter-scaling HALFLIFE x 4 terakhir per ticker lalu
+                  hitung ulang mean/std/histogram berbobot setiap hari
+Ditambah memori state per ticker x fitur dan waktu report() seluruh
+universe. Hasil stream vektor dan loop dicek identik.
+
+Jalankan: python -m benchmarks.bench_drift [--tickers 45 500]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import synthetic_ohlcv, synthetic_tickers
+from saham.drift import BINS, HALFLIFE, DriftMonitor, _bin_index, feature_rows, reference_stats
+
+TRAIN_RATIO = 0.8
+
+
+def build(n):
+    # {ticker: referensi}, {ticker: (tanggal, baris)} periode setelah train
+    references, streams = {}, {}
+    for t in synthetic_tickers(n):
+        dates, rows = feature_rows(synthetic_ohlcv(t, 3))
+        n_train = int(len(rows) * TRAIN_RATIO)
+        lo, hi = rows.min(axis=0), rows.max(axis=0)
+        scaled = (rows[:n_train] - lo) / np.where(hi > lo, hi - lo, 1.0)
+        references[t] = reference_stats(scaled, lo, hi, dates[n_train - 1])
+        streams[t] = (dates[n_train:], rows[n_train:])
+    return references, streams
+
+
+def monitor_for(references):
+    monitor = DriftMonitor(reference_loader=None)
+    for t, ref in references.items():
+        monitor.add(t, ref)
+    return monitor
+
+
+def days(streams):
+    n_days = min(len(d) for d, _ in streams.values())
+    for k in range(n_days):
+        yield {t: (d[k:k + 1], r[k:k + 1]) for t, (d, r) in streams.items()}
+
+
+def recompute(monitor, buffers, batch, keep, weights):
+    # Pembanding non-streaming: bar disimpan, statistik dihitung ulang
+    for t, (_, rows) in batch.items():
+        i = monitor.index[t]
+        buf = buffers.setdefault(t, [])
+        buf.append(monitor.scale(i, rows[0]))
+        del buf[:-keep]
+        x = np.asarray(buf)
+        w = weights[-len(x):, None]
+        mean = (w * x).sum(axis=0) / w.sum()
+        _ = (w * (x - mean) ** 2).sum(axis=0) / w.sum()
+        b = _bin_index(x, BINS)
+        _ = [np.bincount(b[:, j], weights=w[:, 0], minlength=BINS + 2) for j in range(x.shape[1])]
+
+
+def run(n):
+    references, streams = build(n)
+    n_days = min(len(d) for d, _ in streams.values())
+
+    vec = monitor_for(references)
+    t0 = time.perf_counter()
+    for batch in days(streams):
+        vec.observe(batch)
+    vec_sec = (time.perf_counter() - t0) / n_days
+
+    loop = monitor_for(references)
+    t0 = time.perf_counter()
+    for batch in days(streams):
+        for t, item in batch.items():
+            loop.observe({t: item})
+    loop_sec = (time.perf_counter() - t0) / n_days
+    same = all(np.allclose(vec.arrays[k], loop.arrays[k], rtol=0, atol=1e-12) for k in vec.arrays)
+
+    keep = HALFLIFE * 4
+    weights = vec.decay ** np.arange(keep)[::-1]
+    buffers = {}
+    t0 = time.perf_counter()
+    for batch in days(streams):
+        recompute(vec, buffers, batch, keep, weights)
+    re_sec = (time.perf_counter() - t0) / n_days
+
+    t0 = time.perf_counter()
+    table = vec.report()
+    report_sec = time.perf_counter() - t0
+    per_feature = vec.nbytes / (len(vec.tickers) * len(table["feature"].unique()))
+    drift = (table.groupby("ticker")["status"].agg(lambda s: s.isin(["range", "shift"]).any())).sum()
+    print(f"{n:>5} ticker x {n_days} hari | per hari: stream vektor {vec_sec * 1e3:7.2f} ms | "
+          f"loop {loop_sec * 1e3:7.2f} ms ({loop_sec / vec_sec:.1f}x) | hitung ulang {re_sec * 1e3:7.2f} ms "
+          f"({re_sec / vec_sec:.1f}x) | identik {same}")
+    print(f"      state {per_feature:.0f} B/fitur (hitung ulang {keep * 8} B/fitur) | report {report_sec * 1e3:.1f} ms | "
+          f"ticker drift {drift}/{n}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Biaya pemantauan drift streaming.")
+    parser.add_argument("--tickers", nargs="+", type=int, default=[45, 500])
+    args = parser.parse_args()
+    for n in args.tickers:
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Throughput prakiraan rekursif multi-hari: saham.forecast vs loop per ticker per hari.
+
+Skenario:
+* 5 hari x 5 bank  : Data/Raw, forest terkompilasi per bank (satu model per
+  bank -> 5 panggilan predict per langkah).
+* 20 hari x 500 ticker : pasar sintetis (benchmarks/_synthetic.py) dengan
+  satu forest pooled (dilatih pada 50 ticker, scaler MinMax per ticker
+  untuk 500 ticker) -> 1 panggilan predict per langkah.
+Pembanding = loop naif: per ticker, per hari, hitung ulang fitur seluruh
+window + bar templat, predict satu baris, tambahkan bar prediksi. Semantik
+sama dengan forecast(), sehingga hasil dicek identik (selisih relatif maks).
+
+Jalankan: python -m benchmarks.bench_forecast [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks._assets import load_or_fit_assets
+from benchmarks._synthetic import synthetic_ohlcv, synthetic_tickers
+from saham.compiled_forest import compile_forest
+from saham.data import BANKS, load_raw_csv
+from saham.forecast import forecast, template_stats
+from saham.indicators import compute_feature_array
+from saham.inference import inverse_close, predict_batch, scale_rows
+from saham.panel import Panel
+from saham.pooled import PooledModel, default_params, fit_pooled, panel_minmax
+
+WINDOW = 60
+POOLED_TRAIN_TICKERS = 50
+_OHLCV = ("Close", "High", "Low", "Open", "Volume")
+
+
+def forecast_loop(assets, windows, horizon):
+    # Python loop per ticker per hari (scaler diasumsikan urutan SCALER_COLUMNS)
+    out = {}
+    for t, w in windows.items():
+        model, scaler = assets[t]
+        cols = [w[c].to_numpy(dtype=np.float64) for c in _OHLCV]
+        up, down, vol = (float(v[0]) for v in template_stats(*(cols[i][:, None] for i in (0, 1, 2, 4))))
+        preds = []
+        for _ in range(horizon):
+            c = cols[0][-1]
+            bar = (c, c * (1 + up), c * (1 + down), c, vol)
+            feats = compute_feature_array(*(np.append(a, v) for a, v in zip(cols, bar)))[-1]
+            rows = np.concatenate([[c], feats])[None]
+            y = float(inverse_close(scaler, model.predict(scale_rows(scaler, rows)[:, 1:]))[0])
+            preds.append(y)
+            real = (y, max(c, y) * (1 + up), min(c, y) * (1 + down), c, vol)
+            cols = [np.append(a, v) for a, v in zip(cols, real)]
+        out[t] = preds
+    return out
+
+
+def timed(fn, repeat):
+    best, result = np.inf, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def report(label, assets, windows, horizon, repeat, loop_sample=None):
+    vec_sec, table = timed(lambda: forecast(assets, windows, horizon), repeat)
+    sample = list(windows)[:loop_sample] if loop_sample else list(windows)
+    loop_sec, loop = timed(lambda: forecast_loop(assets, {t: windows[t] for t in sample}, horizon), 1)
+    loop_sec *= len(windows) / len(sample)
+    pred = table.pivot(index="ticker", columns="step", values="pred_close")
+    diff = max(np.max(np.abs(pred.loc[t].to_numpy() / np.array(loop[t]) - 1)) for t in sample)
+    pairs = len(windows) * horizon
+    step1 = predict_batch(assets, {t: windows[t] for t in sample})["pred_next"]
+    diff1 = float(np.max(np.abs(pred.loc[sample, 1] / step1 - 1)))
+    print(f"{label}: forecast {vec_sec * 1e3:.1f} ms ({pairs / vec_sec:,.0f} ticker-hari/s) | "
+          f"loop {loop_sec * 1e3:.1f} ms{' (ekstrapolasi ' + str(len(sample)) + ' ticker)' if loop_sample else ''} "
+          f"({pairs / loop_sec:,.0f} ticker-hari/s) | {loop_sec / vec_sec:.1f}x | "
+          f"selisih vs loop {diff:.1e}, langkah 1 vs predict_batch {diff1:.1e}")
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput prakiraan rekursif multi-hari.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    assets = {}
+    for bank in BANKS:
+        model, scaler = load_or_fit_assets(bank)
+        assets[bank] = (compile_forest(model), scaler)
+    windows = {bank: load_raw_csv(bank).tail(WINDOW) for bank in BANKS}
+    table = report("5 hari x 5 bank", assets, windows, 5, args.repeat)
+    print(table[table.ticker == BANKS[0]][["step", "date", "pred_close"]].to_string(index=False))
+
+    tickers = synthetic_tickers(500)
+    frames = {t: synthetic_ohlcv(t, 3) for t in tickers}
+    t0 = time.perf_counter()
+    train = fit_pooled(Panel.from_frames({t: frames[t] for t in tickers[:POOLED_TRAIN_TICKERS]}), default_params())
+    data_min, data_max = panel_minmax(Panel.from_frames(frames))
+    pooled = PooledModel(train.forest, tickers, data_min, data_max)
+    print(f"\nforest pooled: {POOLED_TRAIN_TICKERS} ticker, {time.perf_counter() - t0:.1f}s")
+    windows = {t: df.tail(WINDOW) for t, df in frames.items()}
+    report("20 hari x 500 ticker", {t: pooled.assets(t) for t in tickers}, windows, 20, args.repeat, loop_sample=100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Latensi inferensi batch (fitur + scaling + predict + inverse) untuk 5 bank.
+
+Membandingkan satu panggilan predict_batch() untuk semua bank dengan loop
+per bank, lalu mengecek p95 terhadap LATENCY_TARGET_MS (forest sklearn)
+dan COMPILED_LATENCY_TARGET_MS (forest terkompilasi).
+
+Jalankan: python -m benchmarks.bench_inference
+"""
+import time
+
+import numpy as np
+
+from benchmarks._assets import load_or_fit_assets
+from saham.compiled_forest import compile_forest
+from saham.data import BANKS, load_raw_csv
+from saham.inference import COMPILED_LATENCY_TARGET_MS, LATENCY_TARGET_MS, predict_batch
+
+WINDOW_DAYS = 60
+REPEATS = 50
+
+
+def measure(fn, repeats=REPEATS):
+    fn()
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e3)
+    return np.percentile(samples, 50), np.percentile(samples, 95)
+
+
+def main():
+    assets = {bank: load_or_fit_assets(bank) for bank in BANKS}
+    windows = {bank: load_raw_csv(bank).tail(WINDOW_DAYS) for bank in BANKS}
+
+    result = predict_batch(assets, windows)
+    print(result.to_string())
+
+    p50, p95 = measure(lambda: predict_batch(assets, windows))
+    print(f"\npredict_batch 5 bank      : p50 {p50:7.2f} ms | p95 {p95:7.2f} ms")
+    s50, s95 = measure(lambda: [predict_batch({b: assets[b]}, {b: windows[b]}) for b in BANKS])
+    print(f"5x predict_batch per bank : p50 {s50:7.2f} ms | p95 {s95:7.2f} ms")
+
+    status = "LULUS" if p95 <= LATENCY_TARGET_MS else "GAGAL"
+    print(f"Target p95 <= {LATENCY_TARGET_MS:.0f} ms: {status}")
+
+    compiled = {bank: (compile_forest(model), scaler) for bank, (model, scaler) in assets.items()}
+    c50, c95 = measure(lambda: predict_batch(compiled, windows))
+    print(f"\npredict_batch terkompilasi: p50 {c50:7.2f} ms | p95 {c95:7.2f} ms")
+    status = "LULUS" if c95 <= COMPILED_LATENCY_TARGET_MS else "GAGAL"
+    print(f"Target p95 <= {COMPILED_LATENCY_TARGET_MS:.0f} ms: {status}")
+
+
+if __name__ == "__main__":
+    main()
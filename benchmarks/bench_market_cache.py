@@ -0,0 +1,103 @@
+"""Perilaku cache data pasar secara offline dengan FakeMarketFetcher.
+
+* 50 sesi serentak meminta BBCA -> satu fetch (single-flight),
+* hit/miss sebelum & sesudah TTL (jam palsu),
+* eviction LRU saat melewati max_entries,
+* retry lalu fallback ke entri stale saat koneksi gagal,
+* satu putaran Prefetcher untuk 5 bank.
+
+Jalankan: python -m benchmarks.bench_market_cache
+"""
+import threading
+import time
+
+from saham.data import BANKS, load_raw_csv
+from saham.market_cache import FakeMarketFetcher, FetchError, MarketDataCache, Prefetcher
+
+FETCH_LATENCY = 0.2
+SESSIONS = 50
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def main():
+    frames = {bank: load_raw_csv(bank) for bank in BANKS}
+
+    # 1. Single-flight
+    fetcher = FakeMarketFetcher(frames, latency=FETCH_LATENCY)
+    cache = MarketDataCache(fetcher)
+    barrier = threading.Barrier(SESSIONS)
+
+    def session():
+        barrier.wait()
+        cache.get("BBCA")
+
+    threads = [threading.Thread(target=session) for _ in range(SESSIONS)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    print(f"{SESSIONS} sesi serentak: {fetcher.calls['BBCA']} fetch, {wall * 1e3:.0f} ms "
+          f"(sekuensial tanpa cache ~{SESSIONS * FETCH_LATENCY * 1e3:.0f} ms)")
+    assert fetcher.calls["BBCA"] == 1
+
+    # 2. TTL
+    clock = FakeClock()
+    fetcher = FakeMarketFetcher(frames)
+    cache = MarketDataCache(fetcher, ttl=300, clock=clock)
+    cache.get("BBRI")
+    clock.now = 299
+    cache.get("BBRI")
+    clock.now = 301
+    cache.get("BBRI")
+    s = cache.stats()
+    print(f"TTL 300 s: hits={s['hits']} misses={s['misses']} fetch={fetcher.calls['BBRI']}")
+    assert (s["hits"], s["misses"]) == (1, 2)
+
+    # 3. Eviction LRU
+    cache = MarketDataCache(FakeMarketFetcher(frames), max_entries=3)
+    for bank in BANKS:
+        cache.get(bank)
+    s = cache.stats()
+    print(f"max_entries=3, 5 ticker: entries={s['entries']} evictions={s['evictions']}")
+    assert s["entries"] == 3 and s["evictions"] == 2
+
+    # 4. Retry & stale
+    clock = FakeClock()
+    fetcher = FakeMarketFetcher(frames)
+    cache = MarketDataCache(fetcher, ttl=60, clock=clock, sleep=lambda s: None)
+    cache.get("BMRI")
+    clock.now = 120
+    fetcher.failures = 10
+    stale = cache.get("BMRI")
+    s = cache.stats()
+    print(f"Koneksi gagal: retries={s['retries']} errors={s['errors']} stale_served={s['stale_served']} "
+          f"({len(stale)} bar lama dikembalikan)")
+    try:
+        cache.get("BBTN")
+    except FetchError as exc:
+        print(f"Tanpa entri stale -> FetchError: {exc}")
+
+    # 5. Prefetcher
+    fetcher = FakeMarketFetcher(frames, latency=0.01)
+    cache = MarketDataCache(fetcher)
+    prefetch = Prefetcher(cache, BANKS, is_open=lambda: True)
+    prefetch.run_once()
+    for bank in BANKS:
+        cache.get(bank)
+    s = cache.stats()
+    print(f"Setelah prefetch: hits={s['hits']} misses={s['misses']} hit_ratio={s['hit_ratio']:.2f} "
+          f"fetch_ms_avg={s['fetch_ms_avg']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
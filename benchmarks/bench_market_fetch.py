@@ -0,0 +1,114 @@
+"""Fetch 45 emiten sektor perbankan IDX: sekuensial vs thread pool vs bulk.
+
+Jaringan disimulasikan offline (latensi deterministik per ticker, sebagian
+ticker gagal) agar hasil dapat diulang. Ticker gagal harus terisi dari
+histori lokal PriceStore (fallback), bukan DataFrame kosong. Normalisasi
+kolom MultiIndex yfinance diuji untuk kedua orientasi (Price, Ticker) dan
+(Ticker, Price).
+
+Jalankan: python -m benchmarks.bench_market_fetch
+"""
+import shutil
+import tempfile
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from saham.data import BANKS, IDX_BANKING_SECTOR, PRICE_COLUMNS, load_raw_csv
+from saham.market_fetch import fetch_many, split_download, store_fallback
+from saham.price_store import PriceStore
+
+BASE_LATENCY = 0.08
+JITTER = 0.12
+BULK_LATENCY = 0.6
+FAILING = {"BBKP", "BSWD", "MCOR"}
+WORKERS = (1, 8, 16)
+
+
+def sector_frames():
+    # Histori tiruan per ticker dari 5 CSV Data/Raw dengan skala harga berbeda
+    raw = [load_raw_csv(bank) for bank in BANKS]
+    frames = {}
+    for i, ticker in enumerate(IDX_BANKING_SECTOR):
+        scale = 1.0 if i < len(BANKS) else 0.05 + (zlib.crc32(ticker.encode()) % 100) / 50
+        df = raw[i % len(raw)].copy()
+        df[["Close", "High", "Low", "Open"]] *= scale
+        frames[ticker] = df
+    return frames
+
+
+class SimulatedNetwork:
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def latency(self, ticker):
+        return BASE_LATENCY + JITTER * (zlib.crc32(ticker.encode()) % 1000) / 1000
+
+    def fetch_one(self, ticker, start, end):
+        time.sleep(self.latency(ticker))
+        if ticker in FAILING:
+            raise ConnectionError(f"timeout {ticker}.JK")
+        df = self.frames[ticker]
+        return df[(df.index >= start) & (df.index < end)]
+
+    def bulk(self, tickers, start, end):
+        # Bentuk kolom seperti yf.download(..., group_by="ticker")
+        time.sleep(BULK_LATENCY)
+        parts = {f"{t}.JK": self.fetch_frame(t, start, end) for t in tickers if t not in FAILING}
+        data = pd.concat(parts, axis=1)
+        return split_download(data, tickers)
+
+    def fetch_frame(self, ticker, start, end):
+        df = self.frames[ticker]
+        return df[(df.index >= start) & (df.index < end)]
+
+
+def check_split(frames):
+    sub = {f"{t}.JK": frames[t] for t in BANKS}
+    by_ticker = pd.concat(sub, axis=1)                   # (Ticker, Price)
+    by_price = by_ticker.swaplevel(0, 1, axis=1)         # (Price, Ticker) default yfinance
+    for data in (by_ticker, by_price):
+        out = split_download(data, BANKS)
+        for t in BANKS:
+            assert list(out[t].columns) == PRICE_COLUMNS
+            assert np.allclose(out[t].to_numpy(), frames[t].to_numpy())
+    print("split_download: MultiIndex (Ticker, Price) & (Price, Ticker) -> kolom satu level OK")
+
+
+def main():
+    frames = sector_frames()
+    check_split(frames)
+    root = tempfile.mkdtemp(prefix="market_fetch_")
+    try:
+        store = PriceStore(root)
+        for ticker, df in frames.items():
+            store.append(ticker, df.iloc[:-20])
+        net = SimulatedNetwork(frames)
+        start, end = frames["BBCA"].index[-60], frames["BBCA"].index[-1] + pd.Timedelta(days=1)
+
+        print(f"\n{len(IDX_BANKING_SECTOR)} ticker, latensi {BASE_LATENCY * 1e3:.0f}-"
+              f"{(BASE_LATENCY + JITTER) * 1e3:.0f} ms/ticker, {len(FAILING)} ticker gagal")
+        baseline = None
+        for workers in WORKERS:
+            got, report = fetch_many(IDX_BANKING_SECTOR, start, end, fetch_one=net.fetch_one,
+                                     max_workers=workers, fallback=store_fallback(store))
+            baseline = baseline or report["seconds"]
+            counts = pd.Series(report["sources"]).value_counts().to_dict()
+            label = "sekuensial" if workers == 1 else f"pool {workers} thread"
+            print(f"  {label:<16}: {report['seconds'] * 1e3:7.0f} ms ({baseline / report['seconds']:4.1f}x) {counts}")
+            assert len(got) == len(IDX_BANKING_SECTOR)
+
+        got, report = fetch_many(IDX_BANKING_SECTOR, start, end, bulk=net.bulk, fallback=store_fallback(store))
+        counts = pd.Series(report["sources"]).value_counts().to_dict()
+        print(f"  {'bulk 1 panggilan':<16}: {report['seconds'] * 1e3:7.0f} ms ({baseline / report['seconds']:4.1f}x) {counts}")
+        for ticker in FAILING:
+            assert report["sources"][ticker] == "fallback" and not got[ticker].empty
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
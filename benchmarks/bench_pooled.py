@@ -0,0 +1,110 @@
+"""Per-ticker (satu forest + scaler per ticker) vs model pooled (saham.pooled).
+
+Universe sintetis (benchmarks/_synthetic.py) N ticker x 3 tahun bar harian,
+hyperparameter best_params BBCA untuk kedua mode. Dibandingkan:
+* memori fitur : dict DataFrame compute_features per ticker vs Panel
+* memori model : total forest terkompilasi (+ scaler) per ticker vs satu forest
+* training     : fit semua forest per ticker vs satu fit_pooled (n_jobs=1)
+* inferensi    : predict_batch seluruh universe dari 60 bar terakhir (p50)
+* akurasi      : rata-rata MAPE test (Rupiah) per ticker, split 80/20;
+                 kedua mode fit MinMax hanya pada baris train (rentang
+                 harga periode test tidak bocor ke scaling)
+
+Jalankan: python -m benchmarks.bench_pooled [--tickers 45 200] [--years 3]
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import MinMaxScaler
+
+from benchmarks._synthetic import synthetic_ohlcv, synthetic_tickers
+from saham.compiled_forest import compile_forest
+from saham.indicators import FEATURE_COLUMNS, SCALER_COLUMNS, TARGET_COLUMN, compute_features
+from saham.inference import inverse_close, predict_batch
+from saham.panel import Panel
+from saham.pooled import default_params, fit_pooled
+from saham.training import RANDOM_STATE, TRAIN_RATIO
+
+PREDICT_REPEATS = 10
+
+
+def per_ticker(frames, params):
+    # Jalur sekarang (RandomForestRegressor per ticker), scaler dari baris train
+    t0 = time.perf_counter()
+    features = {t: compute_features(df).dropna() for t, df in frames.items()}
+    feature_seconds = time.perf_counter() - t0
+    feature_bytes = sum(int(f.memory_usage(index=True, deep=True).sum()) for f in features.values())
+
+    assets, mapes, fit_seconds = {}, [], 0.0
+    for t, data in features.items():
+        n_train = int(len(data) * TRAIN_RATIO)
+        scaler = MinMaxScaler().fit(data[SCALER_COLUMNS].iloc[:n_train])
+        values = scaler.transform(data[SCALER_COLUMNS])
+        model = RandomForestRegressor(random_state=RANDOM_STATE, n_jobs=1, **params)
+        t0 = time.perf_counter()
+        model.fit(values[:n_train, 1:], values[:n_train, 0])
+        fit_seconds += time.perf_counter() - t0
+        model.feature_names_in_ = np.array(FEATURE_COLUMNS, dtype=object)
+        forest = compile_forest(model)
+        y_pred = inverse_close(scaler, forest.predict(values[n_train:, 1:]))
+        y_true = data[TARGET_COLUMN].to_numpy()[n_train:]
+        mapes.append(float(np.mean(np.abs((y_true - y_pred) / y_true)) * 100))
+        assets[t] = (forest, scaler)
+    model_bytes = sum(f.nbytes + 4 * len(SCALER_COLUMNS) * 8 for f, _ in assets.values())
+    return {
+        "feature_seconds": feature_seconds, "feature_bytes": feature_bytes, "fit_seconds": fit_seconds,
+        "model_bytes": model_bytes, "mape": statistics.mean(mapes), "assets": assets,
+    }
+
+
+def pooled(frames, params):
+    t0 = time.perf_counter()
+    panel = Panel.from_frames(frames)
+    feature_seconds = time.perf_counter() - t0
+    model = fit_pooled(panel, params, n_jobs=1)
+    return {
+        "feature_seconds": feature_seconds, "feature_bytes": panel.nbytes,
+        "fit_seconds": model.metrics["fit_seconds"], "model_bytes": model.nbytes,
+        "mape": statistics.mean(model.metrics["test_mape_per_ticker"].values()),
+        "assets": {t: model.assets(t) for t in model.tickers},
+    }
+
+
+def predict_p50(assets, windows, repeats=PREDICT_REPEATS):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        predict_batch(assets, windows)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan model per ticker dan model pooled.")
+    parser.add_argument("--tickers", nargs="+", type=int, default=[45, 200])
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args()
+    params = default_params()
+    print(f"params: {params}")
+
+    for n in args.tickers:
+        tickers = synthetic_tickers(n)
+        frames = {t: synthetic_ohlcv(t, args.years) for t in tickers}
+        windows = {t: df.tail(60) for t, df in frames.items()}
+        raw_bytes = sum(int(df.memory_usage(index=True).sum()) for df in frames.values())
+        print(f"\n[{n} ticker x {args.years} tahun] OHLCV {raw_bytes / 2**20:.1f} MiB")
+        print(f"  {'mode':<11}{'fitur MiB':>10}{'fitur s':>9}{'model MiB':>11}{'fit s':>8}"
+              f"{'predict ms':>12}{'ticker/s':>10}{'MAPE %':>8}")
+        for label, run in (("per-ticker", per_ticker), ("pooled", pooled)):
+            r = run(frames, params)
+            sec = predict_p50(r["assets"], windows)
+            print(f"  {label:<11}{r['feature_bytes'] / 2**20:>10.2f}{r['feature_seconds']:>9.2f}"
+                  f"{r['model_bytes'] / 2**20:>11.1f}{r['fit_seconds']:>8.1f}{sec * 1e3:>12.1f}"
+                  f"{n / sec:>10.0f}{r['mape']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Store OHLCV kolumnar vs parsing CSV Data/Raw, dan byte per refresh.
+
+* cold read : PriceStore baru (buka meta + memmap) lalu baca seluruh histori,
+* warm read : baca ulang dengan memmap yang sudah terbuka,
+* slice     : rentang 3 bulan lewat searchsorted,
+* refresh   : store berisi histori minus N hari terakhir, FakeFetcher offline
+              melengkapi sisanya; dibandingkan dengan unduhan period="60d"
+              penuh setiap klik seperti versi lama get_live_data(). Refresh
+              kedua di hari yang sama hanya mengambil ulang bar terakhir
+              (bar sesi berjalan bisa berubah).
+
+Jalankan: python -m benchmarks.bench_price_store
+"""
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from saham.data import BANKS, load_raw_csv
+from saham.price_store import FakeFetcher, PriceStore
+
+REPEATS = 20
+MISSING_DAYS = 5
+OLD_WINDOW = "60D"
+
+
+def timed(fn, repeats=REPEATS):
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e3)
+    return float(np.median(samples))
+
+
+def main():
+    root = tempfile.mkdtemp(prefix="price_store_")
+    try:
+        frames = {bank: load_raw_csv(bank) for bank in BANKS}
+        seed = PriceStore(root)
+        for bank, df in frames.items():
+            seed.append(bank, df.iloc[:-MISSING_DAYS])
+
+        print(f"{'Bank':<6}{'CSV (ms)':>10}{'Cold (ms)':>11}{'Warm (ms)':>11}{'Slice (ms)':>12}")
+        for bank in BANKS:
+            t_csv = timed(lambda: load_raw_csv(bank))
+            t_cold = timed(lambda: PriceStore(root).read(bank))
+            warm = PriceStore(root)
+            warm.read(bank)
+            t_warm = timed(lambda: warm.read(bank))
+            t_slice = timed(lambda: warm.read(bank, "2024-01-01", "2024-03-31"))
+            print(f"{bank:<6}{t_csv:>10.2f}{t_cold:>11.2f}{t_warm:>11.2f}{t_slice:>12.3f}")
+
+        fetcher = FakeFetcher(frames)
+        store = PriceStore(root)
+        print(f"\n{'Bank':<6}{'Bar baru':>9}{'Byte refresh':>14}{'Byte 60d lama':>15}{'Refresh ke-2':>14}")
+        for bank, df in frames.items():
+            today = df.index[-1]
+            added = store.refresh(bank, fetcher, today=today)
+            first = store.last_refresh[bank]
+            store.refresh(bank, fetcher, today=today)
+            second = store.last_refresh[bank]
+            old = df.loc[df.index > today - np.timedelta64(60, "D")]
+            old_bytes = int(old.memory_usage(index=True).sum())
+            print(f"{bank:<6}{added:>9}{first['bytes']:>14,}{old_bytes:>15,}{second['bytes']:>14,}")
+            assert store.read(bank).equals(df), f"{bank}: isi store berbeda dari Data/Raw"
+        print(f"\nPanggilan fetcher: {fetcher.calls} (refresh kedua di hari yang sama hanya mengambil ulang bar terakhir)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
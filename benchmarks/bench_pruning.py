@@ -0,0 +1,101 @@
+"""Model penuh (20 fitur) vs model hasil pruning (saham.pruning), 5 bank.
+
+Untuk setiap bank: seleksi fitur mode per bank dan mode sektor dari laporan
+Feature_Importance/, latih ulang dengan best_params bank, lalu bandingkan:
+* R² test (split 80/20 yang sama dengan saham.training)
+* build fitur inferensi: build_rows pada 60 bar terakhir (us)
+* predict: predict_batch satu bank, forest terkompilasi (ms)
+* ukuran model: forest terkompilasi dan .pkl joblib (KiB)
+Baris terakhir: predict_batch 5 bank sekaligus. Waktu = minimum dari
+REPEATS ulangan (gangguan proses lain di VM hanya menambah waktu).
+
+Jalankan: python -m benchmarks.bench_pruning
+"""
+import io
+import json
+import time
+
+import joblib
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import r2_score
+
+from saham.compiled_forest import compile_forest
+from saham.data import BANKS, load_raw_csv
+from saham.indicators import FEATURE_COLUMNS, TARGET_COLUMN
+from saham.inference import build_rows, predict_batch
+from saham.pruning import importance_ranking, select_features
+from saham.training import RANDOM_STATE, SUMMARY_FILE, prepare_dataset
+
+REPEATS = 300
+
+
+def fastest(fn, repeats=REPEATS):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def pickle_bytes(model):
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return buf.tell()
+
+
+def fit(scaled, n_train, features, params):
+    model = RandomForestRegressor(random_state=RANDOM_STATE, n_jobs=1, **params)
+    model.fit(scaled[features].iloc[:n_train], scaled[TARGET_COLUMN].iloc[:n_train])
+    r2 = r2_score(scaled[TARGET_COLUMN].iloc[n_train:], model.predict(scaled[features].iloc[n_train:]))
+    return model, r2
+
+
+def main():
+    with open(SUMMARY_FILE) as f:
+        summary = json.load(f)
+    params = {b: summary.get(b, {}).get("tuning_results", {}).get("best_params") or {"n_estimators": 100}
+              for b in BANKS}
+    data = {}
+    for bank in BANKS:
+        df = load_raw_csv(bank)
+        _, _, scaler, scaled, n_train = prepare_dataset(df)
+        data[bank] = (df, scaler, scaled, n_train)
+
+    t0 = time.perf_counter()
+    sector = select_features(
+        {b: (s[FEATURE_COLUMNS].iloc[:n], s[TARGET_COLUMN].iloc[:n]) for b, (_, _, s, n) in data.items()},
+        params[BANKS[0]], importance_ranking(None),
+    )
+    print(f"Sektor ({time.perf_counter() - t0:.1f}s): {sector['n_features']}/20 {sector['features']}")
+
+    print(f"\n{'bank':<6}{'mode':<8}{'fitur':>6}{'R² test':>9}{'ΔR²':>9}{'fitur us':>10}{'predict ms':>12}"
+          f"{'forest KiB':>12}{'pkl KiB':>10}")
+    batch = {"penuh": {}, "bank": {}, "sektor": {}}
+    windows = {}
+    for bank, (df, scaler, scaled, n_train) in data.items():
+        X_train, y_train = scaled[FEATURE_COLUMNS].iloc[:n_train], scaled[TARGET_COLUMN].iloc[:n_train]
+        chosen = select_features({bank: (X_train, y_train)}, params[bank], importance_ranking(bank))
+        window = windows[bank] = df.tail(60)
+        base_r2 = None
+        for mode, features in (("penuh", FEATURE_COLUMNS), ("bank", chosen["features"]),
+                               ("sektor", sector["features"])):
+            model, r2 = fit(scaled, n_train, features, params[bank])
+            base_r2 = r2 if base_r2 is None else base_r2
+            forest = compile_forest(model)
+            batch[mode][bank] = (forest, scaler)
+            build = fastest(lambda: build_rows(window, features))
+            pred = fastest(lambda: predict_batch({bank: (forest, scaler)}, {bank: window}))
+            print(f"{bank:<6}{mode:<8}{len(features):>6}{r2:>9.4f}{r2 - base_r2:>+9.4f}{build * 1e6:>10.0f}"
+                  f"{pred * 1e3:>12.3f}{forest.nbytes / 1024:>12.0f}{pickle_bytes(model) / 1024:>10.0f}")
+
+    full = fastest(lambda: predict_batch(batch["penuh"], windows), 100)
+    print(f"\npredict_batch 5 bank: penuh {full * 1e3:.2f} ms", end="")
+    for mode in ("bank", "sektor"):
+        sec = fastest(lambda: predict_batch(batch[mode], windows), 100)
+        print(f" | {mode} {sec * 1e3:.2f} ms ({full / sec:.2f}x)", end="")
+    print()
+
+
+if __name__ == "__main__":
+    main()
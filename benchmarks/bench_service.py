@@ -0,0 +1,178 @@
+"""Load test layanan prediksi HTTP lokal, tanpa jaringan.
+
+Server dijalankan di subprocess (model stand-in dari bundle sementara, data
+dari cache dengan fetcher tiruan). Generator beban: CLIENTS koneksi
+keep-alive serentak, tiap permintaan 1-3 ticker acak dari 5 bank, selama
+DURATION detik. Skenario:
+* tanpa batching (max_batch=1);
+* micro-batching (max_wait 2 ms);
+* micro-batching + lalu lintas ticker "SLOW" yang fetch-nya selalu 300 ms;
+  latensi permintaan 5 bank tidak boleh ikut naik.
+
+Jalankan: python -m benchmarks.bench_service
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks._assets import load_or_fit_assets
+from saham.bundle import ModelBundle, write_bundle
+from saham.compiled_forest import compile_forest
+from saham.data import BANKS, load_raw_csv
+from saham.market_cache import FakeMarketFetcher, MarketDataCache
+from saham.service import Predictor, PredictionService
+
+CLIENTS = 32
+SLOW_CLIENTS = 4
+DURATION = 5.0
+FETCH_LATENCY = 0.05
+SLOW_LATENCY = 0.3
+
+
+# --- SERVER (SUBPROCESS) ---
+async def _run_server(bundle_path, max_batch, max_wait_ms):
+    frames = {bank: load_raw_csv(bank) for bank in BANKS}
+    cache = MarketDataCache(FakeMarketFetcher(frames, latency=FETCH_LATENCY))
+    slow = FakeMarketFetcher({"SLOW": frames["BBCA"]}, latency=SLOW_LATENCY)
+
+    def window(ticker):
+        if ticker == "SLOW":
+            return slow(ticker, "1d", "60d")
+        return cache.get(ticker, "1d", "60d")
+
+    service = PredictionService(Predictor(window, bundle=ModelBundle(bundle_path)), max_batch, max_wait_ms,
+                                universe=list(BANKS) + ["SLOW"])
+    server = await service.serve("127.0.0.1", 0)
+    print(f"READY {server.sockets[0].getsockname()[1]}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def start_server(bundle_path, max_batch, max_wait_ms):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_service", "--serve", bundle_path,
+         "--max-batch", str(max_batch), "--max-wait-ms", str(max_wait_ms)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith("READY"):
+        proc.kill()
+        raise RuntimeError("server gagal start")
+    return proc, int(line.split()[1])
+
+
+# --- GENERATOR BEBAN ---
+async def _request(reader, writer, tickers):
+    body = json.dumps({"tickers": tickers}).encode()
+    writer.write(b"POST /predict HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+                 + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length"):
+            length = int(line.split(b":")[1])
+    return json.loads(await reader.readexactly(length))
+
+
+async def _client(port, deadline, latencies, pick):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            payload = await _request(reader, writer, pick())
+            assert all("error" not in r for r in payload["results"]), payload
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def _load(port, with_slow):
+    rng = random.Random(0)
+    # Pemanasan: isi cache & muat semua model sebelum pengukuran
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await _request(reader, writer, BANKS)
+    health_before = await _health(reader, writer)
+    deadline = time.perf_counter() + DURATION
+    fast, slow = [], []
+    clients = [_client(port, deadline, fast, lambda: rng.sample(BANKS, rng.randint(1, 3))) for _ in range(CLIENTS)]
+    if with_slow:
+        clients += [_client(port, deadline, slow, lambda: ["SLOW"]) for _ in range(SLOW_CLIENTS)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - t0
+    health = await _health(reader, writer)
+    writer.close()
+    batches = health["batches"] - health_before["batches"]
+    items = health["items"] - health_before["items"]
+    return fast, slow, elapsed, items / batches if batches else 0.0
+
+
+async def _health(reader, writer):
+    writer.write(b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n")
+    await writer.drain()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length"):
+            length = int(line.split(b":")[1])
+    return json.loads(await reader.readexactly(length))
+
+
+def _pct(values, q):
+    return float(np.percentile(values, q) * 1e3) if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--serve", help=argparse.SUPPRESS)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    if args.serve:
+        asyncio.run(_run_server(args.serve, args.max_batch, args.max_wait_ms))
+        return
+
+    folder = tempfile.mkdtemp(prefix="saham_service_")
+    try:
+        assets = {bank: load_or_fit_assets(bank) for bank in BANKS}
+        entries = {bank: (compile_forest(m, "float32"), s, {}) for bank, (m, s) in assets.items()}
+        entries["SLOW"] = entries["BBCA"]
+        bundle_path = os.path.join(folder, "sector.bundle")
+        write_bundle(bundle_path, entries)
+
+        print(f"{CLIENTS} klien keep-alive, {DURATION:.0f}s per skenario, permintaan 1-3 ticker")
+        print(f"{'skenario':<30}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}{'batch':>7}{'SLOW p50':>10}")
+        for name, max_batch, max_wait, with_slow in (
+            ("tanpa batching", 1, 0.0, False),
+            ("micro-batching 2 ms", 64, 2.0, False),
+            ("micro-batching + fetch 300 ms", 64, 2.0, True),
+        ):
+            proc, port = start_server(bundle_path, max_batch, max_wait)
+            try:
+                fast, slow, elapsed, avg_batch = asyncio.run(_load(port, with_slow))
+            finally:
+                proc.kill()
+                proc.wait()
+            slow_p50 = f"{_pct(slow, 50):.0f}" if slow else "-"
+            print(f"{name:<30}{len(fast) / elapsed:>8.0f}{_pct(fast, 50):>9.1f}{_pct(fast, 99):>9.1f}"
+                  f"{avg_batch:>7.1f}{slow_p50:>10}")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Suite benchmark jalur panas pada pasar sintetis berbagai skala.
+
+Tier skala (ticker x tahun) dari kondisi sekarang (5 x 3 tahun) sampai
+1000 x 20 tahun; data dari benchmarks/_synthetic.py (deterministik).
+Tahap yang diukur per tier:
+* csv_load      : read_raw_csv + clean_ohlcv dari CSV format Data/Raw
+* store_append  : seeding PriceStore kolumnar, seluruh universe
+* store_read    : baca seluruh histori dari store (memmap), seluruh universe
+* features      : compute_features per ticker (jalur training)
+* features_panel: compute_feature_array (T, n) per blok ticker, seluruh universe
+* scaling       : MinMaxScaler fit + transform seperti prepare_dataset
+* train         : RandomForestRegressor (best_params BBCA) pada 80% baris
+* predict_one   : predict_batch satu ticker (forest terkompilasi), p50
+* predict_batch : predict_batch seluruh universe dari 60 bar terakhir
+* chart         : saham.charts "raw" + "indicators" cold build + ukuran JSON
+Tahap per ticker yang mahal memakai sampel ticker (SAMPLE / TRAIN_SAMPLE);
+nilai dilaporkan per ticker agar antar tier bisa dibandingkan. Setiap tier
+diulang --repeat kali dan yang dicatat nilai minimum per tahap.
+
+Hasil ditambahkan ke benchmarks/history.jsonl (satu baris JSON per tier per
+run, dengan commit git & info mesin). Setiap tahap dibandingkan dengan
+median BASELINE_RUNS run terakhir tier yang sama di mesin yang sama;
+kenaikan > --threshold persen ditandai REGRESI.
+
+Jalankan: python -m benchmarks.bench_suite [--tiers base sector | all]
+          [--bars-per-day 1] [--repeat 3] [--no-history]
+          [--threshold 50] [--fail-on-regression]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import MinMaxScaler
+
+from benchmarks._synthetic import synthetic_ohlcv, synthetic_tickers, write_raw_csv
+from saham.compiled_forest import compile_forest
+from saham.data import load_raw_csv
+from saham.indicators import FEATURE_COLUMNS, SCALER_COLUMNS, compute_feature_array, compute_features
+from saham.inference import predict_batch
+from saham.price_store import PriceStore
+from saham.training import RANDOM_STATE, SUMMARY_FILE, TRAIN_RATIO
+
+HISTORY_FILE = "benchmarks/history.jsonl"
+TIERS = {
+    "base": (5, 3),
+    "sector": (45, 5),
+    "wide": (200, 10),
+    "market": (1000, 20),
+}
+DEFAULT_TIERS = ["base", "sector"]
+SAMPLE = 20
+TRAIN_SAMPLE = 2
+CHART_SAMPLE = 2
+PANEL_BLOCK = 100
+PREDICT_REPEATS = 20
+# Di VM 1 CPU bersama, tahap milidetik (I/O store, scaling) bergeser 20-40%
+# antar run tanpa perubahan kode; ambang ketat pakai --threshold
+REGRESSION_PCT = 50.0
+# Pembanding = median tahap dari sejumlah run terakhir
+BASELINE_RUNS = 5
+# Satuan per tahap; semua "lebih kecil lebih baik" kecuali kb
+UNITS = {
+    "csv_load": "ms/ticker",
+    "store_append": "ms/ticker",
+    "store_read": "ms/ticker",
+    "features": "ms/ticker",
+    "features_panel": "ms/ticker",
+    "scaling": "ms/ticker",
+    "train": "s/ticker",
+    "predict_one": "ms",
+    "predict_batch": "ms",
+    "chart": "ms/chart",
+    "chart_kb": "kb/chart",
+}
+
+
+def _params():
+    with open(SUMMARY_FILE) as f:
+        params = json.load(f).get("BBCA", {}).get("tuning_results", {}).get("best_params")
+    return params or {"n_estimators": 100}
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+# --- TAHAP ---
+def run_tier(n_tickers, years, bars_per_day, root):
+    tickers = synthetic_tickers(n_tickers)
+    sample = tickers[:SAMPLE]
+    raw_dir = os.path.join(root, "Data", "Raw")
+    results = {}
+
+    frames = {t: synthetic_ohlcv(t, years, bars_per_day) for t in sample}
+    for t in sample:
+        write_raw_csv(t, frames[t], raw_dir)
+    _, sec = _timed(lambda: [load_raw_csv(t, raw_dir) for t in sample])
+    results["csv_load"] = sec * 1e3 / len(sample)
+
+    # Universe penuh dibangkitkan per ticker agar memori tetap kecil
+    store = PriceStore(os.path.join(root, "Store"))
+    total = 0.0
+    for t in tickers:
+        df = frames.get(t)
+        df = synthetic_ohlcv(t, years, bars_per_day) if df is None else df
+        total += _timed(store.append, t, df)[1]
+    results["store_append"] = total * 1e3 / n_tickers
+    _, sec = _timed(lambda: [store.read(t) for t in tickers])
+    results["store_read"] = sec * 1e3 / n_tickers
+
+    features, sec = _timed(lambda: {t: compute_features(frames[t]).dropna() for t in sample})
+    results["features"] = sec * 1e3 / len(sample)
+    total = 0.0
+    for lo in range(0, n_tickers, PANEL_BLOCK):
+        block = [store.read(t) for t in tickers[lo:lo + PANEL_BLOCK]]
+        cols = [np.column_stack([df[c].to_numpy() for df in block]) for c in ("Close", "High", "Low", "Open", "Volume")]
+        total += _timed(compute_feature_array, *cols)[1]
+    results["features_panel"] = total * 1e3 / n_tickers
+
+    def scale(data):
+        scaler = MinMaxScaler().fit(data[SCALER_COLUMNS])
+        return scaler, scaler.transform(data[SCALER_COLUMNS])
+    scaled, sec = _timed(lambda: {t: scale(features[t]) for t in sample})
+    results["scaling"] = sec * 1e3 / len(sample)
+
+    params, assets, total = _params(), [], 0.0
+    for t in sample[:TRAIN_SAMPLE]:
+        scaler, values = scaled[t]
+        n_train = int(len(values) * TRAIN_RATIO)
+        X, y = values[:n_train, 1:], values[:n_train, 0]
+        model = RandomForestRegressor(random_state=RANDOM_STATE, n_jobs=1, **params)
+        total += _timed(model.fit, X, y)[1]
+        model.feature_names_in_ = np.array(FEATURE_COLUMNS, dtype=object)
+        assets.append((compile_forest(model), scaler))
+    results["train"] = total / TRAIN_SAMPLE
+
+    windows = {t: store.tail(t, 60) for t in tickers}
+    one = {tickers[0]: assets[0]}
+    times = [_timed(predict_batch, one, {tickers[0]: windows[tickers[0]]})[1] for _ in range(PREDICT_REPEATS)]
+    results["predict_one"] = statistics.median(times) * 1e3
+    universe = {t: assets[i % len(assets)] for i, t in enumerate(tickers)}
+    _, sec = _timed(predict_batch, universe, windows)
+    results["predict_batch"] = sec * 1e3
+
+    results["chart"], results["chart_kb"] = _chart_cost(root, sample[:CHART_SAMPLE])
+    return results
+
+
+def _chart_cost(root, tickers):
+    # saham.charts memakai path relatif (Data/Raw), jadi dijalankan dari root sementara
+    from saham import charts
+
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        sizes, total = [], 0.0
+        for t in tickers:
+            for chart in ("raw", "indicators"):
+                fig, sec = _timed(charts.figure, chart, t)
+                total += sec
+                sizes.append(len(fig.to_json()) / 1024)
+    finally:
+        os.chdir(cwd)
+    return total * 1e3 / len(sizes), statistics.mean(sizes)
+
+
+# --- RIWAYAT ---
+def git_commit():
+    try:
+        head = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True)
+        return head.stdout.strip(), bool(dirty.stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def host_info():
+    return {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()}
+
+
+def load_history(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline(history, record, window=BASELINE_RUNS):
+    # Median per tahap dari run terakhir dengan tier, ukuran data & mesin sama
+    keys = ("tier", "tickers", "years", "bars_per_day", "host")
+    runs = [old["results"] for old in history if all(old.get(k) == record[k] for k in keys)][-window:]
+    if not runs:
+        return {}
+    return {stage: statistics.median(r[stage] for r in runs if stage in r)
+            for stage in record["results"] if any(stage in r for r in runs)}
+
+
+def compare(record, base):
+    # Return {tahap: persen perubahan}; positif = lebih lambat/besar
+    return {stage: (value / base[stage] - 1) * 100
+            for stage, value in record["results"].items() if base.get(stage)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark jalur panas pada pasar sintetis.")
+    parser.add_argument("--tiers", nargs="+", default=DEFAULT_TIERS, help=f"{list(TIERS)} atau all")
+    parser.add_argument("--bars-per-day", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--no-history", action="store_true", help="Jangan tulis hasil ke file riwayat")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_PCT, help="Persen kenaikan yang dianggap regresi")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+    tiers = list(TIERS) if args.tiers == ["all"] else args.tiers
+
+    commit, dirty = git_commit()
+    history = load_history(args.history)
+    regressions = []
+    for name in tiers:
+        n_tickers, years = TIERS[name]
+        runs, t0 = [], time.perf_counter()
+        for _ in range(args.repeat):
+            root = tempfile.mkdtemp(prefix="saham_suite_")
+            try:
+                runs.append(run_tier(n_tickers, years, args.bars_per_day, root))
+            finally:
+                shutil.rmtree(root, ignore_errors=True)
+        wall = time.perf_counter() - t0
+        # Minimum antar ulangan: gangguan dari proses lain hanya menambah waktu
+        results = {stage: min(r[stage] for r in runs) for stage in runs[0]}
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "dirty": dirty,
+            "host": host_info(),
+            "tier": name,
+            "tickers": n_tickers,
+            "years": years,
+            "bars_per_day": args.bars_per_day,
+            "repeat": args.repeat,
+            "wall_seconds": round(wall, 2),
+            "results": {stage: round(value, 4) for stage, value in results.items()},
+        }
+        delta = compare(record, baseline(history, record))
+
+        bars = n_tickers * years * 240 * args.bars_per_day
+        print(f"\n[{name}] {n_tickers} ticker x {years} tahun x {args.bars_per_day} bar/hari "
+              f"(~{bars:,} bar), min {args.repeat} run, {wall:.1f}s")
+        for stage, value in results.items():
+            change = f"{delta[stage]:+6.1f}%" if stage in delta else ""
+            flag = ""
+            if stage in delta and delta[stage] > args.threshold:
+                flag = "  REGRESI"
+                regressions.append(f"{name}/{stage} {delta[stage]:+.1f}%")
+            print(f"  {stage:<15}{value:>12.3f} {UNITS[stage]:<10}{change}{flag}")
+
+        if not args.no_history:
+            os.makedirs(os.path.dirname(args.history) or ".", exist_ok=True)
+            with open(args.history, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            history.append(record)
+
+    if not args.no_history:
+        print(f"\nRiwayat: {args.history} (commit {commit}{' +dirty' if dirty else ''})")
+    if regressions:
+        print("REGRESI > {:.0f}%: {}".format(args.threshold, ", ".join(regressions)))
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
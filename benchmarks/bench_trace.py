@@ -0,0 +1,97 @@
+"""Overhead span saham.trace dan contoh ekspor JSON / Prometheus.
+
+* Biaya per panggilan span() saat nonaktif vs aktif (ns).
+* predict_batch 5 bank (forest terkompilasi): p50 dengan trace nonaktif vs
+  aktif; selisih nonaktif harus dalam batas noise.
+* Alur menu 4 offline (cache pasar dengan fetcher tiruan, fitur, inferensi,
+  grafik) dengan trace aktif, lalu cuplikan ekspor Prometheus.
+
+Jalankan: python -m benchmarks.bench_trace
+"""
+import json
+import statistics
+import time
+
+from benchmarks._assets import load_or_fit_assets
+from saham import trace
+from saham.compiled_forest import compile_forest
+from saham.data import BANKS, load_raw_csv
+from saham.indicators import compute_features
+from saham.inference import predict_batch
+from saham.market_cache import FakeMarketFetcher, MarketDataCache
+
+CALLS = 200_000
+REPEATS = 300
+
+
+def span_cost(calls=CALLS):
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        with trace.span("x", bank="BBCA"):
+            pass
+    return (time.perf_counter() - t0) / calls * 1e9
+
+
+def predict_p50(assets, windows, repeats=REPEATS):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        predict_batch(assets, windows)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1e3
+
+
+def main():
+    trace.enable(False)
+    off = span_cost()
+    trace.enable(True)
+    on = span_cost()
+    trace.reset()
+    print(f"span() nonaktif: {off:.0f} ns/panggilan | aktif: {on:.0f} ns/panggilan")
+
+    frames = {bank: load_raw_csv(bank) for bank in BANKS}
+    assets = {}
+    for bank in BANKS:
+        model, scaler = load_or_fit_assets(bank)
+        assets[bank] = (compile_forest(model), scaler)
+    windows = {bank: df.tail(60) for bank, df in frames.items()}
+    predict_p50(assets, windows, 20)
+    results = {}
+    for label, flag in (("nonaktif", False), ("aktif", True), ("nonaktif ", False)):
+        trace.enable(flag)
+        results[label] = predict_p50(assets, windows)
+    print("predict_batch 5 bank p50: " + " | ".join(f"trace {k.strip()} {v:.2f} ms" for k, v in results.items()))
+
+    # Alur menu 4 offline dengan trace aktif
+    trace.enable(True)
+    trace.reset()
+    cache = MarketDataCache(FakeMarketFetcher(frames, latency=0.05))
+    trace.register_collector("market_cache", cache.stats)
+    for _ in range(3):
+        for bank in BANKS[:2]:
+            with trace.span("fetch", bank=bank):
+                df = cache.get(bank)
+            with trace.span("features", bank=bank):
+                compute_features(df)
+            with trace.span("inference", bank=bank):
+                predict_batch({bank: assets[bank]}, {bank: df})
+    from saham import charts
+    for _ in range(2):
+        charts.figure("raw", "BBCA")
+
+    snap = trace.snapshot(recent=0)
+    print("\nspan (agregat):")
+    for sp in snap["spans"]:
+        labels = ",".join(f"{k}={v}" for k, v in sp["labels"].items())
+        print(f"  {sp['stage']:<20}{labels:<28}{sp['count']:>3}x  rata-rata {sp['avg_ms']:8.2f} ms  "
+              f"maks {sp['max_ms']:8.2f} ms")
+    print(f"\nJSON: {len(json.dumps(snap))} byte, counters {[(c['name'], c['labels'], c['value']) for c in snap['counters']]}")
+    prom = trace.prometheus()
+    print(f"Prometheus: {len(prom.splitlines())} baris, contoh:")
+    for line in prom.splitlines():
+        if line.startswith(("saham_cache_lookups_total", "saham_market_cache_hit_ratio", 'saham_span_seconds_count{stage="fetch"')):
+            print("  " + line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Successive halving vs grid penuh pada fold time-series yang sama.
+
+Grid diperkecil (24 kandidat x 3 nilai n_estimators) agar grid penuh selesai
+dalam beberapa menit. Kedua metode memakai cache fold memmap yang sama;
+dicatat jumlah fit, pohon yang dibangun, waktu, dan apakah best_params sama.
+Dicek juga bahwa forest warm_start N pohon identik dengan fit baru N pohon.
+
+Jalankan: python -m benchmarks.bench_tuning [--bank BBCA] [--jobs 4]
+"""
+import argparse
+import shutil
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from saham.data import read_raw_csv
+from saham.indicators import FEATURE_COLUMNS, TARGET_COLUMN
+from saham.training import RANDOM_STATE, prepare_dataset
+from saham.tuning import build_fold_cache, grid_search, successive_halving
+
+BENCH_GRID = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [10, 30, None],
+    "min_samples_split": [2, 5],
+    "min_samples_leaf": [1, 2],
+    "max_features": ["sqrt", 1.0],
+}
+
+
+def check_warm_start(X, y, params):
+    warm = RandomForestRegressor(warm_start=True, random_state=RANDOM_STATE, n_estimators=50, **params).fit(X, y)
+    warm.set_params(n_estimators=100).fit(X, y)
+    fresh = RandomForestRegressor(random_state=RANDOM_STATE, n_estimators=100, **params).fit(X, y)
+    return float(np.max(np.abs(warm.predict(X) - fresh.predict(X))))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", default="BBCA")
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    _, _, _, scaled, n_train = prepare_dataset(read_raw_csv(args.bank))
+    train = scaled.iloc[:n_train]
+    X, y = train[FEATURE_COLUMNS].to_numpy(np.float32), train[TARGET_COLUMN].to_numpy()
+    print(f"warm_start 50+50 vs fit 100 pohon, selisih prediksi maks: "
+          f"{check_warm_start(X, y, {'max_features': 'sqrt'}):.1e}")
+
+    cache = build_fold_cache(X, y)
+    try:
+        halving = successive_halving(cache, BENCH_GRID, n_jobs=args.jobs)
+        grid = grid_search(cache, BENCH_GRID, n_jobs=args.jobs)
+    finally:
+        shutil.rmtree(cache["folder"], ignore_errors=True)
+
+    print(f"{args.bank}: {halving['n_candidates']} kandidat x {len(BENCH_GRID['n_estimators'])} n_estimators "
+          f"x {halving['cv_splits']} fold, jobs={args.jobs}")
+    for rung in halving["rungs"]:
+        print(f"  rung {rung['rung']}: {rung['candidates']:>2} kandidat @ {rung['n_estimators']:>3} pohon, "
+              f"RMSE terbaik {rung['best_cv_rmse']:.5f}")
+    print(f"{'metode':<20}{'fit':>6}{'pohon':>9}{'detik':>9}  CV RMSE")
+    for name, r in (("grid", grid), ("successive halving", halving)):
+        print(f"{name:<20}{r['fits']:>6}{r['trees_grown']:>9}{r['seconds']:>9.1f}  {r['cv_rmse']:.5f}")
+    print(f"hemat {halving['fits_saved']} fit, {halving['trees_saved']} pohon; "
+          f"speedup {grid['seconds'] / halving['seconds']:.1f}x; "
+          f"best_params sama: {grid['best_params'] == halving['best_params']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Modul inti prediksi harga saham perbankan (data, indikator, inferensi).
+
+Dipakai oleh app.py dan skrip di folder benchmarks/ agar logika yang sama
+bisa dijalankan tanpa Streamlit.
+"""
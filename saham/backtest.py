@@ -0,0 +1,195 @@
+"""Backtest walk-forward Random Forest atas histori Data/Raw.
+
+* Fitur dihitung sekali per ticker atas seluruh histori (indikator bersifat
+  kausal, jadi baris t hanya memakai bar <= t), lalu disimpan sebagai
+  matriks .npy yang dibuka worker dengan mmap_mode="r". Setiap window hanya
+  slicing baris, tidak membangun ulang indikator.
+* Window: latih pada [train_lo, train_hi), prediksi [train_hi, train_hi +
+  refit_every) dengan model tersebut, lalu geser. Mode rolling menjaga
+  panjang train tetap; mode expanding selalu mulai dari baris pertama.
+  Setiap hari setelah window pertama mendapat tepat satu prediksi
+  out-of-sample.
+* Model dilatih pada fitur & Close dalam Rupiah, tanpa MinMaxScaler: split
+  pohon invarian terhadap skala affine per kolom dan rata-rata forest
+  ekuivalen terhadap skala target, sedangkan scaler yang di-fit pada seluruh
+  data akan membocorkan rentang harga masa depan.
+* Window dari semua ticker dijalankan dalam satu antrean joblib. Jumlah
+  worker dibatasi anggaran memori (estimasi ukuran forest + slice per
+  worker) dan hasil dialirkan ke array output yang sudah dialokasikan.
+
+Jalankan: python -m saham.backtest [--banks BBCA] [--train-size 250]
+          [--refit-every 20] [--expanding] [--jobs 4] [--out DIR]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestRegressor
+
+from saham.data import BANKS, RAW_DIR, load_raw_csv
+from saham.indicators import FEATURE_COLUMNS, TARGET_COLUMN, compute_features
+from saham.training import RANDOM_STATE, SUMMARY_FILE, regression_metrics
+
+BACKTEST_DIR = "Predictions/Backtest"
+TRAIN_SIZE = 250
+REFIT_EVERY = 20
+MEMORY_BUDGET_MB = 1024
+# Ukuran satu node pohon sklearn (struct Node + value float64), byte
+_NODE_BYTES = 72
+
+
+# --- MATRIKS FITUR PER TICKER ---
+def feature_matrix(df, horizon=0):
+    # Return (dates, X, y); y[t] = Close[t + horizon]. Histori kosong -> 0 baris
+    if df.empty:
+        return pd.DatetimeIndex([], name="Date"), np.empty((0, len(FEATURE_COLUMNS)), np.float32), np.empty(0)
+    data = compute_features(df).dropna()
+    close = data[TARGET_COLUMN].to_numpy(np.float64)
+    y = np.full(len(data), np.nan)
+    y[:len(data) - horizon] = close[horizon:]
+    return data.index, data[FEATURE_COLUMNS].to_numpy(np.float32), y
+
+
+def plan_windows(n_rows, train_size=TRAIN_SIZE, refit_every=REFIT_EVERY, expanding=False, horizon=0):
+    # Daftar (train_lo, train_hi, pred_lo, pred_hi). Target baris train harus
+    # sudah diketahui saat train_hi, jadi baris train berakhir di hi - horizon.
+    windows = []
+    for hi in range(train_size, n_rows - horizon, refit_every):
+        lo = 0 if expanding else hi - train_size
+        windows.append((lo, hi - horizon, hi, min(hi + refit_every, n_rows - horizon)))
+    return windows
+
+
+def forest_bytes(n_estimators, train_rows):
+    # Batas atas: pohon penuh punya < 2 x n_samples node
+    return n_estimators * 2 * train_rows * _NODE_BYTES
+
+
+def plan_memory(n_jobs, memory_budget_mb, params, max_train_rows, n_features=len(FEATURE_COLUMNS)):
+    per_worker = forest_bytes(params.get("n_estimators", 100), max_train_rows) + max_train_rows * n_features * 8
+    if per_worker <= 0:
+        # Tidak ada window (histori lebih pendek dari train_size)
+        return 1, 0
+    affordable = max(1, int(memory_budget_mb * 2 ** 20 // per_worker))
+    return max(1, min(n_jobs, affordable)), per_worker
+
+
+# --- WORKER ---
+def _fit_window(folder, t, i, window, params, random_state):
+    X = np.load(os.path.join(folder, f"{t}_X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(folder, f"{t}_y.npy"), mmap_mode="r")
+    train_lo, train_hi, pred_lo, pred_hi = window
+    model = RandomForestRegressor(random_state=random_state, n_jobs=1, **params)
+    model.fit(X[train_lo:train_hi], y[train_lo:train_hi])
+    return t, i, pred_lo, model.predict(X[pred_lo:pred_hi])
+
+
+# --- BACKTEST ---
+def backtest_many(frames, train_size=TRAIN_SIZE, refit_every=REFIT_EVERY, expanding=False, horizon=0,
+                  params=None, n_jobs=1, memory_budget_mb=MEMORY_BUDGET_MB, random_state=RANDOM_STATE):
+    # frames: {ticker: DataFrame OHLCV}. Return ({ticker: DataFrame}, report)
+    t0 = time.perf_counter()
+    params = dict(params or {"n_estimators": 100})
+    folder = tempfile.mkdtemp(prefix="saham_bt_")
+    tickers, meta, tasks = list(frames), {}, []
+    try:
+        for t, ticker in enumerate(tickers):
+            dates, X, y = feature_matrix(frames[ticker], horizon)
+            np.save(os.path.join(folder, f"{t}_X.npy"), X)
+            np.save(os.path.join(folder, f"{t}_y.npy"), y)
+            windows = plan_windows(len(X), train_size, refit_every, expanding, horizon)
+            meta[ticker] = (dates, y, np.full(len(X), np.nan), np.full(len(X), -1, dtype=np.int64), windows)
+            tasks += [(t, i, w) for i, w in enumerate(windows)]
+        feature_seconds = time.perf_counter() - t0
+
+        max_rows = max((w[1] - w[0] for _, _, w in tasks), default=0)
+        workers, per_worker = plan_memory(n_jobs, memory_budget_mb, params, max_rows)
+        results = [] if not tasks else Parallel(n_jobs=workers, return_as="generator_unordered", pre_dispatch="2*n_jobs")(
+            delayed(_fit_window)(folder, t, i, w, params, random_state) for t, i, w in tasks
+        )
+        for t, i, pred_lo, preds in results:
+            _, _, out, window_id, _ = meta[tickers[t]]
+            out[pred_lo:pred_lo + len(preds)] = preds
+            window_id[pred_lo:pred_lo + len(preds)] = i
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    outputs, metrics = {}, {}
+    for ticker in tickers:
+        dates, y, pred, window_id, windows = meta[ticker]
+        mask = window_id >= 0
+        if not mask.any():
+            continue
+        starts = np.array([w[0] for w in windows])[window_id[mask]]
+        ends = np.array([w[1] for w in windows])[window_id[mask]]
+        outputs[ticker] = pd.DataFrame({
+            "Date": dates[mask].strftime("%Y-%m-%d"),
+            "Target_Date": dates[np.flatnonzero(mask) + horizon].strftime("%Y-%m-%d"),
+            "Actual": y[mask],
+            "Predicted": pred[mask],
+            "Residual": y[mask] - pred[mask],
+            "Window": window_id[mask],
+            "Train_Start": dates[starts].strftime("%Y-%m-%d"),
+            "Train_End": dates[ends - 1].strftime("%Y-%m-%d"),
+        })
+        metrics[ticker] = regression_metrics(y[mask], pred[mask])
+        metrics[ticker]["windows"] = len(windows)
+
+    report = {
+        "windows": len(tasks),
+        "workers": workers,
+        "worker_bytes_estimate": per_worker,
+        "feature_seconds": feature_seconds,
+        "seconds": time.perf_counter() - t0,
+        "metrics": metrics,
+    }
+    return outputs, report
+
+
+def load_params(bank, summary_path=SUMMARY_FILE):
+    if not os.path.exists(summary_path):
+        return None
+    with open(summary_path) as f:
+        return json.load(f).get(bank, {}).get("tuning_results", {}).get("best_params")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest walk-forward Random Forest (Rupiah).")
+    parser.add_argument("--banks", nargs="+", default=BANKS)
+    parser.add_argument("--train-size", type=int, default=TRAIN_SIZE)
+    parser.add_argument("--refit-every", type=int, default=REFIT_EVERY)
+    parser.add_argument("--expanding", action="store_true", help="Window train bertambah, bukan bergeser")
+    parser.add_argument("--horizon", type=int, default=0, help="0 = Close hari yang sama (seperti model app), 1 = besok")
+    parser.add_argument("--n-estimators", type=int, default=None, help="Override n_estimators dari tuning_results")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_BUDGET_MB)
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--out", default=BACKTEST_DIR)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    for bank in args.banks:
+        # Hyperparameter per bank berbeda, jadi satu antrean per bank
+        params = load_params(bank) or {"n_estimators": 100}
+        if args.n_estimators:
+            params["n_estimators"] = args.n_estimators
+        outputs, report = backtest_many({bank: load_raw_csv(bank, args.raw_dir)}, args.train_size, args.refit_every,
+                                        args.expanding, args.horizon, params, args.jobs, args.memory_mb)
+        if bank not in outputs:
+            print(f"{bank}: histori terlalu pendek untuk train_size {args.train_size}")
+            continue
+        outputs[bank].to_csv(os.path.join(args.out, f"{bank}_walk_forward.csv"), index=False)
+        m = report["metrics"][bank]
+        print(f"{bank}: {m['windows']} window, {len(outputs[bank])} hari OOS | MAE Rp {m['mae']:,.0f}, "
+              f"RMSE Rp {m['rmse']:,.0f}, MAPE {m['mape']:.2f}%, R² {m['r2']:.4f} | "
+              f"{report['seconds']:.1f}s, {report['workers']} worker")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Bundle model satu file (per ticker atau satu sektor) yang dibuka dengan mmap.
+
+Format (little-endian):
+    8 byte   magic b"SAHAMRF\\0"
+    8 byte   panjang header (uint64)
+    header   JSON utf-8: versi, urutan fitur, dan per ticker: offset/dtype/
+             shape setiap array, parameter forest, metrik, checksum
+    padding  sampai kelipatan 64 byte
+    data     array mentah (forest terkompilasi + parameter scaler), tiap
+             array rata 64 byte
+
+Membuka bundle hanya membaca header; array adalah view np.memmap sehingga
+halaman pohon baru dimuat dari disk saat ticker tersebut pertama dipakai.
+Checksum crc32 per ticker mencakup forest, parameter scaler dan urutan
+fitur, diverifikasi saat ticker pertama diakses.
+
+Header juga mencatat ukuran, mtime dan sha1 file .pkl sumber. Bila
+model/scaler sudah dilatih ulang sejak bundle dibuat, ticker itu ditolak
+(BundleError) alih-alih diam-diam melayani model lama. Seluruh bundle
+ditolak (BundleError) jika versi, urutan fitur, atau kolom scaler tidak
+cocok dengan FEATURE_COLUMNS / SCALER_COLUMNS kode saat ini. Forest hasil
+pruning (saham.pruning) boleh memakai subset FEATURE_COLUMNS.
+
+Buat: python -m saham.bundle [--banks BBCA ...] [--out Models/Bundles/sector.bundle]
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from saham import trace
+from saham.compiled_forest import CompiledForest, compile_forest
+from saham.indicators import FEATURE_COLUMNS, SCALER_COLUMNS
+
+BUNDLE_DIR = "Models/Bundles"
+BUNDLE_PATH = os.path.join(BUNDLE_DIR, "sector.bundle")
+BUNDLE_VERSION = 2
+MAGIC = b"SAHAMRF\x00"
+_ALIGN = 64
+_PREFIX = struct.Struct("<8sQ")
+_FOREST_ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+_SCALER_ARRAYS = ("scale_", "min_", "data_min_", "data_max_")
+_LFS_POINTER = b"version https://git-lfs"
+
+
+class BundleError(Exception):
+    pass
+
+
+class BundleScaler:
+    # Pengganti MinMaxScaler yang cukup untuk scale_rows / inverse_close
+
+    def __init__(self, scale_, min_, data_min_, data_max_, feature_names_in_, feature_range=(0, 1), clip=False):
+        self.scale_ = scale_
+        self.min_ = min_
+        self.data_min_ = data_min_
+        self.data_max_ = data_max_
+        self.feature_names_in_ = feature_names_in_
+        self.n_features_in_ = len(feature_names_in_)
+        self.feature_range = tuple(feature_range)
+        self.clip = clip
+
+
+def _align(n):
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def _scaler_columns(scaler):
+    names = getattr(scaler, "feature_names_in_", None)
+    return [str(c) for c in names] if names is not None else list(SCALER_COLUMNS)
+
+
+def _forest_columns(forest):
+    names = forest.feature_names_in_
+    return [str(c) for c in names] if names is not None else list(FEATURE_COLUMNS)
+
+
+def _valid_columns(columns):
+    # Scaler selalu SCALER_COLUMNS; forest FEATURE_COLUMNS penuh atau subset hasil pruning
+    return columns["scaler"] == SCALER_COLUMNS and set(columns["forest"]) <= set(FEATURE_COLUMNS)
+
+
+def _checksum(arrays, columns):
+    crc = zlib.crc32(json.dumps(columns).encode())
+    for name in sorted(arrays):
+        crc = zlib.crc32(np.ascontiguousarray(arrays[name]).view(np.uint8).reshape(-1), crc)
+    return crc
+
+
+# --- FILE SUMBER ---
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_pointer(path):
+    # File .pkl yang belum di-`git lfs pull` bukan sumber yang bisa dibandingkan
+    with open(path, "rb") as f:
+        return f.read(len(_LFS_POINTER)) == _LFS_POINTER
+
+
+def source_signature(path):
+    st = os.stat(path)
+    return {"path": path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": _sha1(path)}
+
+
+def stale_sources(sources):
+    # Path sumber yang isinya berubah sejak bundle dibuat. Ukuran+mtime sama
+    # dianggap tidak berubah (cek murah); sha1 hanya dihitung bila berbeda.
+    # Sumber yang hilang / masih pointer LFS dilewati: bundle jadi satu-satunya salinan.
+    stale = []
+    for src in sources:
+        path = src["path"]
+        if not os.path.exists(path) or _is_pointer(path):
+            continue
+        st = os.stat(path)
+        if st.st_size == src["size"] and st.st_mtime_ns == src["mtime_ns"]:
+            continue
+        if st.st_size != src["size"] or _sha1(path) != src["sha1"]:
+            stale.append(path)
+    return stale
+
+
+# --- TULIS ---
+def write_bundle(path, entries, threshold_mode="float32", sources=None):
+    # entries: {ticker: (model, scaler, metrics)}; model = RandomForestRegressor
+    # atau CompiledForest. sources: {ticker: [path .pkl model, scaler]} untuk
+    # deteksi bundle usang. Return ukuran file (byte).
+    sources = sources or {}
+    header = {
+        "version": BUNDLE_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "feature_columns": FEATURE_COLUMNS,
+        "scaler_columns": SCALER_COLUMNS,
+        "tickers": {},
+    }
+    blobs, offset = [], 0
+    for ticker, (model, scaler, metrics) in entries.items():
+        forest = model if isinstance(model, CompiledForest) else compile_forest(model, threshold_mode)
+        columns = {"forest": _forest_columns(forest), "scaler": _scaler_columns(scaler)}
+        if not _valid_columns(columns):
+            raise BundleError(f"{ticker}: urutan fitur model/scaler tidak sesuai FEATURE_COLUMNS/SCALER_COLUMNS.")
+        arrays = {name: getattr(forest, name) for name in _FOREST_ARRAYS}
+        arrays.update({name: np.asarray(getattr(scaler, name), dtype=np.float64) for name in _SCALER_ARRAYS})
+        for f, edges in enumerate(forest.bins or []):
+            arrays[f"bins_{f}"] = edges
+
+        layout = {}
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            layout[name] = {"offset": offset, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+            blobs.append((offset, arr))
+            offset = _align(offset + arr.nbytes)
+        header["tickers"][ticker] = {
+            "arrays": layout,
+            "max_depth": forest.max_depth,
+            "n_features": forest.n_features_in_,
+            "threshold_mode": forest.threshold_mode,
+            "columns": columns,
+            "feature_range": list(getattr(scaler, "feature_range", (0, 1))),
+            "clip": bool(getattr(scaler, "clip", False)),
+            "metrics": metrics or {},
+            "checksum": _checksum(arrays, columns),
+            "sources": [source_signature(p) for p in sources.get(ticker, ())],
+        }
+
+    raw_header = json.dumps(header).encode()
+    data_start = _align(_PREFIX.size + len(raw_header))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(raw_header)))
+        f.write(raw_header)
+        for off, arr in blobs:
+            f.seek(data_start + off)
+            f.write(arr.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+    return data_start + offset
+
+
+# --- BACA ---
+class ModelBundle:
+
+    def __init__(self, path, verify=True):
+        self.path = path
+        self.verify = verify
+        with open(path, "rb") as f:
+            magic, size = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise BundleError(f"{path} bukan bundle model.")
+            self.header = json.loads(f.read(size))
+        if self.header.get("version") != BUNDLE_VERSION:
+            raise BundleError(f"Versi bundle {self.header.get('version')} tidak didukung (butuh {BUNDLE_VERSION}).")
+        if self.header["feature_columns"] != FEATURE_COLUMNS or self.header["scaler_columns"] != SCALER_COLUMNS:
+            raise BundleError("Urutan fitur bundle berbeda dengan mesin indikator saat ini; buat ulang bundle.")
+        self._data_start = _align(_PREFIX.size + size)
+        self._mmap = None
+        self._assets = {}
+
+    @property
+    def tickers(self):
+        return list(self.header["tickers"])
+
+    def __contains__(self, ticker):
+        return ticker in self.header["tickers"]
+
+    def metrics(self, ticker):
+        return self.header["tickers"][ticker]["metrics"]
+
+    def _arrays(self, entry):
+        if self._mmap is None:
+            self._mmap = np.memmap(self.path, dtype=np.uint8, mode="r")
+        arrays = {}
+        for name, spec in entry["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            start = self._data_start + spec["offset"]
+            arrays[name] = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=start).reshape(spec["shape"])
+        return arrays
+
+    def assets(self, ticker):
+        # (CompiledForest, BundleScaler) berbasis view mmap, dibuat sekali
+        if ticker in self._assets:
+            return self._assets[ticker]
+        if ticker not in self:
+            raise KeyError(ticker)
+        with trace.span("model.load", bank=ticker, source="bundle"):
+            return self._load(ticker)
+
+    def _load(self, ticker):
+        entry = self.header["tickers"][ticker]
+        columns = entry["columns"]
+        if not _valid_columns(columns):
+            raise BundleError(f"{ticker}: scaler/model di bundle memakai urutan fitur lama.")
+        arrays = self._arrays(entry)
+        if self.verify and _checksum(arrays, columns) != entry["checksum"]:
+            raise BundleError(f"{ticker}: checksum bundle tidak cocok (file rusak atau scaler usang).")
+        stale = stale_sources(entry["sources"])
+        if stale:
+            raise BundleError(f"{ticker}: {', '.join(stale)} berubah sejak bundle dibuat; "
+                              "buat ulang dengan python -m saham.bundle.")
+
+        bins = [arrays[f"bins_{f}"] for f in range(entry["n_features"])] if entry["threshold_mode"] == "quantized" else None
+        forest = CompiledForest(
+            *(arrays[name] for name in _FOREST_ARRAYS), entry["max_depth"], entry["n_features"],
+            np.array(columns["forest"], dtype=object), entry["threshold_mode"], bins,
+        )
+        scaler = BundleScaler(
+            *(arrays[name] for name in _SCALER_ARRAYS), np.array(columns["scaler"], dtype=object),
+            entry["feature_range"], entry["clip"],
+        )
+        self._assets[ticker] = (forest, scaler)
+        return forest, scaler
+
+
+def open_bundle(path=BUNDLE_PATH, verify=True):
+    # None bila bundle belum dibuat; BundleError bila tidak valid
+    if not os.path.exists(path):
+        return None
+    return ModelBundle(path, verify)
+
+
+# --- EKSPOR DARI .pkl ---
+def export_bundle(banks, out=BUNDLE_PATH, metrics_path="Models/metrics.json", threshold_mode="float32"):
+    from saham.inference import MODEL_DIR, SCALER_DIR, load_assets
+
+    metrics = {}
+    if os.path.exists(metrics_path):
+        with open(metrics_path) as f:
+            metrics = json.load(f)
+    entries, sources = {}, {}
+    for bank in banks:
+        model, scaler = load_assets(bank)
+        if model is None:
+            raise BundleError(f"Model/scaler {bank} tidak dapat dimuat (file .pkl belum di-`git lfs pull`?).")
+        entries[bank] = (model, scaler, metrics.get(bank, {}))
+        sources[bank] = [os.path.join(MODEL_DIR, f"{bank}_rf_model.pkl"), os.path.join(SCALER_DIR, f"{bank}_scaler.pkl")]
+    return write_bundle(out, entries, threshold_mode, sources)
+
+
+def main(argv=None):
+    from saham.compiled_forest import THRESHOLD_MODES
+    from saham.data import BANKS
+
+    parser = argparse.ArgumentParser(description="Gabungkan model & scaler .pkl menjadi satu bundle mmap.")
+    parser.add_argument("--banks", nargs="+", default=BANKS)
+    parser.add_argument("--out", default=BUNDLE_PATH)
+    parser.add_argument("--threshold-mode", choices=THRESHOLD_MODES, default="float32")
+    args = parser.parse_args(argv)
+    size = export_bundle(args.banks, args.out, threshold_mode=args.threshold_mode)
+    print(f"{args.out}: {len(args.banks)} ticker, {size / 2 ** 20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""Grafik interaktif on-demand untuk menu 1-3 (pengganti PNG di Visual/).
+
+Setiap grafik dibangun dari Data/Raw, Predictions/*.csv,
+Feature_Importance/*.csv dan Models/*.json saat diminta. Deret panjang
+di-downsample dengan LTTB (Largest-Triangle-Three-Buckets) ke anggaran
+titik kira-kira selebar piksel grafik, sehingga bentuk puncak/lembah tetap
+terjaga tapi payload JSON ke browser kecil. Figure di-memo per
+(grafik, bank, anggaran titik, versi data); versi data = mtime & ukuran
+file sumber, jadi retrain otomatis membuat grafik baru tanpa render ulang
+gambar.
+"""
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from saham import trace
+from saham.data import BANKS, RAW_DIR, clean_ohlcv, read_raw_csv
+from saham.indicators import FEATURE_CATEGORIES, FEATURE_COLUMNS, SCALER_COLUMNS, compute_features
+
+PREDICTIONS_DIR = "Predictions"
+IMPORTANCE_DIR = "Feature_Importance"
+METRICS_FILE = "Models/metrics.json"
+SUMMARY_FILE = "Models/data_summary.json"
+# Anggaran titik per trace ~ lebar kolom grafik (piksel)
+MAX_POINTS = 600
+TEMPLATE = "plotly_dark"
+MEMO_SIZE = 256
+
+
+# --- DOWNSAMPLING LTTB ---
+def lttb(x, y, n_out):
+    # Indeks titik terpilih (termasuk titik pertama & terakhir)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Rata-rata bucket berikutnya (bucket terakhir = titik terakhir)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(index, values, max_points=MAX_POINTS):
+    # (x, y) siap plot; index boleh DatetimeIndex
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= max_points:
+        return index, values
+    x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.asarray(index)
+    finite = np.isfinite(values)
+    keep = lttb(x[finite], values[finite], max_points)
+    pos = np.flatnonzero(finite)[keep]
+    return index[pos], values[pos]
+
+
+def _line(index, values, max_points, **kwargs):
+    x, y = downsample(index, values, max_points)
+    return go.Scatter(x=x, y=y, mode="lines", **kwargs)
+
+
+# --- SUMBER DATA ---
+def _raw_path(bank):
+    return os.path.join(RAW_DIR, f"{bank}_raw.csv")
+
+
+def _pred_path(bank):
+    return os.path.join(PREDICTIONS_DIR, f"{bank}_predictions.csv")
+
+
+def _fi_path(bank):
+    return os.path.join(IMPORTANCE_DIR, f"{bank}_feature_importance.csv")
+
+
+def data_version(paths):
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamp.append((path, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            stamp.append((path, None, None))
+    return tuple(stamp)
+
+
+@lru_cache(maxsize=32)
+def _features_at(bank, version):
+    # Indikator dipakai beberapa grafik sekaligus; dihitung sekali per versi CSV
+    return compute_features(clean_ohlcv(read_raw_csv(bank))).dropna()
+
+
+def _features(bank):
+    return _features_at(bank, data_version([_raw_path(bank)]))
+
+
+def _scaler_path(bank):
+    return os.path.join("Models/Scalers", f"{bank}_scaler.pkl")
+
+
+def _close_range(bank):
+    # data_min_/data_max_ Close dari scaler yang menulis Predictions CSV. Setelah
+    # retrain dari PriceStore rentang ini (dan tanggalnya) bisa melewati Data/Raw,
+    # jadi Data/Raw hanya dipakai untuk ringkasan lama tanpa scaler terbaca.
+    reference = _json(SUMMARY_FILE).get(bank, {}).get("drift_reference")
+    if reference is not None:
+        i = reference["columns"].index("Close")
+        return reference["data_min"][i], reference["data_max"][i]
+    try:
+        import joblib
+
+        scaler = joblib.load(_scaler_path(bank))
+        i = list(getattr(scaler, "feature_names_in_", SCALER_COLUMNS)).index("Close")
+        return float(scaler.data_min_[i]), float(scaler.data_max_[i])
+    except Exception:
+        close = _features(bank)["Close"]
+        return close.min(), close.max()
+
+
+def _predictions(bank):
+    # CSV dalam skala 0-1 -> Rupiah memakai rentang Close saat scaler di-fit
+    df = pd.read_csv(_pred_path(bank), parse_dates=["Date"]).set_index("Date")
+    lo, hi = _close_range(bank)
+    for col in ("Actual", "Predicted", "Residual"):
+        df[col] = df[col] * (hi - lo) + (lo if col != "Residual" else 0.0)
+    return df
+
+
+def _importance(bank):
+    return pd.read_csv(_fi_path(bank))
+
+
+def _json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _layout(fig, title, height=450, **kwargs):
+    fig.update_layout(title=title, template=TEMPLATE, height=height, margin=dict(l=40, r=20, t=60, b=40), **kwargs)
+    return fig
+
+
+# --- MENU 1 & 2: DATA ---
+def chart_raw(bank, max_points):
+    # 01: close, volume, distribusi harga & rata-rata
+    df = clean_ohlcv(read_raw_csv(bank))
+    fig = make_subplots(rows=2, cols=2, column_widths=[0.7, 0.3], row_heights=[0.6, 0.4],
+                        specs=[[{}, {"rowspan": 2}], [{}, None]],
+                        subplot_titles=("Harga Penutupan", "Distribusi Harga", "Volume Perdagangan"))
+    fig.add_trace(_line(df.index, df["Close"], max_points, name="Close"), row=1, col=1)
+    fig.add_hline(y=df["Close"].mean(), line_dash="dash", line_color="orange", row=1, col=1,
+                  annotation_text=f"Rata-rata Rp {df['Close'].mean():,.0f}")
+    x, y = downsample(df.index, df["Volume"], max_points)
+    fig.add_trace(go.Bar(x=x, y=y, name="Volume", marker_color="teal"), row=2, col=1)
+    counts, edges = np.histogram(df["Close"], bins=40)
+    fig.add_trace(go.Bar(x=counts, y=(edges[:-1] + edges[1:]) / 2, orientation="h", name="Frekuensi"), row=1, col=2)
+    return _layout(fig, f"Analisis Data Mentah {bank}", 550, showlegend=False)
+
+
+def chart_cleaning(bank, max_points):
+    # 02: data mentah pada kalender hari bursa (celah = libur) vs hasil ffill/bfill
+    raw = read_raw_csv(bank)["Close"]
+    calendar = pd.bdate_range(raw.index.min(), raw.index.max())
+    gapped = raw.reindex(calendar)
+    cleaned = gapped.ffill().bfill()
+    fig = make_subplots(rows=1, cols=2, shared_yaxes=True,
+                        subplot_titles=(f"Mentah ({int(gapped.isna().sum())} hari kosong)", "Setelah ffill & bfill"))
+    x, y = downsample(gapped.index, gapped.to_numpy(), max_points)
+    # Titik kosong dikembalikan sebagai celah agar garis terputus
+    gaps = gapped.index[gapped.isna()]
+    x = x.append(gaps).sort_values()
+    fig.add_trace(go.Scatter(x=x, y=gapped.reindex(x), mode="lines", name="Mentah", connectgaps=False), row=1, col=1)
+    fig.add_trace(_line(cleaned.index, cleaned, max_points, name="Bersih"), row=1, col=2)
+    return _layout(fig, f"Komparasi Data Cleaning {bank}", showlegend=False)
+
+
+def chart_indicators(bank, max_points):
+    # 03: harga + MA + Bollinger, RSI, MACD, volume
+    f = _features(bank)
+    fig = make_subplots(rows=4, cols=1, shared_xaxes=True, vertical_spacing=0.04,
+                        row_heights=[0.4, 0.2, 0.2, 0.2], subplot_titles=("Harga & Moving Average", "RSI", "MACD", "Volume"))
+    for col, color in (("Close", "white"), ("SMA_20", "yellow"), ("EMA_20", "cyan"),
+                       ("BB_Upper", "gray"), ("BB_Lower", "gray")):
+        fig.add_trace(_line(f.index, f[col], max_points, name=col, line=dict(color=color, width=1)), row=1, col=1)
+    fig.add_trace(_line(f.index, f["RSI"], max_points, name="RSI", line=dict(color="purple")), row=2, col=1)
+    fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
+    fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
+    fig.add_trace(_line(f.index, f["MACD"], max_points, name="MACD", line=dict(color="blue")), row=3, col=1)
+    fig.add_trace(_line(f.index, f["MACD_Signal"], max_points, name="Signal", line=dict(color="orange")), row=3, col=1)
+    x, y = downsample(f.index, f["Volume"], max_points)
+    fig.add_trace(go.Bar(x=x, y=y, name="Volume", marker_color="teal"), row=4, col=1)
+    return _layout(fig, f"Indikator Teknikal {bank}", 900)
+
+
+def chart_distribution(bank, max_points):
+    # 05: distribusi setelah MinMax (di-fit pada seluruh baris seperti training)
+    f = _features(bank)[SCALER_COLUMNS]
+    scaled = (f - f.min()) / (f.max() - f.min())
+    cols = ["Close", "Volume", "RSI", "MACD"]
+    fig = make_subplots(rows=2, cols=4, subplot_titles=cols + [f"Box {c}" for c in cols])
+    for i, col in enumerate(cols, start=1):
+        counts, edges = np.histogram(scaled[col], bins=30, range=(0, 1))
+        fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, name=col), row=1, col=i)
+        q = scaled[col].quantile([0, 0.25, 0.5, 0.75, 1]).to_numpy()
+        fig.add_trace(go.Box(q1=[q[1]], median=[q[2]], q3=[q[3]], lowerfence=[q[0]], upperfence=[q[4]],
+                             name=col), row=2, col=i)
+    return _layout(fig, f"Distribusi Setelah Normalisasi {bank}", 550, showlegend=False)
+
+
+def chart_split(bank, max_points):
+    # 06: pembagian train (80%) / test (20%) secara kronologis
+    pred = _predictions(bank)
+    fig = go.Figure()
+    for name, color in (("Train", "#1f77b4"), ("Test", "#ff7f0e")):
+        part = pred[pred["Set"] == name]
+        fig.add_trace(_line(part.index, part["Actual"], max_points, name=f"{name} ({len(part)} baris)",
+                            line=dict(color=color)))
+    split = pred.index[pred["Set"] == "Test"][0]
+    fig.add_vline(x=split, line_dash="dash", line_color="white")
+    return _layout(fig, f"Pembagian Data Latih & Uji {bank} (split {split:%Y-%m-%d})", yaxis_title="Rupiah")
+
+
+# --- MENU 3: EVALUASI ---
+def chart_prediction(bank, max_points):
+    # 09: aktual vs prediksi pada data test
+    test = _predictions(bank)
+    test = test[test["Set"] == "Test"]
+    fig = go.Figure([
+        _line(test.index, test["Actual"], max_points, name="Aktual", line=dict(color="#1f77b4")),
+        _line(test.index, test["Predicted"], max_points, name="Prediksi", line=dict(color="red", dash="dot")),
+    ])
+    return _layout(fig, f"Prediksi vs Aktual (Data Test) {bank}", yaxis_title="Rupiah")
+
+
+def chart_timeline(bank, max_points):
+    # 14: seluruh periode train + test
+    pred = _predictions(bank)
+    fig = go.Figure([
+        _line(pred.index, pred["Actual"], max_points, name="Aktual", line=dict(color="#1f77b4")),
+        _line(pred.index, pred["Predicted"], max_points, name="Prediksi", line=dict(color="red", width=1)),
+    ])
+    fig.add_vline(x=pred.index[pred["Set"] == "Test"][0], line_dash="dash", line_color="white")
+    return _layout(fig, f"Timeline Lengkap {bank}", yaxis_title="Rupiah")
+
+
+def chart_scatter(bank, max_points):
+    # 11: aktual vs prediksi data test semua bank (skala 0-1 agar sebanding)
+    fig = go.Figure()
+    for b in BANKS:
+        df = pd.read_csv(_pred_path(b))
+        test = df[df["Set"] == "Test"]
+        fig.add_trace(go.Scattergl(x=test["Actual"], y=test["Predicted"], mode="markers", name=b,
+                                   marker=dict(size=5, opacity=0.7 if b == bank else 0.25)))
+    fig.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode="lines", name="Ideal", line=dict(dash="dash", color="white")))
+    return _layout(fig, "Aktual vs Prediksi (Data Test, skala 0-1)", xaxis_title="Aktual", yaxis_title="Prediksi")
+
+
+def chart_residual(bank, max_points):
+    # 12: residual sepanjang waktu + distribusinya
+    pred = _predictions(bank)
+    test = pred[pred["Set"] == "Test"]
+    fig = make_subplots(rows=1, cols=2, column_widths=[0.65, 0.35],
+                        subplot_titles=("Residual Data Test", "Distribusi Residual"))
+    fig.add_trace(_line(test.index, test["Residual"], max_points, name="Residual"), row=1, col=1)
+    fig.add_hline(y=0, line_dash="dash", line_color="white", row=1, col=1)
+    counts, edges = np.histogram(test["Residual"], bins=30)
+    fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, name="Frekuensi"), row=1, col=2)
+    return _layout(fig, f"Analisis Residual {bank} (Rupiah)", showlegend=False)
+
+
+def chart_error_metrics(bank, max_points):
+    # 13: MAE/RMSE/MAPE/R² data test antar bank
+    metrics = _json(METRICS_FILE)
+    banks = [b for b in BANKS if b in metrics]
+    fig = make_subplots(rows=1, cols=4, subplot_titles=("MAE", "RMSE", "MAPE (%)", "R²"))
+    for i, key in enumerate(("mae", "rmse", "mape", "r2"), start=1):
+        values = [metrics[b][key] if np.isfinite(metrics[b][key]) else None for b in banks]
+        colors = ["orange" if b == bank else "#1f77b4" for b in banks]
+        fig.add_trace(go.Bar(x=banks, y=values, marker_color=colors, name=key), row=1, col=i)
+    return _layout(fig, "Perbandingan Error Metrics", 400, showlegend=False)
+
+
+def chart_evaluation(bank, max_points):
+    # 15: metrik train vs test bank terpilih
+    comp = _json(SUMMARY_FILE).get(bank, {}).get("comprehensive_metrics", {})
+    keys = ["mae", "rmse", "r2", "max_error"]
+    fig = go.Figure([
+        go.Bar(x=keys, y=[comp.get(part, {}).get(k) for k in keys], name=part.capitalize())
+        for part in ("train", "test")
+    ])
+    return _layout(fig, f"Metrik Evaluasi Model {bank} (skala 0-1)", 400, barmode="group")
+
+
+def chart_train_test(bank, max_points):
+    # 17: R² train vs test & gap semua bank
+    summary = _json(SUMMARY_FILE)
+    banks = [b for b in BANKS if "comprehensive_metrics" in summary.get(b, {})]
+    fig = go.Figure([
+        go.Bar(x=banks, y=[summary[b]["comprehensive_metrics"][part]["r2"] for b in banks], name=f"R² {part}")
+        for part in ("train", "test")
+    ])
+    fig.update_yaxes(range=[0.8, 1.0])
+    return _layout(fig, "Performa Train vs Test", 400, barmode="group")
+
+
+def chart_importance(bank, max_points):
+    # 18: importance fitur bank terpilih
+    fi = _importance(bank).iloc[::-1]
+    fig = go.Figure(go.Bar(x=fi["Percentage"], y=fi["Feature"], orientation="h",
+                           text=[f"{p:.1f}%" for p in fi["Percentage"]], textposition="outside"))
+    return _layout(fig, f"Feature Importance {bank}", 600, xaxis_title="Kontribusi (%)")
+
+
+def chart_category(bank, max_points):
+    # 20: importance per kategori indikator
+    fi = _importance(bank).set_index("Feature")["Percentage"]
+    totals = {cat: float(fi.reindex(feats).sum()) for cat, feats in FEATURE_CATEGORIES.items()}
+    fig = go.Figure(go.Pie(labels=list(totals), values=list(totals.values()), hole=0.4))
+    return _layout(fig, f"Importance per Kategori {bank}")
+
+
+def chart_importance_comparison(bank, max_points):
+    # 19: heatmap fitur x bank
+    table = pd.DataFrame({b: _importance(b).set_index("Feature")["Percentage"] for b in BANKS}).reindex(FEATURE_COLUMNS)
+    table = table.loc[table.mean(axis=1).sort_values().index]
+    fig = go.Figure(go.Heatmap(z=table.to_numpy(), x=table.columns, y=table.index, colorscale="Viridis",
+                               colorbar=dict(title="%")))
+    return _layout(fig, "Perbandingan Feature Importance Antar Bank", 650)
+
+
+def chart_consistency(bank, max_points):
+    # 21: rata-rata ± std importance lintas bank
+    table = pd.DataFrame({b: _importance(b).set_index("Feature")["Percentage"] for b in BANKS}).reindex(FEATURE_COLUMNS)
+    stats = pd.DataFrame({"mean": table.mean(axis=1), "std": table.std(axis=1)}).sort_values("mean")
+    fig = go.Figure(go.Bar(x=stats["mean"], y=stats.index, orientation="h",
+                           error_x=dict(type="data", array=stats["std"])))
+    return _layout(fig, "Konsistensi Feature Importance (rata-rata ± std antar bank)", 650, xaxis_title="Kontribusi (%)")
+
+
+# (builder, fungsi path sumber) per grafik; kunci = pengganti file PNG
+CHARTS = {
+    "raw": (chart_raw, lambda b: [_raw_path(b)]),
+    "cleaning": (chart_cleaning, lambda b: [_raw_path(b)]),
+    "indicators": (chart_indicators, lambda b: [_raw_path(b)]),
+    "distribution": (chart_distribution, lambda b: [_raw_path(b)]),
+    "split": (chart_split, lambda b: [_pred_path(b)]),
+    "prediction": (chart_prediction, lambda b: [_pred_path(b)]),
+    "timeline": (chart_timeline, lambda b: [_pred_path(b)]),
+    "scatter": (chart_scatter, lambda b: [_pred_path(x) for x in BANKS]),
+    "residual": (chart_residual, lambda b: [_pred_path(b)]),
+    "error_metrics": (chart_error_metrics, lambda b: [METRICS_FILE]),
+    "evaluation": (chart_evaluation, lambda b: [SUMMARY_FILE]),
+    "train_test": (chart_train_test, lambda b: [SUMMARY_FILE]),
+    "importance": (chart_importance, lambda b: [_fi_path(b)]),
+    "category": (chart_category, lambda b: [_fi_path(b)]),
+    "importance_comparison": (chart_importance_comparison, lambda b: [_fi_path(x) for x in BANKS]),
+    "consistency": (chart_consistency, lambda b: [_fi_path(x) for x in BANKS]),
+}
+# Grafik dalam Rupiah: versi sumber rentang Close (boleh belum ada) ikut kunci memo
+DESCALED = {"split", "prediction", "timeline", "residual"}
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _build(chart, bank, max_points, version):
+    # `version` hanya bagian kunci memo
+    return CHARTS[chart][0](bank, max_points)
+
+
+def figure(chart, bank, max_points=MAX_POINTS):
+    # Figure ter-memo; None bila file sumber belum ada
+    version = data_version(CHARTS[chart][1](bank))
+    if any(mtime is None for _, mtime, _ in version):
+        return None
+    if chart in DESCALED:
+        version += data_version([SUMMARY_FILE, _scaler_path(bank), _raw_path(bank)])
+    if not trace.enabled():
+        return _build(chart, bank, max_points, version)
+    misses = _build.cache_info().misses
+    with trace.span("chart.build", chart=chart):
+        fig = _build(chart, bank, max_points, version)
+    trace.count("chart_memo", result="miss" if _build.cache_info().misses > misses else "hit")
+    return fig
+
+
+def memo_info():
+    return _build.cache_info()
+
+
+trace.register_collector("chart_memo", lambda: memo_info()._asdict())
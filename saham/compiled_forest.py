@@ -0,0 +1,192 @@
+"""Kompilasi RandomForestRegressor menjadi array NumPy datar.
+
+Semua pohon digabung menjadi satu set array kontigu (feature, threshold,
+left, right, value) dengan indeks node global. Daun menunjuk ke dirinya
+sendiri sehingga evaluator batch cukup melangkah `max_depth` level untuk
+semua sampel x semua pohon sekaligus, tanpa traversal per pohon di Python.
+
+Mode threshold:
+* "float64"  : threshold asli sklearn.
+* "float32"  : threshold dibulatkan ke bawah ke float32 terdekat. Karena
+               sklearn membandingkan X dalam float32, keputusan split tetap
+               identik (x <= t  <=>  x <= float32_bawah(t)).
+* "quantized": threshold disimpan sebagai kode uint16 per fitur (peringkat di
+               antara threshold unik fitur tsb.) dan X dikodekan dengan
+               searchsorted; keputusan split juga identik.
+Nilai daun float64 memberi hasil dalam PREDICT_ATOL dari sklearn; float32
+dalam PREDICT_ATOL_F32 (satuan terskala 0-1).
+
+NaN: semua mode mengirim fitur NaN ke cabang kanan (x <= t salah; di mode
+quantized searchsorted menaruh NaN setelah threshold terakhir). sklearn
+mengirim NaN ke child dengan sampel terbanyak bila fitur tsb. tidak punya
+NaN saat training, jadi paritas hanya berlaku untuk X tanpa NaN. Training
+membuang baris indikator NaN dan saham.inference baru memprediksi setelah
+WARMUP_ROWS bar, sehingga X normalnya bebas NaN.
+"""
+import os
+
+import numpy as np
+
+COMPILED_DIR = "Models/Compiled"
+THRESHOLD_MODES = ("float64", "float32", "quantized")
+PREDICT_ATOL = 1e-12
+PREDICT_ATOL_F32 = 1e-6
+_LEAF = -1
+
+
+class CompiledForest:
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth,
+                 n_features_in_, feature_names_in_=None, threshold_mode="float64", bins=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features_in_)
+        self.feature_names_in_ = feature_names_in_
+        self.threshold_mode = threshold_mode
+        # bins[f] = threshold unik terurut fitur f (khusus mode "quantized")
+        self.bins = bins
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def nbytes(self):
+        arrays = [self.feature, self.threshold, self.left, self.right, self.value, self.roots]
+        if self.bins is not None:
+            arrays += list(self.bins)
+        return sum(a.nbytes for a in arrays)
+
+    def _encode(self, X):
+        # float32 seperti sklearn; mode quantized -> kode bin per fitur
+        X = np.asarray(X, dtype=np.float32)
+        if self.threshold_mode != "quantized":
+            return X
+        codes = np.empty(X.shape, dtype=self.threshold.dtype)
+        for f, edges in enumerate(self.bins):
+            # NaN -> len(edges), di atas semua kode threshold: selalu ke kanan
+            codes[:, f] = np.searchsorted(edges, X[:, f], side="left")
+        return codes
+
+    def apply(self, X):
+        # Indeks node daun global, shape (n_samples, n_trees)
+        X = self._encode(X)
+        n = X.shape[0]
+        flat = X.reshape(-1)
+        offsets = (np.arange(n, dtype=np.int64) * X.shape[1])[:, None]
+        idx = np.broadcast_to(self.roots, (n, self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            go_left = flat[offsets + self.feature[idx]] <= self.threshold[idx]
+            idx = np.where(go_left, self.left[idx], self.right[idx])
+        return idx
+
+    def predict(self, X):
+        leaves = self.apply(X)
+        return self.value[leaves.T].sum(axis=0, dtype=np.float64) / self.n_trees
+
+
+def _round_down_f32(threshold):
+    t32 = threshold.astype(np.float32)
+    up = t32.astype(np.float64) > threshold
+    t32[up] = np.nextafter(t32[up], np.float32(-np.inf))
+    return t32
+
+
+def compile_forest(model, threshold_mode="float64", value_dtype=np.float64):
+    if threshold_mode not in THRESHOLD_MODES:
+        raise ValueError(f"threshold_mode harus salah satu dari {THRESHOLD_MODES}.")
+    trees = [est.tree_ for est in model.estimators_]
+    if any(t.n_outputs != 1 for t in trees):
+        raise ValueError("Hanya RandomForestRegressor dengan satu target yang didukung.")
+
+    sizes = np.array([t.node_count for t in trees], dtype=np.int64)
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int32)
+    total = int(sizes.sum())
+
+    feature = np.empty(total, dtype=np.int32)
+    threshold = np.empty(total, dtype=np.float64)
+    left = np.empty(total, dtype=np.int32)
+    right = np.empty(total, dtype=np.int32)
+    value = np.empty(total, dtype=np.float64)
+    for tree, root, size in zip(trees, roots, sizes):
+        sl = slice(root, root + size)
+        own = np.arange(root, root + size, dtype=np.int32)
+        is_leaf = tree.children_left == _LEAF
+        feature[sl] = np.where(is_leaf, 0, tree.feature)
+        threshold[sl] = np.where(is_leaf, 0.0, tree.threshold)
+        left[sl] = np.where(is_leaf, own, tree.children_left + root)
+        right[sl] = np.where(is_leaf, own, tree.children_right + root)
+        value[sl] = tree.value[:, 0, 0]
+
+    n_features = model.n_features_in_
+    bins = None
+    if threshold_mode == "float32":
+        threshold = _round_down_f32(threshold)
+    elif threshold_mode == "quantized":
+        internal = left != np.arange(total)
+        t32 = _round_down_f32(threshold)
+        bins = [np.unique(t32[internal & (feature == f)]) for f in range(n_features)]
+        code_dtype = np.uint16 if max((len(b) for b in bins), default=0) < 2 ** 16 else np.uint32
+        codes = np.zeros(total, dtype=code_dtype)
+        for f in range(n_features):
+            mask = internal & (feature == f)
+            codes[mask] = np.searchsorted(bins[f], t32[mask], side="left")
+        threshold = codes
+
+    if n_features <= np.iinfo(np.uint8).max:
+        feature = feature.astype(np.uint8)
+    return CompiledForest(
+        feature, threshold, left, right, value.astype(value_dtype), roots,
+        max(t.max_depth for t in trees), n_features,
+        getattr(model, "feature_names_in_", None), threshold_mode, bins,
+    )
+
+
+# --- SIMPAN / MUAT (.npz tanpa sklearn) ---
+def save_compiled(forest, path):
+    arrays = {
+        "feature": forest.feature, "threshold": forest.threshold, "left": forest.left,
+        "right": forest.right, "value": forest.value, "roots": forest.roots,
+        "meta": np.array([forest.max_depth, forest.n_features_in_], dtype=np.int64),
+        "threshold_mode": np.array(forest.threshold_mode),
+    }
+    if forest.feature_names_in_ is not None:
+        arrays["feature_names_in_"] = np.asarray(forest.feature_names_in_, dtype=str)
+    for f, edges in enumerate(forest.bins or []):
+        arrays[f"bins_{f}"] = edges
+    np.savez(path, **arrays)
+
+
+def load_compiled(path):
+    with np.load(path, allow_pickle=False) as data:
+        max_depth, n_features = data["meta"]
+        mode = str(data["threshold_mode"])
+        bins = [data[f"bins_{f}"] for f in range(n_features)] if mode == "quantized" else None
+        names = data["feature_names_in_"].astype(object) if "feature_names_in_" in data else None
+        return CompiledForest(
+            data["feature"], data["threshold"], data["left"], data["right"], data["value"],
+            data["roots"], max_depth, n_features, names, mode, bins,
+        )
+
+
+# --- EKSPOR MODEL .pkl -> .npz ---
+def export_bank(bank, model_dir="Models/Trained", out_dir=COMPILED_DIR, threshold_mode="float64"):
+    import joblib
+
+    model = joblib.load(os.path.join(model_dir, f"{bank}_rf_model.pkl"))
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{bank}_forest.npz")
+    save_compiled(compile_forest(model, threshold_mode), path)
+    return path
+
+
+if __name__ == "__main__":
+    from saham.data import BANKS
+
+    for bank in BANKS:
+        print(export_bank(bank))
@@ -0,0 +1,46 @@
+"""Pembacaan dataset historis Data/Raw dan pembersihan OHLCV.
+
+pandas diimpor di dalam fungsi agar konstanta (BANKS, PRICE_COLUMNS) bisa
+dipakai app.py tanpa biaya impor pandas saat cold start.
+"""
+import os
+
+RAW_DIR = "Data/Raw"
+BANKS = ["BBCA", "BBRI", "BMRI", "BBNI", "BBTN"]
+# Emiten sektor perbankan di IDX (kode tanpa akhiran .JK)
+IDX_BANKING_SECTOR = BANKS + [
+    "BRIS", "BNGA", "NISP", "PNBN", "BDMN", "BJBR", "BJTM", "BTPS", "MEGA", "BNII",
+    "BBKP", "BNLI", "MAYA", "AGRO", "ARTO", "BBYB", "BACA", "BABP", "BBHI", "BBMD",
+    "BCIC", "BEKS", "BGTG", "BINA", "BKSW", "BMAS", "BNBA", "BSIM", "BSWD", "BVIC",
+    "DNAR", "INPC", "MCOR", "NOBU", "PNBS", "SDRA", "AMAR", "BANK", "BBSI", "MASB",
+]
+PRICE_COLUMNS = ["Close", "High", "Low", "Open", "Volume"]
+
+
+# --- PEMBERSIHAN DATA ---
+def clean_ohlcv(df):
+    # Hanya kolom OHLCV (buang Adj Close / Unnamed), lalu ffill & bfill
+    # agar deret waktu tidak terputus oleh hari libur bursa.
+    import pandas as pd
+
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    df = df[PRICE_COLUMNS].astype("float64")
+    return df.ffill().bfill()
+
+
+# --- LOAD DATA MENTAH ---
+def read_raw_csv(bank, raw_dir=RAW_DIR):
+    # CSV apa adanya (belum dibersihkan). File hasil yf.download punya baris
+    # header kedua berisi simbol (",BBCA.JK,BBCA.JK,..."), jadi dilewati.
+    import pandas as pd
+
+    path = os.path.join(raw_dir, f"{bank}_raw.csv")
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+    return pd.read_csv(path, skiprows=[1], index_col="Date", parse_dates=True)
+
+
+def load_raw_csv(bank, raw_dir=RAW_DIR):
+    return clean_ohlcv(read_raw_csv(bank, raw_dir))
@@ -0,0 +1,509 @@
+"""Pemantauan drift fitur live terhadap statistik data latih, per ticker.
+
+Random Forest tidak bisa mengekstrapolasi: fitur live di luar rentang [0, 1]
+MinMaxScaler (atau distribusi yang bergeser dari data latih) membuat
+prediksi menempel di nilai daun terluar tanpa peringatan. Modul ini:
+
+* Referensi per ticker (data_summary.json[bank]["drift_reference"], ditulis
+  saham.training; fallback dihitung ulang dari Data/Raw dengan
+  prepare_dataset; ticker yang hanya dilayani model pooled memakai
+  Models/Pooled/drift_reference.json, ditulis saham.pooled dari scaler
+  pooled + baris train panel): data_min/data_max scaler, mean/std dan
+  histogram baris train untuk 21 kolom SCALER_COLUMNS. Melengkapi norm_stats/split_stats
+  yang hanya mencakup beberapa kolom.
+* DriftMonitor: statistik berjalan per ticker x fitur dengan memori tetap
+  (Welford berbobot eksponensial: bobot, mean, M2, min, max + histogram
+  BINS bin di [0, 1] ditambah dua bin di luar rentang). Bar baru saja yang
+  dihitung (tanggal > bar terakhir yang sudah diamati); update vektor
+  untuk semua ticker sekaligus.
+* Evaluasi per fitur: fraksi bar di luar [0, 1] (status "range"), PSI
+  histogram live vs train (dikurangi bias sampel kecil) dan pergeseran mean
+  dalam satuan std train. Fitur level harga (SMA/EMA/BB) hampir selalu
+  punya PSI tinggi karena bar berurutan saling berkorelasi, jadi status
+  "shift" butuh PSI > PSI_THRESHOLD dan mean bergeser > SHIFT_THRESHOLD std.
+  Status "range"/"shift" pada fitur model = kandidat retrain.
+* RetrainTrigger menjalankan job retrain (saham.training --store untuk bank
+  dengan model sendiri, saham.pooled --refresh untuk ticker lain) saat
+  ambang terlewati, dengan jeda COOLDOWN_DAYS hari bursa per ticker, bukan
+  jadwal tetap. Keduanya melatih dari PriceStore (histori + bar live), jadi
+  referensinya berubah dan refresh_references() mereset statistik ticker
+  tersebut; retrain yang menghasilkan referensi sama (mis. job gagal) tidak
+  mereset apa pun. poll() melaporkan job yang selesai agar pemanggil memuat
+  ulang model dan referensi.
+* State disimpan per proses pemakai (app: Models/drift_state.npz, layanan:
+  Models/drift_state_service.npz) supaya keduanya tidak saling menimpa.
+
+Jalankan: python -m saham.drift replay [--banks BBCA ...]   (putar ulang periode test bar per bar)
+          python -m saham.drift check [--offline] [--retrain]
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from saham.data import BANKS, RAW_DIR, load_raw_csv, read_raw_csv
+from saham.indicators import SCALER_COLUMNS, compute_feature_array
+
+DRIFT_STATE = "Models/drift_state.npz"
+SUMMARY_FILE = "Models/data_summary.json"
+POOLED_REFERENCE_FILE = "Models/Pooled/drift_reference.json"
+BINS = 10
+# Bobot bar lama meluruh setengah setiap HALFLIFE bar (~3 bulan bursa)
+HALFLIFE = 60
+MIN_BARS = 20
+RANGE_TOLERANCE = 0.05
+PSI_THRESHOLD = 0.25
+SHIFT_THRESHOLD = 1.0
+COOLDOWN_DAYS = 20
+_OHLCV = ("Close", "High", "Low", "Open", "Volume")
+_STATE = ("weight", "weight2", "mean", "m2", "lo", "hi", "hist")
+_REFERENCE = ("data_min", "data_max", "ref_mean", "ref_std", "ref_hist", "ref_rows")
+
+
+# --- REFERENSI DATA LATIH ---
+def _bin_index(x, bins):
+    # Bin 0 = di bawah 0, 1..bins = [0, 1], bins + 1 = di atas 1
+    inner = np.clip(np.floor(np.nan_to_num(x) * bins), 0, bins - 1).astype(np.int64) + 1
+    return np.where(x < 0, 0, np.where(x > 1, bins + 1, inner))
+
+
+def reference_stats(scaled_train, data_min, data_max, train_end=None, bins=BINS):
+    # scaled_train: baris train (n, 21) hasil MinMaxScaler urutan SCALER_COLUMNS
+    x = np.asarray(scaled_train, dtype=np.float64)
+    b = _bin_index(x, bins)
+    hist = np.stack([np.bincount(b[:, j], minlength=bins + 2) for j in range(x.shape[1])]) / len(x)
+    return {
+        "columns": list(SCALER_COLUMNS),
+        "bins": bins,
+        "rows": len(x),
+        "train_end": None if train_end is None else f"{pd.Timestamp(train_end):%Y-%m-%d}",
+        "data_min": [float(v) for v in data_min],
+        "data_max": [float(v) for v in data_max],
+        "mean": [float(v) for v in x.mean(axis=0)],
+        "std": [float(v) for v in x.std(axis=0, ddof=1)],
+        "hist": hist.round(6).tolist(),
+    }
+
+
+def fingerprint(reference):
+    return hashlib.sha1(json.dumps(reference, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def load_reference(ticker, summary_file=SUMMARY_FILE, raw_dir=RAW_DIR, pooled_file=POOLED_REFERENCE_FILE):
+    # Referensi dari data_summary.json; bila belum ada (ringkasan lama) dihitung
+    # ulang dari Data/Raw persis seperti training; ticker tanpa model sendiri
+    # dari referensi model pooled. None = ticker tanpa data latih.
+    if os.path.exists(summary_file):
+        with open(summary_file) as f:
+            reference = json.load(f).get(ticker, {}).get("drift_reference")
+        if reference is not None:
+            return reference
+    raw = read_raw_csv(ticker, raw_dir)
+    if raw.empty:
+        if not os.path.exists(pooled_file):
+            return None
+        with open(pooled_file) as f:
+            return json.load(f).get(ticker)
+    from saham.training import prepare_dataset
+
+    _, _, scaler, scaled, n_train = prepare_dataset(raw)
+    return reference_stats(scaled.to_numpy()[:n_train], scaler.data_min_, scaler.data_max_, scaled.index[n_train - 1])
+
+
+def feature_rows(window):
+    # OHLCV -> (tanggal datetime64[D], baris fitur mentah (T, 21) urutan
+    # SCALER_COLUMNS); bar warmup indikator dibuang
+    cols = [window[c].to_numpy(dtype=np.float64) for c in _OHLCV]
+    rows = np.column_stack([cols[0], compute_feature_array(*cols)])
+    keep = np.isfinite(rows).all(axis=1)
+    return window.index.to_numpy().astype("datetime64[D]")[keep], rows[keep]
+
+
+# --- MONITOR STREAMING ---
+class DriftMonitor:
+    # Array state (n_ticker, 21[, BINS + 2]); satu baris per ticker yang punya referensi
+
+    def __init__(self, halflife=HALFLIFE, bins=BINS, reference_loader=load_reference):
+        self.halflife = halflife
+        self.bins = bins
+        self.decay = 0.5 ** (1.0 / halflife) if halflife else 1.0
+        self.reference_loader = reference_loader
+        self.tickers = []
+        self.index = {}
+        self.fingerprints = []
+        self.triggered = {}
+        self.last_date = np.array([], dtype="datetime64[D]")
+        f, k = len(SCALER_COLUMNS), bins + 2
+        self.arrays = {name: np.zeros((0, f, k) if name.endswith("hist") else (0, f)) for name in _STATE + _REFERENCE}
+        self.arrays["ref_rows"] = np.zeros(0)
+        self._missing = set()
+        self._lock = threading.Lock()
+        self.path = DRIFT_STATE
+
+    def __contains__(self, ticker):
+        return ticker in self.index
+
+    @property
+    def nbytes(self):
+        return sum(self.arrays[name].nbytes for name in _STATE)
+
+    def add(self, ticker, reference):
+        # Referensi baru (mis. setelah retrain) mereset statistik ticker
+        if reference.get("bins", self.bins) != self.bins or reference["columns"] != list(SCALER_COLUMNS):
+            raise ValueError(f"Referensi drift {ticker} tidak cocok dengan SCALER_COLUMNS/BINS saat ini.")
+        values = {
+            "data_min": reference["data_min"], "data_max": reference["data_max"],
+            "ref_mean": reference["mean"], "ref_std": reference["std"],
+            "ref_hist": reference["hist"], "ref_rows": reference["rows"],
+        }
+        with self._lock:
+            i = self.index.get(ticker)
+            if i is not None and self.fingerprints[i] == fingerprint(reference):
+                return
+            if i is None:
+                i = self.index[ticker] = len(self.tickers)
+                self.tickers.append(ticker)
+                self.fingerprints.append(None)
+                self.last_date = np.append(self.last_date, np.datetime64("NaT", "D"))
+                for name, arr in self.arrays.items():
+                    self.arrays[name] = np.concatenate([arr, np.zeros((1,) + arr.shape[1:])])
+            self.fingerprints[i] = fingerprint(reference)
+            for name, value in values.items():
+                self.arrays[name][i] = value
+            self._reset([i])
+
+    def _reset(self, idx):
+        for name in _STATE:
+            self.arrays[name][idx] = 0.0
+        self.arrays["lo"][idx] = np.inf
+        self.arrays["hi"][idx] = -np.inf
+
+    def ensure(self, tickers):
+        # Muat referensi ticker yang belum dipantau (sekali per proses)
+        for t in tickers:
+            if t not in self.index and t not in self._missing and self.reference_loader is not None:
+                reference = self.reference_loader(t)
+                if reference is None:
+                    self._missing.add(t)
+                else:
+                    self.add(t, reference)
+
+    def scale(self, i, rows):
+        # Sama dengan MinMaxScaler.transform (tanpa clip): luar [0, 1] tetap terlihat
+        span = self.arrays["data_max"][i] - self.arrays["data_min"][i]
+        return (rows - self.arrays["data_min"][i]) / np.where(span == 0, 1.0, span)
+
+    def observe(self, batch):
+        # batch: {ticker: (tanggal, baris fitur mentah (m, 21))}; hanya bar lebih
+        # baru dari bar terakhir yang sudah diamati. Return jumlah bar baru.
+        with self._lock:
+            new = {}
+            for ticker, (dates, rows) in batch.items():
+                i = self.index.get(ticker)
+                if i is None or not len(rows):
+                    continue
+                dates = np.asarray(dates, dtype="datetime64[D]")
+                last = self.last_date[i]
+                keep = np.ones(len(dates), dtype=bool) if np.isnat(last) else dates > last
+                if keep.any():
+                    new[i] = self.scale(i, np.asarray(rows, dtype=np.float64)[keep])
+                    self.last_date[i] = dates[keep][-1]
+            # Bar ke-r semua ticker diproses bersama (urutan waktu per ticker tetap)
+            for r in range(max((len(x) for x in new.values()), default=0)):
+                idx = np.array([i for i, x in new.items() if len(x) > r])
+                self._update(idx, np.stack([new[i][r] for i in idx]))
+            return sum(len(x) for x in new.values())
+
+    def observe_windows(self, windows):
+        # windows: {ticker: DataFrame OHLCV}; fitur hanya dihitung bila ada bar baru
+        self.ensure(windows)
+        batch = {}
+        for ticker, window in windows.items():
+            i = self.index.get(ticker)
+            if i is None or window is None or window.empty:
+                continue
+            last = self.last_date[i]
+            if not np.isnat(last) and np.datetime64(window.index[-1], "D") <= last:
+                continue
+            batch[ticker] = feature_rows(window)
+        return self.observe(batch)
+
+    def _update(self, idx, x):
+        # Welford berbobot: W = lam*W + 1, mean += d/W, M2 = lam*M2 + d*(x - mean baru)
+        a, lam = self.arrays, self.decay
+        valid = np.isfinite(x)
+        mean = a["mean"][idx]
+        x = np.where(valid, x, mean)
+        weight = np.where(valid, lam * a["weight"][idx] + 1.0, a["weight"][idx])
+        delta = x - mean
+        new_mean = mean + np.where(valid, delta / np.maximum(weight, 1.0), 0.0)
+        a["m2"][idx] = np.where(valid, lam * a["m2"][idx] + delta * (x - new_mean), a["m2"][idx])
+        a["weight2"][idx] = np.where(valid, lam * lam * a["weight2"][idx] + 1.0, a["weight2"][idx])
+        a["weight"][idx], a["mean"][idx] = weight, new_mean
+        a["lo"][idx] = np.where(valid, np.fmin(a["lo"][idx], x), a["lo"][idx])
+        a["hi"][idx] = np.where(valid, np.fmax(a["hi"][idx], x), a["hi"][idx])
+        hist = np.where(valid[..., None], lam * a["hist"][idx], a["hist"][idx])
+        rows, cols = np.nonzero(valid)
+        hist[rows, cols, _bin_index(x, self.bins)[rows, cols]] += 1.0
+        a["hist"][idx] = hist
+
+    def reset(self, tickers):
+        with self._lock:
+            self._reset([self.index[t] for t in tickers if t in self.index])
+
+    # --- EVALUASI ---
+    def report(self, tickers=None):
+        # DataFrame per ticker x fitur yang sudah punya bar live
+        a = self.arrays
+        idx = np.array([self.index[t] for t in (self.tickers if tickers is None else tickers) if t in self.index],
+                       dtype=np.int64)
+        with self._lock:
+            w, w2, mean, m2 = (a[name][idx] for name in ("weight", "weight2", "mean", "m2"))
+            hist, ref_hist = a["hist"][idx], a["ref_hist"][idx]
+            lo, hi = a["lo"][idx], a["hi"][idx]
+        ref_mean, ref_std, ref_rows = a["ref_mean"][idx], a["ref_std"][idx], a["ref_rows"][idx, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n_eff = np.where(w2 > 0, w * w / w2, 0.0)
+            p = hist / w[..., None]
+            eps = 1e-4
+            psi = np.sum((p - ref_hist) * np.log((p + eps) / (ref_hist + eps)), axis=-1)
+            # PSI dua histogram dari distribusi yang sama ~ (k-1)(1/n + 1/N)
+            k = np.count_nonzero(ref_hist, axis=-1)
+            psi_excess = psi - (k - 1) * (1.0 / n_eff + 1.0 / ref_rows)
+            out = (hist[..., 0] + hist[..., -1]) / w
+            shift = np.abs(mean - ref_mean) / np.where(ref_std > 0, ref_std, 1.0)
+            std = np.sqrt(np.maximum(m2, 0.0) / w)
+        status = np.where(n_eff < MIN_BARS, "warmup",
+                          np.where(out > RANGE_TOLERANCE, "range",
+                                   np.where((psi_excess > PSI_THRESHOLD) & (shift > SHIFT_THRESHOLD), "shift", "ok")))
+        t_idx, f_idx = np.nonzero(w > 0)
+        return pd.DataFrame({
+            "ticker": [self.tickers[i] for i in idx[t_idx]],
+            "feature": np.array(SCALER_COLUMNS)[f_idx],
+            "bars": n_eff[t_idx, f_idx],
+            "mean": mean[t_idx, f_idx], "std": std[t_idx, f_idx],
+            "ref_mean": ref_mean[t_idx, f_idx], "ref_std": ref_std[t_idx, f_idx],
+            "shift": shift[t_idx, f_idx],
+            "out_of_range": out[t_idx, f_idx],
+            "min": lo[t_idx, f_idx], "max": hi[t_idx, f_idx],
+            "psi": psi_excess[t_idx, f_idx],
+            "status": status[t_idx, f_idx],
+        })
+
+    def retrain_candidates(self, features=None):
+        # features: {ticker: kolom yang dipakai model} (default semua kolom);
+        # Close selalu ikut karena juga target. Return {ticker: [(fitur, status)]}
+        table = self.report()
+        flagged = table[table["status"].isin(["range", "shift"])]
+        out = {}
+        for ticker, rows in flagged.groupby("ticker", sort=False):
+            used = None if features is None or ticker not in features else {"Close", *features[ticker]}
+            hits = [(f, s) for f, s in zip(rows["feature"], rows["status"]) if used is None or f in used]
+            if hits:
+                out[ticker] = hits
+        return out
+
+    def summary(self):
+        # Ringkasan per ticker untuk /drift dan app
+        table = self.report()
+        out = {}
+        for ticker in self.tickers:
+            rows = table[table["ticker"] == ticker]
+            flagged = rows[rows["status"].isin(["range", "shift"])]
+            last = self.last_date[self.index[ticker]]
+            out[ticker] = {
+                "last_bar": None if np.isnat(last) else str(last),
+                "bars": float(rows["bars"].max()) if len(rows) else 0.0,
+                "status": "warmup" if not len(rows) or (rows["status"] == "warmup").all()
+                else ("drift" if len(flagged) else "ok"),
+                "flagged": {f: s for f, s in zip(flagged["feature"], flagged["status"])},
+                "retrain_triggered": self.triggered.get(ticker),
+            }
+        return out
+
+    # --- PERSISTENSI ---
+    def save(self, path=None):
+        # Default: file tempat state dimuat (DriftMonitor.load)
+        path = path or self.path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Salin di bawah lock, tulis di luarnya: observe() tidak menunggu disk
+        with self._lock:
+            meta = {"halflife": self.halflife, "bins": self.bins, "triggered": dict(self.triggered)}
+            state = {name: array.copy() for name, array in self.arrays.items()}
+            state.update(tickers=np.array(self.tickers, dtype=str), fingerprints=np.array(self.fingerprints, dtype=str),
+                         last_date=np.array(self.last_date, copy=True), meta=np.array(json.dumps(meta)))
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **state)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=DRIFT_STATE, reference_loader=load_reference):
+        # State tersimpan, atau monitor kosong bila file belum ada
+        if not os.path.exists(path):
+            monitor = cls(reference_loader=reference_loader)
+            monitor.path = path
+            return monitor
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            monitor = cls(meta["halflife"], meta["bins"], reference_loader)
+            monitor.tickers = [str(t) for t in data["tickers"]]
+            monitor.index = {t: i for i, t in enumerate(monitor.tickers)}
+            monitor.fingerprints = [str(f) for f in data["fingerprints"]]
+            monitor.last_date = data["last_date"].astype("datetime64[D]")
+            monitor.arrays = {name: data[name].astype(np.float64) for name in _STATE + _REFERENCE}
+        monitor.triggered = meta["triggered"]
+        monitor.path = path
+        return monitor
+
+    def refresh_references(self):
+        # Referensi yang berubah (model dilatih ulang) mereset statistik ticker;
+        # ticker yang sebelumnya tanpa referensi dicoba lagi
+        self._missing.clear()
+        for ticker in list(self.tickers):
+            reference = self.reference_loader(ticker) if self.reference_loader else None
+            if reference is not None:
+                self.add(ticker, reference)
+
+
+# --- TRIGGER RETRAIN ---
+def retrain_commands(tickers, raw_dir=RAW_DIR, store_dir=None):
+    # saham.training untuk ticker dengan Data/Raw (model per bank), saham.pooled
+    # (seluruh universe) bila ada ticker lain; keduanya dari PriceStore yang
+    # memuat bar live, sehingga referensi drift hasil retrain ikut bergeser
+    from saham.price_store import STORE_DIR
+
+    store_dir = store_dir or STORE_DIR
+    banks = [t for t in tickers if os.path.exists(os.path.join(raw_dir, f"{t}_raw.csv"))]
+    commands = []
+    if banks:
+        commands.append([sys.executable, "-m", "saham.training", "--banks", *banks, "--raw-dir", raw_dir,
+                         "--store", store_dir])
+    if len(banks) < len(tickers):
+        commands.append([sys.executable, "-m", "saham.pooled", "--refresh", "--raw-dir", raw_dir,
+                         "--store", store_dir])
+    return commands
+
+
+def launch_retrain(tickers, raw_dir=RAW_DIR, store_dir=None):
+    # Proses latar; return list Popen (lihat RetrainTrigger.poll)
+    return [subprocess.Popen(cmd) for cmd in retrain_commands(tickers, raw_dir, store_dir)]
+
+
+class RetrainTrigger:
+
+    def __init__(self, monitor, job=launch_retrain, cooldown=COOLDOWN_DAYS):
+        self.monitor = monitor
+        self.job = job
+        self.cooldown = cooldown
+        self.running = []
+
+    def check(self, today=None, features=None):
+        # Return ticker yang dijadwalkan retrain pada pemeriksaan ini
+        from saham.trading_calendar import trading_days_between
+
+        today = np.datetime64(today if today is not None else "today", "D")
+        due = []
+        for ticker in self.monitor.retrain_candidates(features):
+            last = self.monitor.triggered.get(ticker)
+            if last is None or trading_days_between(last, today) >= self.cooldown:
+                due.append(ticker)
+        if due:
+            self.running.extend(self.job(due) or [])
+            for ticker in due:
+                self.monitor.triggered[ticker] = str(today)
+        return due
+
+    def poll(self):
+        # Kode keluar job yang selesai sejak poll() terakhir; setelah ada yang
+        # selesai pemanggil memuat ulang model dan memanggil refresh_references()
+        done = [job for job in self.running if job.poll() is not None]
+        self.running = [job for job in self.running if job not in done]
+        return [job.returncode for job in done]
+
+
+# --- CLI ---
+def _replay(args):
+    # Referensi = baris train; bar periode test dialirkan satu per satu
+    monitor = DriftMonitor(args.halflife)
+    streams = {}
+    for bank in args.banks:
+        reference = load_reference(bank)
+        if reference is None:
+            print(f"{bank}: tidak ada data latih")
+            continue
+        monitor.add(bank, reference)
+        dates, rows = feature_rows(load_raw_csv(bank))
+        after = dates > np.datetime64(reference["train_end"], "D")
+        streams[bank] = (dates[after], rows[after])
+    fired = []
+    trigger = RetrainTrigger(monitor, job=lambda tickers: None, cooldown=args.cooldown)
+    for day in np.unique(np.concatenate([d for d, _ in streams.values()])):
+        monitor.observe({b: (d[d == day], r[d == day]) for b, (d, r) in streams.items() if (d == day).any()})
+        for ticker in trigger.check(day):
+            hits = monitor.retrain_candidates()[ticker]
+            fired.append((str(day), ticker, hits))
+    for day, ticker, hits in fired:
+        print(f"{day} {ticker}: retrain <- {', '.join(f'{f} ({s})' for f, s in hits)}")
+    _print_report(monitor)
+
+
+def _print_report(monitor):
+    table = monitor.report()
+    for ticker, info in monitor.summary().items():
+        print(f"\n{ticker}: {info['status']} | bar terakhir {info['last_bar']} | bar efektif {info['bars']:.0f}")
+        rows = table[table["ticker"] == ticker].sort_values("psi", ascending=False)
+        print(rows[["feature", "mean", "ref_mean", "shift", "out_of_range", "min", "max", "psi", "status"]]
+              .head(8).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+def _check(args):
+    from saham.market_cache import FetchError, MarketDataCache, store_loader
+    from saham.price_store import YahooFetcher, open_store
+
+    store = open_store()
+    cache = None if args.offline else MarketDataCache(store_loader(store, YahooFetcher()))
+    windows = {}
+    for ticker in args.tickers:
+        try:
+            windows[ticker] = store.tail(ticker, 60) if cache is None else cache.get(ticker, "1d", "60d")
+        except FetchError:
+            windows[ticker] = store.tail(ticker, 60)
+    monitor = DriftMonitor.load(args.state)
+    monitor.refresh_references()
+    added = monitor.observe_windows(windows)
+    print(f"{added} bar baru diamati, state {monitor.nbytes / 1024:.1f} KiB -> {args.state}")
+    if args.retrain:
+        due = RetrainTrigger(monitor, cooldown=args.cooldown).check()
+        print(f"Retrain dijalankan: {', '.join(due) if due else '-'}")
+    monitor.save(args.state)
+    _print_report(monitor)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pemantauan drift fitur live vs data latih.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    replay = sub.add_parser("replay")
+    replay.add_argument("--banks", nargs="+", default=BANKS)
+    replay.add_argument("--halflife", type=float, default=HALFLIFE)
+    replay.add_argument("--cooldown", type=int, default=COOLDOWN_DAYS)
+    check = sub.add_parser("check")
+    check.add_argument("--tickers", nargs="+", default=BANKS)
+    check.add_argument("--offline", action="store_true", help="Pakai histori lokal saja, tanpa yfinance")
+    check.add_argument("--retrain", action="store_true", help="Jalankan retrain bila ambang terlewati")
+    check.add_argument("--cooldown", type=int, default=COOLDOWN_DAYS)
+    check.add_argument("--state", default=DRIFT_STATE)
+    args = parser.parse_args(argv)
+    if args.command == "replay":
+        _replay(args)
+    else:
+        _check(args)
+
+
+if __name__ == "__main__":
+    main()
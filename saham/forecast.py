@@ -0,0 +1,137 @@
+"""Prakiraan rekursif N hari bursa ke depan untuk banyak ticker sekaligus.
+
+Langkah h (1..N) untuk semua ticker bersamaan:
+1. Bar templat dari close terakhir (sama seperti next_bar_template di
+   saham.inference): Open = Close = close terakhir, High/Low mengikuti
+   rata-rata rentang relatif TEMPLATE_LOOKBACK bar historis, Volume =
+   rata-rata volume. Fitur bar templat = IndicatorState.peek (n ticker
+   dalam satu vektor).
+2. Scaling vektor (n, 21) memakai parameter scaler per ticker, lalu satu
+   panggilan predict per model (forest pooled = satu panggilan per langkah).
+3. Close prediksi dimasukkan kembali ke state sebagai bar hari h
+   (Open = close sebelumnya, High/Low dari rentang rata-rata, Volume
+   rata-rata), lalu lanjut ke langkah berikutnya.
+Langkah 1 identik dengan pred_next predict_batch. Rentang High/Low dan
+volume templat dihitung sekali dari histori nyata, tidak dari bar prediksi.
+
+Tanggal target diberi label dengan saham.trading_calendar (akhir pekan dan
+libur bursa dilewati). Ticker dengan panjang window berbeda dikelompokkan
+agar state indikator tetap satu array per kelompok.
+"""
+import numpy as np
+import pandas as pd
+
+from saham import trace
+from saham.indicators import FEATURE_COLUMNS, SCALER_COLUMNS, WARMUP_ROWS, compute_feature_array
+from saham.inference import TEMPLATE_LOOKBACK, model_columns, scaler_columns
+from saham.trading_calendar import HOLIDAY_FILE, next_trading_days
+
+MAX_HORIZON = 60
+_OHLCV = ("Close", "High", "Low", "Open", "Volume")
+
+
+def _scaler_arrays(scaler):
+    # scale_ / min_ / batas clip dalam urutan SCALER_COLUMNS
+    cols = scaler_columns(scaler)
+    order = [cols.index(c) for c in SCALER_COLUMNS]
+    lo, hi = (scaler.feature_range if getattr(scaler, "clip", False) else (-np.inf, np.inf))
+    return np.asarray(scaler.scale_, dtype=np.float64)[order], np.asarray(scaler.min_, dtype=np.float64)[order], lo, hi
+
+
+def template_stats(close, high, low, volume, lookback=TEMPLATE_LOOKBACK):
+    # Array (T, n) -> (up, down, volume rata-rata) per ticker
+    close, high, low, volume = (a[-lookback:] for a in (close, high, low, volume))
+    return np.mean(high / close - 1.0, axis=0), np.mean(low / close - 1.0, axis=0), np.mean(volume, axis=0)
+
+
+class _Batch:
+    # Parameter scaler bertumpuk + pengelompokan model untuk n ticker
+
+    def __init__(self, assets, tickers):
+        n = len(tickers)
+        self.scale = np.empty((n, len(SCALER_COLUMNS)))
+        self.offset = np.empty((n, len(SCALER_COLUMNS)))
+        self.lo = np.empty((n, 1))
+        self.hi = np.empty((n, 1))
+        self.models = {}
+        for i, t in enumerate(tickers):
+            model, scaler = assets[t]
+            self.scale[i], self.offset[i], self.lo[i], self.hi[i] = _scaler_arrays(scaler)
+            entry = self.models.setdefault(id(model), [model, model_columns(model), []])
+            entry[2].append(i)
+        columns = set()
+        for entry in self.models.values():
+            entry[2] = np.array(entry[2])
+            columns.update(entry[1])
+        # Hanya indikator yang dipakai salah satu model yang dihitung
+        self.columns = [c for c in FEATURE_COLUMNS if c in columns]
+        self.col_idx = [SCALER_COLUMNS.index(c) for c in self.columns]
+
+    def predict(self, rows):
+        # rows (n, 21) urutan SCALER_COLUMNS (Rupiah) -> close prediksi (n,) Rupiah
+        scaled = np.clip(rows * self.scale + self.offset, self.lo, self.hi)
+        y = np.empty(len(rows))
+        for model, m_cols, members in self.models.values():
+            X = scaled[np.ix_(members, [SCALER_COLUMNS.index(c) for c in m_cols])]
+            if hasattr(model, "estimators_") and getattr(model, "feature_names_in_", None) is not None:
+                X = pd.DataFrame(X, columns=m_cols)
+            with trace.span("forecast.predict"):
+                y[members] = model.predict(X)
+        return (y - self.offset[:, 0]) / self.scale[:, 0]
+
+
+def forecast(assets, windows, horizon, holidays=HOLIDAY_FILE):
+    # assets: {ticker: (model, scaler)}, windows: {ticker: DataFrame OHLCV}.
+    # Return DataFrame panjang: ticker, step, date, pred_close, change_pct
+    # (terhadap close terakhir); ticker tanpa model/histori cukup dilewati.
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"Horizon harus 1-{MAX_HORIZON} hari bursa, diterima {horizon}.")
+    tickers = [t for t, w in windows.items()
+               if assets.get(t, (None, None))[0] is not None and w is not None and len(w) > WARMUP_ROWS]
+    if not tickers:
+        return pd.DataFrame(columns=["ticker", "step", "date", "pred_close", "change_pct"])
+    batch = _Batch(assets, tickers)
+    index = {t: i for i, t in enumerate(tickers)}
+
+    groups = {}
+    for t in tickers:
+        groups.setdefault(len(windows[t]), []).append(t)
+    states = []
+    last = np.empty(len(tickers))
+    up, down, vol = np.empty(len(tickers)), np.empty(len(tickers)), np.empty(len(tickers))
+    for members in groups.values():
+        idx = np.array([index[t] for t in members])
+        cols = [np.column_stack([windows[t][c].to_numpy(dtype=np.float64) for t in members]) for c in _OHLCV]
+        with trace.span("forecast.warmup"):
+            _, state = compute_feature_array(*cols, return_state=True, columns=batch.columns)
+        up[idx], down[idx], vol[idx] = template_stats(cols[0], cols[1], cols[2], cols[4])
+        last[idx] = cols[0][-1]
+        states.append((idx, state))
+
+    preds = np.empty((len(tickers), horizon))
+    close = last.copy()
+    rows = np.full((len(tickers), len(SCALER_COLUMNS)), np.nan)
+    for h in range(horizon):
+        rows[:, 0] = close
+        with trace.span("forecast.features"):
+            for idx, state in states:
+                c = close[idx]
+                rows[np.ix_(idx, batch.col_idx)] = state.peek(c, c * (1.0 + up[idx]), c * (1.0 + down[idx]),
+                                                             c, vol[idx])
+        pred = batch.predict(rows)
+        preds[:, h] = pred
+        # Bar hari h: open di close sebelumnya, close = prediksi
+        hi, lo = np.maximum(close, pred), np.minimum(close, pred)
+        for idx, state in states:
+            state.update(pred[idx], hi[idx] * (1.0 + up[idx]), lo[idx] * (1.0 + down[idx]), close[idx], vol[idx])
+        close = pred
+
+    last_dates = [windows[t].index[-1] for t in tickers]
+    targets = {d: next_trading_days(d, horizon, holidays) for d in set(last_dates)}
+    return pd.DataFrame({
+        "ticker": np.repeat(tickers, horizon),
+        "step": np.tile(np.arange(1, horizon + 1), len(tickers)),
+        "date": pd.to_datetime(np.concatenate([targets[d] for d in last_dates])),
+        "pred_close": preds.reshape(-1),
+        "change_pct": ((preds / last[:, None] - 1.0) * 100).reshape(-1),
+    })
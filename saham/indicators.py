@@ -0,0 +1,294 @@
+"""Mesin indikator teknikal untuk 20 fitur model Random Forest.
+
+Dua mode perhitungan dengan aritmetika yang identik:
+* batch  : compute_feature_array() / compute_features() atas seluruh histori,
+           tervektorisasi per ticker.
+* stream : IndicatorState.update() untuk bar baru dengan biaya O(1) per bar,
+           tanpa memindai ulang jendela rolling.
+
+Rolling sum dihitung dari selisih jumlah kumulatif (np.cumsum bersifat
+sekuensial, sama persis dengan penjumlahan berjalan di mode stream) dan
+seluruh rumus akhir bersifat elementwise, sehingga hasil kedua mode sama
+bit demi bit.
+
+Kedua mode menerima `columns` (subset FEATURE_COLUMNS, mis. fitur model
+hasil pruning): hanya indikator itu yang dirakit, dan rekursi EMA / signal
+MACD dilewati bila tidak ada kolom yang membutuhkannya.
+"""
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = [
+    "High", "Low", "Open", "Volume",
+    "SMA_5", "SMA_10", "SMA_20",
+    "EMA_5", "EMA_10", "EMA_20",
+    "RSI", "MACD", "MACD_Signal", "MACD_Histogram",
+    "BB_Middle", "BB_Upper", "BB_Lower",
+    "Volume_MA", "Daily_Return", "HL_Range",
+]
+TARGET_COLUMN = "Close"
+# Urutan kolom saat MinMaxScaler di-fit (target + fitur)
+SCALER_COLUMNS = [TARGET_COLUMN] + FEATURE_COLUMNS
+# Pengelompokan fitur untuk analisis importance per kategori
+FEATURE_CATEGORIES = {
+    "Price": ["High", "Low", "Open"],
+    "Volume": ["Volume", "Volume_MA"],
+    "Simple Moving Average": ["SMA_5", "SMA_10", "SMA_20"],
+    "Exponential Moving Average": ["EMA_5", "EMA_10", "EMA_20"],
+    "RSI": ["RSI"],
+    "MACD": ["MACD", "MACD_Signal", "MACD_Histogram"],
+    "Bollinger Bands": ["BB_Middle", "BB_Upper", "BB_Lower"],
+    "Other": ["Daily_Return", "HL_Range"],
+}
+
+SMA_WINDOWS = (5, 10, 20)
+RSI_WINDOW = 14
+BB_WINDOW = 20
+BB_STD = 2.0
+VOLUME_MA_WINDOW = 20
+# Baris awal yang masih NaN karena jendela 20 hari belum penuh
+WARMUP_ROWS = max(SMA_WINDOWS + (RSI_WINDOW, BB_WINDOW, VOLUME_MA_WINDOW)) - 1
+
+# EMA 5/10/20 untuk fitur + EMA 12/26 untuk MACD, signal EMA 9
+EMA_SPANS = (5, 10, 20, 12, 26)
+MACD_SIGNAL_SPAN = 9
+_ALPHA = np.array([2.0 / (span + 1.0) for span in EMA_SPANS])
+_DECAY = 1.0 - _ALPHA
+_SIGNAL_ALPHA = 2.0 / (MACD_SIGNAL_SPAN + 1.0)
+_SIGNAL_DECAY = 1.0 - _SIGNAL_ALPHA
+
+# Deret yang dijumlah kumulatif: close (dikurangi anchor), close^2, volume,
+# gain, loss. Anchor = close pertama, menjaga presisi varians Bollinger.
+_S_CLOSE, _S_CLOSE_SQ, _S_VOLUME, _S_GAIN, _S_LOSS = range(5)
+_N_SERIES = 5
+_RING = max(SMA_WINDOWS + (RSI_WINDOW, BB_WINDOW, VOLUME_MA_WINDOW)) + 1
+_EMA_COLUMNS = {"EMA_5", "EMA_10", "EMA_20"}
+_MACD_COLUMNS = {"MACD", "MACD_Signal", "MACD_Histogram"}
+
+
+# --- KERNEL BERSAMA (ELEMENTWISE) ---
+def _series(close, volume, delta, anchor):
+    c = close - anchor
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    return np.stack([c, c * c, volume, gain, loss], axis=-1)
+
+
+def _needs(columns):
+    # (butuh EMA, butuh signal MACD) untuk subset fitur
+    need = set(columns)
+    macd = bool(need & _MACD_COLUMNS)
+    return macd or bool(need & _EMA_COLUMNS), macd
+
+
+def _assemble(close, high, low, open_, volume, prev_close, anchor, wsum, ema, signal, columns=FEATURE_COLUMNS):
+    # wsum(idx, w) -> jumlah deret idx pada jendela w (NaN jika belum penuh).
+    # Hanya indikator di `columns` yang dihitung (ema/signal boleh None bila
+    # tidak dibutuhkan).
+    shared = {}
+
+    def bollinger():
+        if "bb" not in shared:
+            s1 = wsum(_S_CLOSE, BB_WINDOW)
+            s2 = wsum(_S_CLOSE_SQ, BB_WINDOW)
+            var = (s2 - s1 * s1 / BB_WINDOW) / (BB_WINDOW - 1)
+            shared["bb"] = s1 / BB_WINDOW + anchor, np.sqrt(np.maximum(var, 0.0))
+        return shared["bb"]
+
+    def macd():
+        if "macd" not in shared:
+            shared["macd"] = ema[..., 3] - ema[..., 4]
+        return shared["macd"]
+
+    def rsi():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_gain = wsum(_S_GAIN, RSI_WINDOW) / RSI_WINDOW
+            avg_loss = wsum(_S_LOSS, RSI_WINDOW) / RSI_WINDOW
+            return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def daily_return():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return close / prev_close - 1.0
+
+    build = {
+        "High": lambda: high,
+        "Low": lambda: low,
+        "Open": lambda: open_,
+        "Volume": lambda: volume,
+        "SMA_5": lambda: wsum(_S_CLOSE, 5) / 5 + anchor,
+        "SMA_10": lambda: wsum(_S_CLOSE, 10) / 10 + anchor,
+        "SMA_20": lambda: wsum(_S_CLOSE, 20) / 20 + anchor,
+        "EMA_5": lambda: ema[..., 0],
+        "EMA_10": lambda: ema[..., 1],
+        "EMA_20": lambda: ema[..., 2],
+        "RSI": rsi,
+        "MACD": macd,
+        "MACD_Signal": lambda: signal,
+        "MACD_Histogram": lambda: macd() - signal,
+        "BB_Middle": lambda: bollinger()[0],
+        "BB_Upper": lambda: bollinger()[0] + BB_STD * bollinger()[1],
+        "BB_Lower": lambda: bollinger()[0] - BB_STD * bollinger()[1],
+        "Volume_MA": lambda: wsum(_S_VOLUME, VOLUME_MA_WINDOW) / VOLUME_MA_WINDOW,
+        "Daily_Return": daily_return,
+        "HL_Range": lambda: high - low,
+    }
+    return np.stack([build[c]() for c in columns], axis=-1)
+
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+# --- MODE BATCH ---
+def compute_feature_array(close, high, low, open_, volume, return_state=False, columns=None):
+    # Input (T,) untuk satu ticker atau (T, n) untuk n ticker sejajar.
+    # Output (T, k) / (T, n, k) sesuai urutan columns (default FEATURE_COLUMNS).
+    columns = list(FEATURE_COLUMNS if columns is None else columns)
+    need_ema, need_signal = _needs(columns)
+    squeeze = np.ndim(close) == 1
+    close, high, low, open_, volume = (_as_2d(a) for a in (close, high, low, open_, volume))
+    T, n = close.shape
+    if T == 0:
+        raise ValueError("Histori harga kosong, indikator tidak dapat dihitung.")
+
+    anchor = close[0].copy()
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    delta = close - prev_close
+    delta[0] = 0.0
+
+    cs = np.zeros((T + 1, n, _N_SERIES))
+    np.cumsum(_series(close, volume, delta, anchor), axis=0, out=cs[1:])
+
+    def wsum(idx, w):
+        out = np.full((T, n), np.nan)
+        if T >= w:
+            out[w - 1:] = cs[w:, :, idx] - cs[:T - w + 1, :, idx]
+        return out
+
+    # Rekursi EMA/signal adalah loop Python per bar: dilewati bila tidak dipakai
+    ema = signal = None
+    if need_ema:
+        ema = np.empty((T, n, len(EMA_SPANS)))
+        ema[0] = close[0][:, None]
+        for t in range(1, T):
+            ema[t] = _ALPHA * close[t][:, None] + _DECAY * ema[t - 1]
+    if need_signal:
+        macd = ema[..., 3] - ema[..., 4]
+        signal = np.empty((T, n))
+        signal[0] = macd[0]
+        for t in range(1, T):
+            signal[t] = _SIGNAL_ALPHA * macd[t] + _SIGNAL_DECAY * signal[t - 1]
+
+    features = _assemble(close, high, low, open_, volume, prev_close, anchor, wsum, ema, signal, columns)
+    if squeeze:
+        features = features[:, 0]
+    if not return_state:
+        return features
+
+    state = IndicatorState(n, columns)
+    state.count = T
+    state.anchor = anchor
+    state.prev_close = close[-1].copy()
+    state.cumsum = cs[T].copy()
+    for k in range(max(0, T - _RING + 1), T + 1):
+        state.ring[k % _RING] = cs[k]
+    if need_ema:
+        state.ema = ema[-1].copy()
+    if need_signal:
+        state.signal = signal[-1].copy()
+    return features, state
+
+
+def compute_features(df, columns=None):
+    # DataFrame OHLCV -> DataFrame [Close] + fitur (default 20), index tanggal dipertahankan
+    columns = list(FEATURE_COLUMNS if columns is None else columns)
+    cols = [df[c].to_numpy(dtype=np.float64) for c in ("Close", "High", "Low", "Open", "Volume")]
+    features = compute_feature_array(*cols, columns=columns)
+    out = pd.DataFrame(features, index=df.index, columns=columns)
+    out.insert(0, TARGET_COLUMN, cols[0])
+    return out
+
+
+# --- MODE STREAMING (O(1) PER BAR) ---
+class IndicatorState:
+    # State indikator untuk n ticker yang bergerak bersama (satu bar per
+    # ticker per update). Memori tetap: ring buffer 21 posisi x 5 deret.
+    # `columns` membatasi fitur yang dirakit; EMA/signal yang tidak dipakai
+    # tidak diperbarui (tetap NaN).
+
+    def __init__(self, n_tickers=1, columns=None):
+        self.n_tickers = n_tickers
+        self.columns = list(FEATURE_COLUMNS if columns is None else columns)
+        self.count = 0
+        self.anchor = np.zeros(n_tickers)
+        self.prev_close = np.full(n_tickers, np.nan)
+        self.cumsum = np.zeros((n_tickers, _N_SERIES))
+        self.ring = np.zeros((_RING, n_tickers, _N_SERIES))
+        need_ema, need_signal = _needs(self.columns)
+        self.ema = np.zeros((n_tickers, len(EMA_SPANS))) if need_ema else np.full((n_tickers, len(EMA_SPANS)), np.nan)
+        self.signal = np.zeros(n_tickers) if need_signal else np.full(n_tickers, np.nan)
+
+    @classmethod
+    def from_history(cls, df, columns=None):
+        # Hangatkan state dari histori DataFrame OHLCV memakai mode batch
+        cols = [df[c].to_numpy(dtype=np.float64) for c in ("Close", "High", "Low", "Open", "Volume")]
+        return compute_feature_array(*cols, return_state=True, columns=columns)[1]
+
+    def copy(self):
+        other = IndicatorState.__new__(IndicatorState)
+        for name, value in self.__dict__.items():
+            setattr(other, name, value.copy() if isinstance(value, np.ndarray) else value)
+        return other
+
+    def _vec(self, values):
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if values.shape[0] != self.n_tickers:
+            raise ValueError(f"Diharapkan {self.n_tickers} nilai per bar, diterima {values.shape[0]}.")
+        return values
+
+    def update(self, close, high, low, open_, volume):
+        # Tambahkan satu bar (harian atau intraday) per ticker dan kembalikan
+        # vektor fitur (n, k) untuk bar tersebut, urutan self.columns.
+        close, high, low, open_, volume = (self._vec(v) for v in (close, high, low, open_, volume))
+        need_ema, need_signal = _needs(self.columns)
+        ema, signal = self.ema, self.signal
+        if self.count == 0:
+            self.anchor = close.copy()
+            prev_close = np.full(self.n_tickers, np.nan)
+            delta = np.zeros(self.n_tickers)
+            if need_ema:
+                ema = np.repeat(close[:, None], len(EMA_SPANS), axis=1)
+            if need_signal:
+                signal = ema[:, 3] - ema[:, 4]
+        else:
+            prev_close = self.prev_close
+            delta = close - prev_close
+            if need_ema:
+                ema = _ALPHA * close[:, None] + _DECAY * self.ema
+            if need_signal:
+                signal = _SIGNAL_ALPHA * (ema[:, 3] - ema[:, 4]) + _SIGNAL_DECAY * self.signal
+
+        self.cumsum = self.cumsum + _series(close, volume, delta, self.anchor)
+        self.count += 1
+        k = self.count
+        self.ring[k % _RING] = self.cumsum
+
+        def wsum(idx, w):
+            if k < w:
+                return np.full(self.n_tickers, np.nan)
+            return self.cumsum[:, idx] - self.ring[(k - w) % _RING][:, idx]
+
+        features = _assemble(close, high, low, open_, volume, prev_close, self.anchor, wsum, ema, signal,
+                             self.columns)
+        self.prev_close = close
+        self.ema = ema
+        self.signal = signal
+        return features
+
+    def peek(self, close, high, low, open_, volume):
+        # Fitur untuk bar sementara (mis. bar intraday yang belum close)
+        # tanpa mengubah state.
+        return self.copy().update(close, high, low, open_, volume)
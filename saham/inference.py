@@ -0,0 +1,157 @@
+"""Inferensi Random Forest: fitur live -> MinMaxScaler -> predict -> Rupiah.
+
+Untuk setiap ticker dibangun dua baris fitur: bar terakhir (estimasi close
+hari ini) dan bar templat hari berikutnya (estimasi close besok). Baris dari
+semua ticker yang memakai model yang sama ditumpuk menjadi satu matriks,
+sehingga satu permintaan = satu panggilan predict per model. Model hasil
+pruning (feature_names_in_ subset FEATURE_COLUMNS) hanya memicu perhitungan
+indikator yang dipakainya; kolom lain dibiarkan NaN dan tidak ikut ke predict.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from saham import trace
+from saham.compiled_forest import compile_forest
+from saham.indicators import FEATURE_COLUMNS, SCALER_COLUMNS, TARGET_COLUMN, WARMUP_ROWS, compute_feature_array
+
+MODEL_DIR = "Models/Trained"
+SCALER_DIR = "Models/Scalers"
+# Target latensi satu permintaan 5 bank (fitur + scaling + predict), p95.
+# Forest sklearn didominasi traversal per pohon (total 1.300 pohon untuk
+# 5 bank); forest terkompilasi (compiled=True) harus jauh di bawahnya.
+LATENCY_TARGET_MS = 200.0
+COMPILED_LATENCY_TARGET_MS = 20.0
+# Jumlah bar yang dipakai untuk rata-rata rentang High/Low bar templat
+TEMPLATE_LOOKBACK = 20
+
+
+# --- LOAD MODEL & SCALER ---
+def load_assets(bank, model_dir=MODEL_DIR, scaler_dir=SCALER_DIR, compiled=False):
+    model_path = os.path.join(model_dir, f"{bank}_rf_model.pkl")
+    scaler_path = os.path.join(scaler_dir, f"{bank}_scaler.pkl")
+    if not (os.path.exists(model_path) and os.path.exists(scaler_path)):
+        return None, None
+    import joblib
+
+    with trace.span("model.load", bank=bank, source="pkl"):
+        try:
+            model = joblib.load(model_path)
+            scaler = joblib.load(scaler_path)
+        except (OSError, ValueError, KeyError, EOFError):
+            # Mis. pointer Git LFS yang belum di-pull
+            return None, None
+        if compiled:
+            return compile_forest(model), scaler
+        return prepare_model(model), scaler
+
+
+def prepare_model(model):
+    # Batch inferensi kecil lebih cepat tanpa overhead thread pool joblib
+    if hasattr(model, "n_jobs"):
+        model.n_jobs = 1
+    return model
+
+
+# --- URUTAN KOLOM ---
+def scaler_columns(scaler):
+    names = getattr(scaler, "feature_names_in_", None)
+    return list(names) if names is not None else list(SCALER_COLUMNS)
+
+
+def model_columns(model):
+    names = getattr(model, "feature_names_in_", None)
+    return list(names) if names is not None else list(FEATURE_COLUMNS)
+
+
+def scale_rows(scaler, rows):
+    # Sama dengan MinMaxScaler.transform, tanpa validasi DataFrame per panggilan
+    scaled = rows * scaler.scale_ + scaler.min_
+    if getattr(scaler, "clip", False):
+        np.clip(scaled, scaler.feature_range[0], scaler.feature_range[1], out=scaled)
+    return scaled
+
+
+def inverse_close(scaler, y_scaled):
+    i = scaler_columns(scaler).index(TARGET_COLUMN)
+    return (np.asarray(y_scaled) - scaler.min_[i]) / scaler.scale_[i]
+
+
+# --- PEMBANGUNAN BARIS FITUR ---
+def next_bar_template(window, lookback=TEMPLATE_LOOKBACK):
+    # Bar hari berikutnya: buka di close terakhir, rentang High/Low mengikuti
+    # rata-rata relatif terhadap close selama `lookback` bar terakhir.
+    tail = window.tail(lookback)
+    close = tail["Close"].to_numpy()
+    up = np.mean(tail["High"].to_numpy() / close - 1.0)
+    down = np.mean(tail["Low"].to_numpy() / close - 1.0)
+    open_ = close[-1]
+    return {
+        "Close": open_,
+        "High": open_ * (1.0 + up),
+        "Low": open_ * (1.0 + down),
+        "Open": open_,
+        "Volume": tail["Volume"].mean(),
+    }
+
+
+def build_rows(window, columns=None):
+    # OHLCV -> array (2, 21) urutan SCALER_COLUMNS: [bar terakhir, bar templat].
+    # columns: fitur yang dibutuhkan model; sisanya NaN.
+    if len(window) <= WARMUP_ROWS:
+        raise ValueError(f"Butuh minimal {WARMUP_ROWS + 1} bar untuk menghitung fitur, tersedia {len(window)}.")
+    columns = list(FEATURE_COLUMNS if columns is None else columns)
+    cols = [window[c].to_numpy(dtype=np.float64) for c in ("Close", "High", "Low", "Open", "Volume")]
+    features, state = compute_feature_array(*cols, return_state=True, columns=columns)
+    bar = next_bar_template(window)
+    nxt = state.peek(bar["Close"], bar["High"], bar["Low"], bar["Open"], bar["Volume"])[0]
+    rows = np.full((2, len(SCALER_COLUMNS)), np.nan)
+    idx = [SCALER_COLUMNS.index(c) for c in columns]
+    rows[0, 0], rows[0, idx] = cols[0][-1], features[-1]
+    rows[1, 0], rows[1, idx] = bar["Close"], nxt
+    return rows
+
+
+def _reorder(rows, columns):
+    # Susun ulang kolom SCALER_COLUMNS ke urutan yang dipakai scaler saat fit
+    if columns == SCALER_COLUMNS:
+        return rows
+    return rows[:, [SCALER_COLUMNS.index(c) for c in columns]]
+
+
+# --- PREDIKSI BATCH ---
+def predict_batch(assets, windows):
+    # assets: {ticker: (model, scaler)}, windows: {ticker: DataFrame OHLCV}.
+    # Return DataFrame per ticker: last_date, last_close, pred_today, pred_next.
+    groups = {}
+    results = {}
+    for ticker, window in windows.items():
+        model, scaler = assets.get(ticker, (None, None))
+        if model is None or window is None or len(window) <= WARMUP_ROWS:
+            results[ticker] = (None, np.nan, np.nan, np.nan)
+            continue
+        s_cols = scaler_columns(scaler)
+        m_cols = model_columns(model)
+        with trace.span("inference.features"):
+            rows = build_rows(window, m_cols)
+        with trace.span("inference.scale"):
+            scaled = scale_rows(scaler, _reorder(rows, s_cols))
+        X = scaled[:, [s_cols.index(c) for c in m_cols]]
+        results[ticker] = (window.index[-1], float(window["Close"].iloc[-1]), np.nan, np.nan)
+        groups.setdefault(id(model), (model, m_cols, []))[2].append((ticker, scaler, X))
+
+    for model, m_cols, members in groups.values():
+        X = np.vstack([x for _, _, x in members])
+        if hasattr(model, "estimators_") and getattr(model, "feature_names_in_", None) is not None:
+            X = pd.DataFrame(X, columns=m_cols)
+        with trace.span("inference.predict"):
+            y = model.predict(X)
+        for i, (ticker, scaler, _) in enumerate(members):
+            today, nxt = inverse_close(scaler, y[2 * i:2 * i + 2])
+            last_date, last_close = results[ticker][:2]
+            results[ticker] = (last_date, last_close, float(today), float(nxt))
+
+    return pd.DataFrame.from_dict(
+        results, orient="index", columns=["last_date", "last_close", "pred_today", "pred_next"]
+    )
@@ -0,0 +1,286 @@
+"""Cache data pasar bersama (per proses) dengan TTL dan prefetch latar belakang.
+
+* Kunci cache: (ticker, interval, period); entri kedaluwarsa setelah `ttl`
+  detik dan jumlah entri dibatasi (LRU).
+* Single-flight: permintaan serentak untuk kunci yang sama menunggu satu
+  fetch yang sedang berjalan, bukan memicu fetch baru.
+* Fetch dicoba ulang dengan backoff; jika tetap gagal, entri lama (stale)
+  dikembalikan bila ada, selain itu FetchError dinaikkan.
+* Prefetcher menyegarkan daftar ticker secara berkala selama jam bursa IDX;
+  dengan PriceStore, satu putaran = refresh_many (saham.market_fetch) lalu
+  window terbaru dimasukkan ke cache tanpa fetch kedua.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dtime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from saham import trace
+from saham.trading_calendar import is_trading_day, previous_trading_day
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 64
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+
+IDX_TZ = ZoneInfo("Asia/Jakarta")
+# Sesi perdagangan reguler IDX (termasuk pre-closing) pada hari bursa
+IDX_OPEN = dtime(9, 0)
+IDX_CLOSE = dtime(16, 15)
+
+
+class FetchError(Exception):
+    pass
+
+
+def is_idx_trading_time(now=None):
+    now = datetime.now(IDX_TZ) if now is None else now.astimezone(IDX_TZ)
+    # Hari bursa = Senin-Jumat di luar libur bursa (saham.trading_calendar)
+    return IDX_OPEN <= now.time() <= IDX_CLOSE and is_trading_day(now)
+
+
+def last_closed_session(now):
+    # Tanggal (datetime64[D]) bar harian terakhir yang pasti sudah ada di
+    # sumber data: hari ini setelah penutupan, selain itu hari bursa sebelumnya
+    if now.time() > IDX_CLOSE and is_trading_day(now):
+        return np.datetime64(now.date(), "D")
+    return previous_trading_day(now)
+
+
+class _Flight:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class MarketDataCache:
+    # fetch(ticker, interval, period) -> DataFrame; DataFrame kosong = gagal
+
+    def __init__(self, fetch, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES,
+                 retries=RETRY_ATTEMPTS, backoff=RETRY_BACKOFF, clock=time.monotonic, sleep=time.sleep):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.retries = retries
+        self.backoff = backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.counters = {
+            "hits": 0, "misses": 0, "coalesced": 0, "stale_served": 0,
+            "errors": 0, "retries": 0, "evictions": 0,
+            "fetches": 0, "fetch_seconds": 0.0, "fetch_seconds_max": 0.0,
+        }
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_ratio"] = (stats["hits"] + stats["coalesced"]) / lookups if lookups else 0.0
+        stats["fetch_ms_avg"] = stats["fetch_seconds"] / stats["fetches"] * 1e3 if stats["fetches"] else 0.0
+        return stats
+
+    def get(self, ticker, interval="1d", period="60d", force=False):
+        key = (ticker, interval, period)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not force and self._clock() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                trace.count("cache_lookups", result="hit")
+                return entry[1]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.counters["misses"] += 1
+            else:
+                self.counters["coalesced"] += 1
+        trace.count("cache_lookups", result="miss" if leader else "coalesced")
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._fetch_with_retry(key)
+        except FetchError as exc:
+            with self._lock:
+                stale = self._entries.get(key)
+                if stale is None:
+                    flight.error = exc
+                else:
+                    self.counters["stale_served"] += 1
+                    flight.value = stale[1]
+        else:
+            with self._lock:
+                self._remember(key, flight.value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _remember(self, key, value):
+        # Dipanggil dengan _lock dipegang
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def put(self, ticker, interval, period, value):
+        # Isi entri dari luar (Prefetcher yang sudah me-refresh store)
+        with self._lock:
+            self._remember((ticker, interval, period), value)
+
+    def _fetch_with_retry(self, key):
+        last_error = None
+        for attempt in range(self.retries):
+            if attempt:
+                with self._lock:
+                    self.counters["retries"] += 1
+                self._sleep(self.backoff * 2 ** (attempt - 1))
+            t0 = time.perf_counter()
+            try:
+                with trace.span("cache.fetch", ticker=key[0]):
+                    value = self._fetch(*key)
+            except Exception as exc:
+                last_error = exc
+                value = None
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self.counters["fetches"] += 1
+                self.counters["fetch_seconds"] += elapsed
+                self.counters["fetch_seconds_max"] = max(self.counters["fetch_seconds_max"], elapsed)
+                if value is None or getattr(value, "empty", False):
+                    self.counters["errors"] += 1
+            if value is not None and not getattr(value, "empty", False):
+                return value
+        raise FetchError(f"Gagal mengambil {key[0]} ({key[1]}, {key[2]}) setelah {self.retries} percobaan: {last_error}")
+
+    def invalidate(self, ticker=None):
+        with self._lock:
+            for key in [k for k in self._entries if ticker is None or k[0] == ticker]:
+                del self._entries[key]
+
+
+# --- LOADER ---
+def store_loader(store, fetcher):
+    # Loader berbasis PriceStore: refresh inkremental lalu ambil N bar
+    # terakhir, dengan period "60d" = 60 bar. Refresh mengambil ulang bar
+    # terakhir yang tersimpan, jadi setiap get(force=True) selama sesi
+    # (Prefetcher) mengganti bar hari berjalan dengan snapshot terbaru.
+    # YahooFetcher mengubah unduhan gagal menjadi frame kosong: bila refresh
+    # tidak menulis baris dan bar terakhir store lebih tua dari sesi terakhir
+    # yang sudah tutup, FetchError dinaikkan agar retry & counter errors jalan.
+    def load(ticker, interval, period):
+        import pandas as pd
+
+        now = pd.Timestamp.today()
+        if store.refresh(ticker, fetcher, today=now) == 0 and store.last_refresh.get(ticker, {}).get("fetched"):
+            last = store.last_date(ticker)
+            if last is None or np.datetime64(last.date(), "D") < last_closed_session(now):
+                raise FetchError(f"Tidak ada bar baru untuk {ticker}; bar terakhir di store: {last}")
+        return store.tail(ticker, int(period.rstrip("d")))
+    return load
+
+
+class FakeMarketFetcher:
+    # Loader offline untuk pengujian: latensi & kegagalan dapat diatur
+
+    def __init__(self, frames, latency=0.0, failures=0):
+        self.frames = frames
+        self.latency = latency
+        self.failures = failures
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, interval, period):
+        with self._lock:
+            self.calls[ticker] = self.calls.get(ticker, 0) + 1
+            fail = self.failures > 0
+            if fail:
+                self.failures -= 1
+        time.sleep(self.latency)
+        if fail:
+            raise ConnectionError(f"Simulasi koneksi gagal untuk {ticker}")
+        return self.frames[ticker].tail(int(period.rstrip("d")))
+
+
+# --- PREFETCH LATAR BELAKANG ---
+class Prefetcher:
+    # Thread daemon yang menyegarkan `tickers` setiap `interval` detik
+    # selama is_open() bernilai True (default: jam bursa IDX). Dengan
+    # store + fetcher, refresh lewat refresh_many lalu cache.put; tanpa
+    # keduanya, cache.get(force=True) per ticker.
+
+    def __init__(self, cache, tickers, interval=60.0, data_interval="1d", period="60d",
+                 is_open=is_idx_trading_time, max_workers=8, store=None, fetcher=None):
+        self.cache = cache
+        self.store = store
+        self.fetcher = fetcher
+        self.max_workers = max_workers
+        self.tickers = list(tickers)
+        self.interval = interval
+        self.data_interval = data_interval
+        self.period = period
+        self.is_open = is_open
+        self.rounds = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _refresh(self, ticker):
+        try:
+            self.cache.get(ticker, self.data_interval, self.period, force=True)
+        except FetchError:
+            # Sudah tercatat di counter errors; coba lagi di putaran berikutnya
+            pass
+
+    def run_once(self):
+        # Semua ticker di-refresh paralel agar satu putaran ~ satu round-trip
+        if self.store is not None:
+            from saham.market_fetch import refresh_many
+
+            bars = int(self.period.rstrip("d"))
+            results = refresh_many(self.store, self.tickers, self.fetcher, self.max_workers)
+            for ticker, result in results.items():
+                # Pesan error (str): entri lama tetap dipakai, dicoba lagi putaran berikutnya
+                if not isinstance(result, str):
+                    self.cache.put(ticker, self.data_interval, self.period, self.store.tail(ticker, bars))
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(self.tickers)))) as pool:
+                list(pool.map(self._refresh, self.tickers))
+        self.rounds += 1
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if self.is_open():
+                self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="market-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
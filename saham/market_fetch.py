@@ -0,0 +1,128 @@
+"""Pengambilan data banyak ticker sekaligus dengan fallback per ticker.
+
+Dua jalur:
+* per ticker paralel: fetch_one(ticker, start, end) dijalankan di thread pool
+  berukuran terbatas (I/O jaringan, jadi thread cukup);
+* satu unduhan multi-simbol: bulk(tickers, start, end) -> {ticker: DataFrame},
+  mis. YahooBulkFetcher yang memecah kolom MultiIndex yfinance per ticker.
+Ticker yang gagal atau kosong diambil dari histori lokal (fallback), bukan
+dikembalikan sebagai DataFrame kosong.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from saham.data import PRICE_COLUMNS, clean_ohlcv
+
+DEFAULT_WORKERS = 8
+
+
+# --- NORMALISASI KOLOM yfinance ---
+def split_download(data, tickers, suffix=".JK"):
+    # Hasil yf.download multi-simbol punya kolom MultiIndex (Price, Ticker)
+    # atau (Ticker, Price) bila group_by="ticker". Pecah menjadi satu
+    # DataFrame OHLCV satu level per ticker.
+    if data is None or data.empty:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {tickers[0]: clean_ohlcv(data)} if len(tickers) == 1 else {}
+    symbols = {f"{t}{suffix}": t for t in tickers}
+    level = next((i for i in range(data.columns.nlevels)
+                  if set(data.columns.get_level_values(i)) & set(symbols)), None)
+    if level is None:
+        return {}
+    frames = {}
+    for symbol in set(data.columns.get_level_values(level)) & set(symbols):
+        sub = data.xs(symbol, axis=1, level=level).dropna(how="all")
+        if not sub.empty and set(PRICE_COLUMNS) <= set(sub.columns):
+            frames[symbols[symbol]] = clean_ohlcv(sub)
+    return frames
+
+
+class YahooBulkFetcher:
+    # Satu panggilan yf.download untuk banyak simbol
+
+    def __init__(self, suffix=".JK", interval="1d"):
+        self.suffix = suffix
+        self.interval = interval
+
+    def __call__(self, tickers, start, end):
+        import yfinance as yf
+
+        data = yf.download([f"{t}{self.suffix}" for t in tickers], start=start, end=end,
+                           interval=self.interval, group_by="ticker", threads=True,
+                           progress=False, auto_adjust=False)
+        return split_download(data, list(tickers), self.suffix)
+
+
+# --- FETCH BANYAK TICKER ---
+def _usable(df):
+    return df is not None and not df.empty
+
+
+def fetch_many(tickers, start, end, fetch_one=None, bulk=None, max_workers=DEFAULT_WORKERS, fallback=None):
+    # Return (frames, report). report["sources"][ticker] bernilai "network",
+    # "fallback" atau "missing"; report["errors"] memuat pesan kegagalan.
+    tickers = list(tickers)
+    if (fetch_one is None) == (bulk is None):
+        raise ValueError("Berikan tepat satu dari fetch_one atau bulk.")
+    t0 = time.perf_counter()
+    frames, errors = {}, {}
+
+    if bulk is not None:
+        try:
+            frames = {t: df for t, df in bulk(tickers, start, end).items() if _usable(df)}
+        except Exception as exc:
+            errors = {t: repr(exc) for t in tickers}
+    else:
+        def one(ticker):
+            try:
+                return ticker, fetch_one(ticker, start, end), None
+            except Exception as exc:
+                return ticker, None, repr(exc)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+            for ticker, df, error in pool.map(one, tickers):
+                if _usable(df):
+                    frames[ticker] = clean_ohlcv(df)
+                else:
+                    errors[ticker] = error or "data kosong"
+
+    sources = {t: "network" for t in frames}
+    for ticker in tickers:
+        if ticker in frames:
+            continue
+        errors.setdefault(ticker, "data kosong")
+        local = fallback(ticker, start, end) if fallback is not None else None
+        if _usable(local):
+            frames[ticker] = local
+            sources[ticker] = "fallback"
+        else:
+            sources[ticker] = "missing"
+
+    report = {"sources": sources, "errors": errors, "seconds": time.perf_counter() - t0}
+    return {t: frames[t] for t in tickers if t in frames}, report
+
+
+def store_fallback(store):
+    # Fallback histori lokal dari PriceStore; jika rentang yang diminta belum
+    # ada, kembalikan bar terakhir yang tersimpan.
+    def local(ticker, start, end):
+        df = store.read(ticker, start, end)
+        return df if not df.empty else store.tail(ticker, 60)
+    return local
+
+
+def refresh_many(store, tickers, fetcher, max_workers=DEFAULT_WORKERS, today=None):
+    # Refresh inkremental PriceStore untuk banyak ticker secara paralel;
+    # return {ticker: jumlah bar baru, atau pesan error}
+    def one(ticker):
+        try:
+            return ticker, store.refresh(ticker, fetcher, today=today)
+        except Exception as exc:
+            return ticker, repr(exc)
+
+    tickers = list(tickers)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+        return dict(pool.map(one, tickers))
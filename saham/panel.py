@@ -0,0 +1,137 @@
+"""Panel fitur semua ticker dalam satu array dengan indeks ticker.
+
+Baris diurutkan per ticker lalu per tanggal, sehingga baris satu ticker
+membentuk blok kontigu [offsets[i], offsets[i + 1]) (gaya CSR):
+    X        float32 (n_baris, 20)  urutan FEATURE_COLUMNS
+    close    float64 (n_baris,)     target (Close, Rupiah)
+    dates    int64   (n_baris,)     ns sejak epoch
+    ticker_id int32  (n_baris,)     indeks ke `tickers`
+Dibanding dict DataFrame per ticker tidak ada overhead index/objek per
+ticker, dan satu slicing cukup untuk melatih model pooled.
+
+Ticker dengan kalender identik dihitung indikatornya sekaligus lewat
+compute_feature_array (T, n) (EMA berjalan untuk n ticker per langkah).
+
+Simpan/buka: save(folder) menulis .npy, Panel.load(folder) membuka dengan
+mmap_mode="r".
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from saham.indicators import FEATURE_COLUMNS, TARGET_COLUMN, WARMUP_ROWS, compute_feature_array
+
+_ARRAYS = ("X", "close", "dates", "ticker_id", "offsets")
+
+
+class Panel:
+
+    def __init__(self, tickers, X, close, dates, ticker_id, offsets):
+        self.tickers = list(tickers)
+        self.index = {t: i for i, t in enumerate(self.tickers)}
+        self.X = X
+        self.close = close
+        self.dates = dates
+        self.ticker_id = ticker_id
+        self.offsets = offsets
+
+    @property
+    def n_rows(self):
+        return len(self.close)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in _ARRAYS)
+
+    def __contains__(self, ticker):
+        return ticker in self.index
+
+    def rows(self, ticker):
+        i = self.index[ticker]
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def frame(self, ticker):
+        # DataFrame [Close] + fitur satu ticker (untuk inspeksi)
+        s = self.rows(ticker)
+        out = pd.DataFrame(np.asarray(self.X[s], dtype=np.float64), columns=FEATURE_COLUMNS,
+                           index=pd.DatetimeIndex(np.asarray(self.dates[s]).view("datetime64[ns]"), name="Date"))
+        out.insert(0, TARGET_COLUMN, np.asarray(self.close[s]))
+        return out
+
+    def train_mask(self, train_ratio):
+        # Split kronologis per ticker: train_ratio baris pertama tiap blok
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for i in range(len(self.tickers)):
+            lo, hi = self.offsets[i], self.offsets[i + 1]
+            mask[lo:lo + int((hi - lo) * train_ratio)] = True
+        return mask
+
+    # --- BANGUN ---
+    @classmethod
+    def from_frames(cls, frames):
+        # frames: {ticker: DataFrame OHLCV bersih}. Ticker dengan histori
+        # <= WARMUP_ROWS bar dilewati.
+        frames = {t: df for t, df in frames.items() if len(df) > WARMUP_ROWS}
+        blocks = {}
+        for group in _calendar_groups(frames):
+            cols = [np.column_stack([frames[t][c].to_numpy(np.float64) for t in group])
+                    for c in ("Close", "High", "Low", "Open", "Volume")]
+            features = compute_feature_array(*cols)
+            dates = frames[group[0]].index.as_unit("ns").asi8
+            for j, t in enumerate(group):
+                f = features[:, j]
+                keep = np.isfinite(f).all(axis=1)
+                keep[:WARMUP_ROWS] = False
+                blocks[t] = (f[keep], cols[0][keep, j], dates[keep])
+
+        tickers = [t for t in frames if t in blocks and len(blocks[t][1])]
+        sizes = np.array([len(blocks[t][1]) for t in tickers], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        if not tickers:
+            empty = np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float32)
+            return cls([], empty, np.empty(0), np.empty(0, np.int64), np.empty(0, np.int32), offsets)
+        return cls(
+            tickers,
+            np.concatenate([blocks[t][0] for t in tickers]).astype(np.float32),
+            np.concatenate([blocks[t][1] for t in tickers]),
+            np.concatenate([blocks[t][2] for t in tickers]),
+            np.repeat(np.arange(len(tickers), dtype=np.int32), sizes),
+            offsets,
+        )
+
+    @classmethod
+    def from_store(cls, store, tickers):
+        return cls.from_frames({t: store.read(t) for t in tickers if store.has(t)})
+
+    # --- SIMPAN / BUKA ---
+    def save(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(folder, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(folder, "tickers.json"), "w") as f:
+            json.dump({"tickers": self.tickers, "feature_columns": FEATURE_COLUMNS}, f)
+
+    @classmethod
+    def load(cls, folder, mmap_mode="r"):
+        with open(os.path.join(folder, "tickers.json")) as f:
+            meta = json.load(f)
+        if meta["feature_columns"] != FEATURE_COLUMNS:
+            raise ValueError("Urutan fitur panel berbeda dengan FEATURE_COLUMNS; bangun ulang panel.")
+        arrays = [np.load(os.path.join(folder, f"{name}.npy"), mmap_mode=mmap_mode) for name in _ARRAYS]
+        return cls(meta["tickers"], *arrays)
+
+
+def _calendar_groups(frames):
+    # Kelompokkan ticker yang index tanggalnya identik
+    groups = {}
+    for t, df in frames.items():
+        key = (len(df), df.index[0], df.index[-1])
+        for members in groups.setdefault(key, []):
+            if frames[members[0]].index.equals(df.index):
+                members.append(t)
+                break
+        else:
+            groups[key].append([t])
+    return [members for bucket in groups.values() for members in bucket]
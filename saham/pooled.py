@@ -0,0 +1,238 @@
+"""Model pooled: satu Random Forest untuk seluruh universe ticker.
+
+Alternatif dari satu forest + satu scaler per bank. Setiap ticker tetap
+punya normalisasi MinMax sendiri atas SCALER_COLUMNS, sehingga fitur dan
+target semua ticker berada di rentang ~[0, 1] dan satu forest bisa belajar
+pola bersama. Min/max di-fit hanya pada baris train ticker itu: rentang
+harga periode test tidak bocor ke scaling, jadi metrik test jujur dan
+harga di luar rentang train terlihat (> 1) seperti saat produksi.
+Prediksi dikembalikan ke Rupiah dengan scaler ticker masing-masing.
+
+PooledModel.assets(ticker) mengembalikan (forest bersama, BundleScaler
+ticker) sehingga predict_batch menumpuk semua ticker ke satu panggilan
+predict. Artefak disimpan tanpa pickle:
+    Models/Pooled/forest.npz    forest terkompilasi (save_compiled)
+    Models/Pooled/scalers.npz   data_min / data_max per ticker (n, 21)
+    Models/Pooled/meta.json     ticker, parameter, metrik
+    Models/Pooled/drift_reference.json
+                                referensi drift per ticker (saham.drift) dari
+                                baris train ter-scaling, dibaca terpisah agar
+                                app tidak memuatnya saat start
+
+Latih: python -m saham.pooled [--tickers ...] [--sector Perbankan] [--refresh] [--out Models/Pooled]
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from saham.bundle import BundleScaler
+from saham.compiled_forest import compile_forest, load_compiled, save_compiled
+from saham.indicators import FEATURE_COLUMNS, SCALER_COLUMNS
+
+# sklearn (lewat saham.training) hanya diimpor saat melatih; app cukup
+# memuat forest terkompilasi
+POOLED_DIR = "Models/Pooled"
+REFERENCE_FILE = "drift_reference.json"
+
+
+class PooledModel:
+
+    def __init__(self, forest, tickers, data_min, data_max, params=None, metrics=None, references=None):
+        self.forest = forest
+        self.tickers = list(tickers)
+        self.index = {t: i for i, t in enumerate(self.tickers)}
+        self.data_min = np.asarray(data_min, dtype=np.float64)
+        self.data_max = np.asarray(data_max, dtype=np.float64)
+        self.params = params or {}
+        self.metrics = metrics or {}
+        self.references = references or {}
+        self._scalers = {}
+
+    def __contains__(self, ticker):
+        return ticker in self.index
+
+    @property
+    def nbytes(self):
+        return self.forest.nbytes + self.data_min.nbytes + self.data_max.nbytes
+
+    def scaler(self, ticker):
+        if ticker not in self._scalers:
+            i = self.index[ticker]
+            scale = _scale(self.data_min[i], self.data_max[i])
+            self._scalers[ticker] = BundleScaler(
+                scale, -self.data_min[i] * scale, self.data_min[i], self.data_max[i],
+                np.array(SCALER_COLUMNS, dtype=object),
+            )
+        return self._scalers[ticker]
+
+    def assets(self, ticker):
+        # (forest bersama, scaler ticker) untuk predict_batch
+        return self.forest, self.scaler(ticker)
+
+
+def _scale(data_min, data_max):
+    # Seperti MinMaxScaler: rentang nol dianggap 1 agar tidak membagi nol
+    span = data_max - data_min
+    span = np.where(span == 0, 1.0, span)
+    return 1.0 / span
+
+
+def panel_minmax(panel, rows=None):
+    # data_min / data_max per ticker atas [Close] + fitur, bentuk (n, 21).
+    # rows: mask baris yang dipakai (mis. train_mask); ticker tanpa baris
+    # terpilih memakai seluruh barisnya.
+    values = np.column_stack([panel.close, panel.X])
+    starts = panel.offsets[:-1]
+    data_min = np.minimum.reduceat(values, starts, axis=0)
+    data_max = np.maximum.reduceat(values, starts, axis=0)
+    if rows is not None:
+        picked = rows[:, None]
+        lo = np.minimum.reduceat(np.where(picked, values, np.inf), starts, axis=0)
+        hi = np.maximum.reduceat(np.where(picked, values, -np.inf), starts, axis=0)
+        empty = ~np.logical_or.reduceat(rows, starts)
+        data_min = np.where(empty[:, None], data_min, lo)
+        data_max = np.where(empty[:, None], data_max, hi)
+    return data_min, data_max
+
+
+def scale_panel(panel, data_min, data_max):
+    tid = panel.ticker_id
+    values = np.column_stack([panel.close, panel.X])
+    return (values - data_min[tid]) * _scale(data_min, data_max)[tid]
+
+
+def default_params(path=None, ticker="BBCA"):
+    # best_params hasil tuning satu bank sebagai titik awal forest pooled
+    from saham.training import BASELINE_PARAMS, SUMMARY_FILE
+
+    path = path or SUMMARY_FILE
+    if os.path.exists(path):
+        with open(path) as f:
+            params = json.load(f).get(ticker, {}).get("tuning_results", {}).get("best_params")
+        if params:
+            return params
+    return dict(BASELINE_PARAMS)
+
+
+# --- LATIH ---
+def fit_pooled(panel, params=None, train_ratio=None, random_state=None, n_jobs=1):
+    # Split kronologis per ticker; scaler di-fit pada baris train saja,
+    # metrik test dihitung dalam Rupiah. Default train_ratio / random_state
+    # sama dengan saham.training.
+    from sklearn.ensemble import RandomForestRegressor
+    from saham.drift import reference_stats
+    from saham.training import RANDOM_STATE, TRAIN_RATIO, regression_metrics
+
+    train_ratio = TRAIN_RATIO if train_ratio is None else train_ratio
+    random_state = RANDOM_STATE if random_state is None else random_state
+    if not panel.tickers:
+        raise ValueError("Panel kosong: tidak ada ticker dengan histori cukup.")
+    params = dict(params or default_params())
+    train = panel.train_mask(train_ratio)
+    data_min, data_max = panel_minmax(panel, train)
+    scaled = scale_panel(panel, data_min, data_max)
+
+    t0 = time.perf_counter()
+    model = RandomForestRegressor(random_state=random_state, n_jobs=n_jobs, **params)
+    model.fit(scaled[train, 1:], scaled[train, 0])
+    fit_seconds = time.perf_counter() - t0
+    model.feature_names_in_ = np.array(FEATURE_COLUMNS, dtype=object)
+    forest = compile_forest(model)
+
+    test = ~train
+    tid = panel.ticker_id[test]
+    y_scaled = forest.predict(scaled[test, 1:])
+    y_pred = y_scaled / _scale(data_min[:, 0], data_max[:, 0])[tid] + data_min[tid, 0]
+    y_true = np.asarray(panel.close[test])
+    metrics = {
+        "test": regression_metrics(y_true, y_pred),
+        "rows": {"train": int(train.sum()), "test": int(test.sum())},
+        "fit_seconds": fit_seconds,
+    }
+    metrics["test_mape_per_ticker"] = {
+        t: float(np.mean(np.abs((y_true[tid == i] - y_pred[tid == i]) / y_true[tid == i])) * 100)
+        for i, t in enumerate(panel.tickers) if (tid == i).any()
+    }
+    references = {}
+    for i, t in enumerate(panel.tickers):
+        block = slice(panel.offsets[i], panel.offsets[i + 1])
+        rows = train[block]
+        if rows.sum() > 1:
+            references[t] = reference_stats(scaled[block][rows], data_min[i], data_max[i], panel.dates[block][rows][-1])
+    return PooledModel(forest, panel.tickers, data_min, data_max, params, metrics, references)
+
+
+# --- SIMPAN / MUAT ---
+def save_pooled(pooled, folder=POOLED_DIR):
+    os.makedirs(folder, exist_ok=True)
+    save_compiled(pooled.forest, os.path.join(folder, "forest.npz"))
+    np.savez(os.path.join(folder, "scalers.npz"), data_min=pooled.data_min, data_max=pooled.data_max)
+    meta = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "tickers": pooled.tickers,
+        "feature_columns": FEATURE_COLUMNS,
+        "scaler_columns": SCALER_COLUMNS,
+        "params": pooled.params,
+        "metrics": pooled.metrics,
+    }
+    with open(os.path.join(folder, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=4)
+    with open(os.path.join(folder, REFERENCE_FILE), "w") as f:
+        json.dump(pooled.references, f)
+    return folder
+
+
+def load_pooled(folder=POOLED_DIR):
+    # None bila belum pernah dilatih
+    meta_path = os.path.join(folder, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta["feature_columns"] != FEATURE_COLUMNS or meta["scaler_columns"] != SCALER_COLUMNS:
+        raise ValueError("Model pooled memakai urutan fitur lama; latih ulang dengan python -m saham.pooled.")
+    with np.load(os.path.join(folder, "scalers.npz")) as data:
+        data_min, data_max = data["data_min"], data["data_max"]
+    forest = load_compiled(os.path.join(folder, "forest.npz"))
+    return PooledModel(forest, meta["tickers"], data_min, data_max, meta["params"], meta["metrics"])
+
+
+def main(argv=None):
+    from saham.data import RAW_DIR
+    from saham.panel import Panel
+    from saham.price_store import STORE_DIR, YahooFetcher, open_store
+    from saham.universe import tickers as universe_tickers
+
+    parser = argparse.ArgumentParser(description="Latih satu model Random Forest pooled untuk universe ticker.")
+    parser.add_argument("--tickers", nargs="+", default=None, help="Default: seluruh Data/universe.csv")
+    parser.add_argument("--sector", default=None)
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--refresh", action="store_true", help="Unduh bar baru dari Yahoo sebelum melatih")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--out", default=POOLED_DIR)
+    args = parser.parse_args(argv)
+
+    tickers = args.tickers or universe_tickers(args.sector)
+    store = open_store(args.store, tickers, args.raw_dir)
+    if args.refresh:
+        fetcher = YahooFetcher()
+        for t in tickers:
+            store.refresh(t, fetcher)
+    t0 = time.perf_counter()
+    panel = Panel.from_store(store, tickers)
+    print(f"Panel: {len(panel.tickers)}/{len(tickers)} ticker, {panel.n_rows:,} baris, "
+          f"{panel.nbytes / 2**20:.1f} MiB, {time.perf_counter() - t0:.2f}s")
+    pooled = fit_pooled(panel, n_jobs=args.n_jobs)
+    save_pooled(pooled, args.out)
+    test = pooled.metrics["test"]
+    print(f"Fit {pooled.metrics['fit_seconds']:.1f}s | test MAPE {test['mape']:.2f}% R² {test['r2']:.4f} | "
+          f"forest {pooled.forest.nbytes / 2**20:.1f} MiB -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
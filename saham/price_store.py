@@ -0,0 +1,231 @@
+"""Penyimpanan OHLCV kolumnar lokal per ticker dengan append inkremental.
+
+Struktur folder (satu direktori per ticker):
+    Data/Store/BBCA/Date.i64      datetime64[ns] sebagai int64
+    Data/Store/BBCA/Close.f64     float64, satu file per kolom
+    ...
+    Data/Store/BBCA/meta.json     jumlah baris valid + tanggal terakhir
+
+File kolom hanya di-append lalu meta.json ditulis ulang, sehingga baris yang
+belum tercatat di meta (mis. proses terhenti di tengah) diabaikan dan
+dipotong pada append berikutnya. Pembacaan memakai np.memmap dan slicing
+rentang tanggal lewat searchsorted, tanpa parsing CSV.
+
+Bar terakhir yang tersimpan bisa belum final (refresh di tengah sesi
+menyimpan Close/Volume sementara), jadi refresh selalu mengambil ulang mulai
+tanggal terakhir dan append menimpa baris bertanggal sama di tempat.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from saham import trace
+from saham.data import BANKS, PRICE_COLUMNS, RAW_DIR, clean_ohlcv, load_raw_csv
+
+STORE_DIR = "Data/Store"
+STORE_VERSION = 1
+_DATE_FILE = "Date.i64"
+_META_FILE = "meta.json"
+
+
+# --- FETCHER (DAPAT DIGANTI) ---
+class YahooFetcher:
+    # fetch(ticker, start, end) -> DataFrame OHLCV, `end` eksklusif
+
+    def __init__(self, suffix=".JK", interval="1d"):
+        self.suffix = suffix
+        self.interval = interval
+
+    def __call__(self, ticker, start, end):
+        import yfinance as yf
+
+        with trace.span("market.download", ticker=ticker):
+            data = yf.download(f"{ticker}{self.suffix}", start=start, end=end,
+                               interval=self.interval, progress=False, auto_adjust=False)
+        if data is None or data.empty:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        return clean_ohlcv(data)
+
+
+class FakeFetcher:
+    # Pengganti offline: menyajikan bar dari DataFrame yang diberikan
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = 0
+
+    def __call__(self, ticker, start, end):
+        self.calls += 1
+        df = self.frames.get(ticker)
+        if df is None:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        return df.loc[(df.index >= start) & (df.index < end), PRICE_COLUMNS]
+
+
+# --- STORE ---
+class PriceStore:
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self._maps = {}
+        # Prefetcher dan sesi Streamlit bisa me-refresh ticker yang sama;
+        # kunci per ticker agar ticker berbeda tetap bisa di-refresh paralel
+        self._lock = threading.Lock()
+        self._ticker_locks = {}
+        # Statistik refresh terakhir per ticker: baris & byte yang diambil
+        self.last_refresh = {}
+
+    def _ticker_lock(self, ticker):
+        with self._lock:
+            return self._ticker_locks.setdefault(ticker, threading.RLock())
+
+    def _dir(self, ticker):
+        return os.path.join(self.root, ticker)
+
+    def _meta_path(self, ticker):
+        return os.path.join(self._dir(ticker), _META_FILE)
+
+    def meta(self, ticker):
+        path = self._meta_path(ticker)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def has(self, ticker):
+        return self.meta(ticker) is not None
+
+    def rows(self, ticker):
+        meta = self.meta(ticker)
+        return meta["rows"] if meta else 0
+
+    def last_date(self, ticker):
+        meta = self.meta(ticker)
+        return pd.Timestamp(meta["last_date"]) if meta and meta["rows"] else None
+
+    def _columns(self, ticker):
+        # Memmap dibuka sekali lalu dipakai ulang sampai ada append
+        meta = self.meta(ticker)
+        if meta is None or meta["rows"] == 0:
+            return None
+        cached = self._maps.get(ticker)
+        if cached is not None and cached[0] == meta["rows"]:
+            return cached[1]
+        n = meta["rows"]
+        folder = self._dir(ticker)
+        maps = {"Date": np.memmap(os.path.join(folder, _DATE_FILE), dtype=np.int64, mode="r", shape=(n,))}
+        for col in PRICE_COLUMNS:
+            maps[col] = np.memmap(os.path.join(folder, f"{col}.f64"), dtype=np.float64, mode="r", shape=(n,))
+        self._maps[ticker] = (n, maps)
+        return maps
+
+    def read(self, ticker, start=None, end=None):
+        # Slice rentang tanggal [start, end] (inklusif) tanpa parsing CSV
+        maps = self._columns(ticker)
+        if maps is None:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        dates = maps["Date"]
+        lo = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).value, side="left"))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, pd.Timestamp(end).value, side="right"))
+        index = pd.DatetimeIndex(np.asarray(dates[lo:hi]).view("datetime64[ns]"), name="Date")
+        return pd.DataFrame({col: np.array(maps[col][lo:hi]) for col in PRICE_COLUMNS}, index=index)
+
+    def tail(self, ticker, n):
+        maps = self._columns(ticker)
+        if maps is None:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        start = maps["Date"][max(0, len(maps["Date"]) - n)]
+        return self.read(ticker, start=pd.Timestamp(int(start)))
+
+    def append(self, ticker, df):
+        # Tambahkan bar yang lebih baru dari tanggal terakhir tersimpan; bar
+        # bertanggal sama dengan bar terakhir menimpanya. Return jumlah baris
+        # yang ditulis (baris terakhir dihitung hanya bila nilainya berubah).
+        if df is None or df.empty:
+            return 0
+        with self._ticker_lock(ticker):
+            return self._append(ticker, df)
+
+    def _append(self, ticker, df):
+        df = clean_ohlcv(df).sort_index()
+        df = df[~df.index.duplicated(keep="last")]
+        last = self.last_date(ticker)
+        n = self.rows(ticker)
+        start = n
+        if last is not None:
+            df = df[df.index >= last]
+            if len(df) and df.index[0] == last:
+                stored = self.read(ticker, start=last).iloc[-1]
+                if np.array_equal(stored[PRICE_COLUMNS].to_numpy(np.float64), df[PRICE_COLUMNS].iloc[0].to_numpy(np.float64)):
+                    df = df.iloc[1:]
+                else:
+                    start = n - 1
+        if df.empty:
+            return 0
+
+        folder = self._dir(ticker)
+        os.makedirs(folder, exist_ok=True)
+        dates = pd.DatetimeIndex(df.index).as_unit("ns").asi8.astype(np.int64)
+        self._write_file(os.path.join(folder, _DATE_FILE), dates, n, start)
+        for col in PRICE_COLUMNS:
+            self._write_file(os.path.join(folder, f"{col}.f64"), df[col].to_numpy(np.float64), n, start)
+
+        meta = {
+            "version": STORE_VERSION,
+            "ticker": ticker,
+            "rows": start + len(df),
+            "columns": PRICE_COLUMNS,
+            "last_date": df.index[-1].isoformat(),
+        }
+        tmp = self._meta_path(ticker) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path(ticker))
+        self._maps.pop(ticker, None)
+        return len(df)
+
+    @staticmethod
+    def _write_file(path, values, valid_rows, start):
+        # Tulis mulai baris `start` (<= valid_rows). File tidak pernah lebih
+        # pendek dari valid_rows, jadi meta lama tetap terbaca bila terhenti.
+        with open(path, "r+b" if os.path.exists(path) else "w+b") as f:
+            # Buang sisa tulisan yang belum tercatat di meta.json
+            f.truncate(valid_rows * values.itemsize)
+            f.seek(start * values.itemsize)
+            f.write(np.ascontiguousarray(values).tobytes())
+
+    def seed_from_raw(self, ticker, raw_dir=RAW_DIR):
+        if self.has(ticker):
+            return 0
+        return self.append(ticker, load_raw_csv(ticker, raw_dir))
+
+    def refresh(self, ticker, fetcher, today=None):
+        # Ambil bar sejak tanggal terakhir tersimpan (termasuk, agar bar sesi
+        # berjalan yang tersimpan sebagian diperbarui)
+        today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+        with self._ticker_lock(ticker):
+            return self._refresh(ticker, fetcher, today)
+
+    def _refresh(self, ticker, fetcher, today):
+        last = self.last_date(ticker)
+        start = today - pd.Timedelta(days=365) if last is None else last.normalize()
+        end = today + pd.Timedelta(days=1)
+        if start >= end:
+            self.last_refresh[ticker] = {"rows": 0, "bytes": 0, "fetched": False}
+            return 0
+        fetched = fetcher(ticker, start, end)
+        payload = 0 if fetched is None else int(fetched.memory_usage(index=True).sum())
+        added = self.append(ticker, fetched)
+        self.last_refresh[ticker] = {"rows": added, "bytes": payload, "fetched": True}
+        return added
+
+
+def open_store(root=STORE_DIR, tickers=BANKS, raw_dir=RAW_DIR):
+    # Store siap pakai: ticker yang belum ada di-seed dari Data/Raw
+    store = PriceStore(root)
+    for ticker in tickers:
+        store.seed_from_raw(ticker, raw_dir)
+    return store
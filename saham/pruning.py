@@ -0,0 +1,130 @@
+"""Pruning fitur: set fitur minimal per bank atau satu set untuk sektor.
+
+Urutan kandidat diambil dari laporan importance yang sudah ada
+(Feature_Importance/<bank>_feature_importance.csv, atau kolom Average
+aggregated_feature_importance.csv untuk mode sektor); bila laporan belum
+ada dipakai feature_importances_ model penuh. Seleksi hanya melihat data
+train (20% bagian akhirnya menjadi validasi), data test tidak disentuh:
+1. Prefix ranking terpendek dengan importance kumulatif >= threshold.
+2. Cek permutasi: fitur di luar prefix yang bila diacak menurunkan R²
+   validasi model penuh > perm_tolerance (rata-rata lintas bank pada mode
+   sektor) dikembalikan.
+3. Model dilatih ulang pada set tersebut; selama R² validasi turun lebih
+   dari tolerance (di bank mana pun), fitur berikutnya dari ranking
+   ditambahkan.
+
+Model hasil pruning menyimpan feature_names_in_ subset FEATURE_COLUMNS;
+inferensi (saham.inference) otomatis hanya menghitung indikator itu.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.inspection import permutation_importance
+from sklearn.metrics import r2_score
+
+from saham.indicators import FEATURE_COLUMNS
+
+IMPORTANCE_DIR = "Feature_Importance"
+PRUNE_THRESHOLD = 0.90
+R2_TOLERANCE = 0.005
+# Penurunan R² permutasi antar ulangan bergeser ~0.001; di bawah ini dianggap noise
+PERMUTATION_TOLERANCE = 0.002
+PERMUTATION_REPEATS = 5
+VALIDATION_RATIO = 0.2
+
+
+# --- RANKING DARI LAPORAN IMPORTANCE ---
+def importance_ranking(bank=None, folder=IMPORTANCE_DIR):
+    # bank=None -> ranking sektor (rata-rata lintas bank). Return list
+    # (fitur, importance) menurun, atau None bila laporan tidak ada.
+    if bank is None:
+        path, column = os.path.join(folder, "aggregated_feature_importance.csv"), "Average"
+    else:
+        path, column = os.path.join(folder, f"{bank}_feature_importance.csv"), "Importance"
+    if not os.path.exists(path):
+        return None
+    table = pd.read_csv(path)
+    lookup = dict(zip(table["Feature"], table[column]))
+    if set(lookup) != set(FEATURE_COLUMNS):
+        return None
+    return sorted(((f, float(v)) for f, v in lookup.items()), key=lambda item: -item[1])
+
+
+def minimal_prefix(ranking, threshold=PRUNE_THRESHOLD):
+    # Fitur teratas sampai importance kumulatif >= threshold
+    total = sum(v for _, v in ranking) or 1.0
+    selected, cumulative = [], 0.0
+    for feature, value in ranking:
+        selected.append(feature)
+        cumulative += value / total
+        if cumulative >= threshold:
+            break
+    return selected
+
+
+def _ordered(features):
+    return [f for f in FEATURE_COLUMNS if f in set(features)]
+
+
+def _fit(X, y, features, params, random_state, n_jobs):
+    model = RandomForestRegressor(random_state=random_state, n_jobs=n_jobs, **params)
+    model.fit(X[features], y)
+    return model
+
+
+# --- SELEKSI ---
+def select_features(datasets, params, ranking=None, threshold=PRUNE_THRESHOLD, tolerance=R2_TOLERANCE,
+                    perm_tolerance=PERMUTATION_TOLERANCE, random_state=42, n_jobs=1):
+    # datasets: {bank: (X_train DataFrame FEATURE_COLUMNS, y_train)} hasil
+    # prepare_dataset; satu bank = mode per bank, beberapa = mode sektor.
+    splits, full = {}, {}
+    for bank, (X, y) in datasets.items():
+        n_fit = int(len(X) * (1 - VALIDATION_RATIO))
+        splits[bank] = (X.iloc[:n_fit], y.iloc[:n_fit], X.iloc[n_fit:], y.iloc[n_fit:])
+        X_fit, y_fit, X_val, y_val = splits[bank]
+        model = _fit(X_fit, y_fit, FEATURE_COLUMNS, params, random_state, n_jobs)
+        full[bank] = (model, r2_score(y_val, model.predict(X_val)))
+
+    if ranking is None:
+        mean = np.mean([m.feature_importances_ for m, _ in full.values()], axis=0)
+        ranking = sorted(zip(FEATURE_COLUMNS, mean), key=lambda item: -item[1])
+    order = [f for f, _ in ranking]
+    selected = minimal_prefix(ranking, threshold)
+    n_prefix = len(selected)
+
+    drops = []
+    for bank, (model, _) in full.items():
+        _, _, X_val, y_val = splits[bank]
+        perm = permutation_importance(model, X_val, y_val, n_repeats=PERMUTATION_REPEATS,
+                                      random_state=random_state, n_jobs=n_jobs)
+        drops.append(perm.importances_mean)
+    drop = dict(zip(FEATURE_COLUMNS, np.mean(drops, axis=0)))
+    restored = [f for f in order if f not in selected and drop[f] > perm_tolerance]
+    selected += restored
+
+    while True:
+        features = _ordered(selected)
+        scores = {}
+        for bank, (X_fit, y_fit, X_val, y_val) in splits.items():
+            model = _fit(X_fit, y_fit, features, params, random_state, n_jobs)
+            scores[bank] = {"full": float(full[bank][1]), "pruned": float(r2_score(y_val, model.predict(X_val[features])))}
+        worst = max(s["full"] - s["pruned"] for s in scores.values())
+        remaining = [f for f in order if f not in selected]
+        if worst <= tolerance or not remaining:
+            break
+        selected.append(remaining[0])
+
+    return {
+        "features": features,
+        "n_features": len(features),
+        "prefix": n_prefix,
+        "restored_by_permutation": restored,
+        "permutation_drop": {f: float(v) for f, v in drop.items()},
+        "added_for_r2": len(selected) - n_prefix - len(restored),
+        "threshold": threshold,
+        "tolerance": tolerance,
+        "val_r2": scores,
+        "ranking": order,
+    }
@@ -0,0 +1,514 @@
+"""Layanan prediksi headless (HTTP lokal + CLI), terlepas dari app.py.
+
+* Predictor: model & scaler dimuat sekali lalu disimpan selama proses hidup
+  (bundle mmap bila ada, selain itu .pkl dikompilasi, selain itu forest
+  pooled + scaler ticker seperti app). Ticker tanpa model dijawab error
+  tanpa fetch data.
+* MicroBatcher (asyncio): ticker dari permintaan yang datang bersamaan
+  dikumpulkan selama `max_wait_ms` (atau sampai `max_batch`) lalu diskor
+  dengan satu predict_batch di thread skoring khusus, sehingga event loop
+  tetap melayani koneksi lain. Bila skoring batch gagal, ticker diskor ulang
+  satu per satu agar error hanya mengenai ticker penyebabnya.
+* Data 60 bar diambil per ticker di thread pool fetch terpisah, jadi fetch
+  yang lambat hanya menahan permintaan yang butuh ticker tersebut dan tidak
+  pernah mengantre di depan skoring.
+* HTTP/1.1 minimal berbasis asyncio streams (keep-alive), tanpa dependensi
+  tambahan:
+      GET  /health
+      GET  /metrics   (teks Prometheus; span per tahap bila --trace)
+      GET  /predict?tickers=BBCA,BBRI
+      POST /predict   {"tickers": ["BBCA", "BBRI"]}
+      GET  /drift     (ringkasan drift fitur per ticker, bila --drift)
+  Ticker di luar registry universe (Data/universe.csv) ditolak dengan 400
+  sebelum ada fetch, pembuatan direktori store, atau pemuatan .pkl;
+  kesalahan tak terduga saat skoring dijawab 500.
+* --drift: bar baru dari setiap window yang diskor masuk ke DriftMonitor
+  (saham.drift, state sendiri di Models/drift_state_service.npz agar tidak
+  menimpa state app); --retrain menjalankan retrain saat ambang drift
+  terlewati. Setelah job retrain selesai, referensi drift dimuat ulang dan
+  model/bundle dibuka kembali sehingga permintaan berikutnya memakai model
+  baru. State drift ditulis berkala (DRIFT_SAVE_SECONDS) di luar thread
+  skoring, bukan per batch.
+
+Jalankan: python -m saham.service serve [--port 8000] [--offline] [--trace] [--drift [--retrain]]
+          python -m saham.service predict BBCA BBRI [--offline]
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from saham import trace
+from saham.bundle import BundleError, open_bundle
+from saham.data import BANKS
+from saham.inference import load_assets, model_columns, predict_batch
+from saham.market_cache import FetchError, MarketDataCache, store_loader
+from saham.pooled import POOLED_DIR, load_pooled
+from saham.price_store import YahooFetcher, open_store
+from saham.universe import tickers as universe_tickers
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+MAX_BATCH = 64
+MAX_WAIT_MS = 2.0
+FETCH_WORKERS = 32
+WINDOW_BARS = 60
+_MAX_BODY = 1 << 16
+DRIFT_STATE = "Models/drift_state_service.npz"
+DRIFT_SAVE_SECONDS = 30.0
+
+
+# --- SUMBER DATA ---
+def live_window_source(store=None, cache=None):
+    # Sama dengan app: cache bersama + refresh store, fallback histori lokal
+    store = store or open_store()
+    cache = cache or MarketDataCache(store_loader(store, YahooFetcher()))
+
+    def window(ticker):
+        try:
+            return cache.get(ticker, "1d", f"{WINDOW_BARS}d")
+        except FetchError:
+            return store.tail(ticker, WINDOW_BARS)
+    return window
+
+
+def offline_window_source(store=None):
+    store = store or open_store()
+    return lambda ticker: store.tail(ticker, WINDOW_BARS)
+
+
+# --- MODEL ---
+class Predictor:
+    # assets: {ticker: (model, scaler)} yang sudah dimuat (mis. untuk uji);
+    # pooled: PooledModel, atau pooled_dir untuk dimuat saat pertama dibutuhkan
+
+    def __init__(self, window_source, assets=None, bundle=None, drift=None, retrain=None, pooled=None,
+                 pooled_dir=None):
+        self.window_source = window_source
+        self.assets = dict(assets or {})
+        self.bundle = bundle
+        self.drift = drift
+        self.retrain = retrain
+        self.pooled = pooled
+        self.pooled_dir = pooled_dir
+        self._pooled_loaded = pooled is not None or pooled_dir is None
+        self.drift_dirty = False
+        self.model_calls = 0
+
+    def pooled_model(self):
+        if not self._pooled_loaded:
+            self._pooled_loaded = True
+            try:
+                self.pooled = load_pooled(self.pooled_dir)
+            except (OSError, ValueError):
+                self.pooled = None
+        return self.pooled
+
+    def load(self, ticker):
+        if ticker not in self.assets:
+            model = scaler = None
+            if self.bundle is not None and ticker in self.bundle:
+                try:
+                    model, scaler = self.bundle.assets(ticker)
+                except BundleError:
+                    model = None
+            if model is None:
+                model, scaler = load_assets(ticker, compiled=True)
+            if model is None:
+                # Tanpa model per bank: forest pooled + scaler ticker ini
+                pooled = self.pooled_model()
+                if pooled is not None and ticker in pooled:
+                    model, scaler = pooled.assets(ticker)
+            if model is None:
+                # Tidak di-cache: model yang baru dilatih / di-pull tetap terbaca berikutnya
+                return None, None
+            self.assets[ticker] = (model, scaler)
+        return self.assets[ticker]
+
+    def score(self, windows):
+        # windows: {ticker: DataFrame}; satu predict_batch untuk semua ticker
+        assets = {t: self.load(t) for t in windows}
+        self.model_calls += 1
+        frame = predict_batch(assets, windows)
+        if self.drift is not None:
+            self.observe(windows, assets)
+        return frame
+
+    def reload(self):
+        # Model dilatih ulang: lupakan aset termuat, buka ulang bundle (sumber
+        # .pkl yang berubah ditolak, lalu .pkl dimuat), reset drift bila referensi baru
+        self.assets.clear()
+        if self.pooled_dir is not None:
+            self.pooled, self._pooled_loaded = None, False
+        if self.bundle is not None:
+            try:
+                self.bundle = open_bundle(self.bundle.path)
+            except BundleError:
+                self.bundle = None
+        if self.drift is not None:
+            self.drift.refresh_references()
+
+    def observe(self, windows, assets):
+        # Hanya window dengan bar baru yang dihitung ulang; state hanya ditandai
+        # berubah, penulisan file lewat save_drift() di luar jalur permintaan
+        if self.retrain is not None and self.retrain.poll():
+            self.reload()
+            self.drift_dirty = True
+        with trace.span("drift.observe"):
+            added = self.drift.observe_windows(windows)
+        if added:
+            if self.retrain is not None:
+                features = {t: model_columns(m) for t, (m, _) in assets.items() if m is not None}
+                self.retrain.check(features=features)
+            self.drift_dirty = True
+
+    def save_drift(self):
+        # Return True bila state ditulis
+        if self.drift is None or not self.drift_dirty:
+            return False
+        self.drift_dirty = False
+        self.drift.save()
+        return True
+
+    def predict(self, tickers):
+        windows = {t: self.window_source(t) for t in dict.fromkeys(tickers)}
+        return _records(self.score(windows), tickers)
+
+
+def _records(frame, tickers):
+    out = []
+    for ticker in tickers:
+        row = frame.loc[ticker]
+        if row["last_date"] is None or not np.isfinite(row["pred_next"]):
+            out.append({"ticker": ticker, "error": "model atau data tidak tersedia"})
+            continue
+        out.append({
+            "ticker": ticker,
+            "last_date": str(row["last_date"])[:10],
+            "last_close": float(row["last_close"]),
+            "pred_today": float(row["pred_today"]),
+            "pred_next": float(row["pred_next"]),
+        })
+    return out
+
+
+# --- MICRO-BATCHING ---
+class MicroBatcher:
+
+    def __init__(self, predictor, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1e3
+        self._queue = asyncio.Queue()
+        self._task = None
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score")
+        self.batches = 0
+        self.items = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, ticker, window):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((ticker, window, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Ticker sama dalam satu batch cukup diskor sekali (data terbaru)
+            windows = {ticker: window for ticker, window, _ in batch}
+            outcome = await self._score(loop, windows)
+            self.batches += 1
+            self.items += len(batch)
+            for ticker, _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(outcome[ticker], Exception):
+                    future.set_exception(outcome[ticker])
+                else:
+                    future.set_result(_records(outcome[ticker], [ticker])[0])
+
+    async def _score(self, loop, windows):
+        # {ticker: frame atau exception}; batch gagal -> skor ulang per ticker
+        try:
+            frame = await loop.run_in_executor(self._pool, self.predictor.score, windows)
+            return dict.fromkeys(windows, frame)
+        except Exception as exc:
+            if len(windows) == 1:
+                return dict.fromkeys(windows, exc)
+        outcome = {}
+        for ticker, window in windows.items():
+            try:
+                outcome[ticker] = await loop.run_in_executor(self._pool, self.predictor.score, {ticker: window})
+            except Exception as exc:
+                outcome[ticker] = exc
+        return outcome
+
+    def stats(self):
+        return {"batches": self.batches, "items": self.items,
+                "avg_batch": self.items / self.batches if self.batches else 0.0}
+
+
+class BadRequest(Exception):
+    pass
+
+
+class PredictionService:
+    # universe: ticker yang boleh diminta (default registry saham.universe)
+
+    def __init__(self, predictor, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, fetch_workers=FETCH_WORKERS,
+                 universe=None):
+        self.predictor = predictor
+        self.universe = set(universe_tickers() if universe is None else universe)
+        self.batcher = MicroBatcher(predictor, max_batch, max_wait_ms)
+        self.requests = 0
+        self._fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="fetch")
+        self._save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="drift-save")
+        self._saver = None
+        trace.register_collector("service", self.stats)
+
+    async def predict(self, tickers):
+        self.batcher.start()
+        self.requests += 1
+
+        loop = asyncio.get_running_loop()
+
+        async def one(ticker):
+            # Model dimuat dulu: ticker tanpa model tidak memicu fetch / refresh store
+            model, _ = await loop.run_in_executor(self._fetch_pool, self.predictor.load, ticker)
+            if model is None:
+                return {"ticker": ticker, "error": "model atau data tidak tersedia"}
+            window = await loop.run_in_executor(self._fetch_pool, self.predictor.window_source, ticker)
+            return await self.batcher.submit(ticker, window)
+        return await asyncio.gather(*(one(t) for t in tickers))
+
+    def stats(self):
+        return {"requests": self.requests, "model_calls": self.predictor.model_calls, **self.batcher.stats()}
+
+    # --- HTTP ---
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except BadRequest as exc:
+                    # Panjang body tidak diketahui: jawab 400 lalu tutup koneksi
+                    _write_response(writer, 400, {"error": str(exc)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, payload = await self._route(method, target, body)
+                except Exception as exc:
+                    status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if isinstance(payload, str):
+                    _write_response(writer, status, payload, keep_alive, "text/plain; version=0.0.4")
+                else:
+                    _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, {"status": "ok", **self.stats()}
+        if url.path == "/metrics":
+            return 200, trace.prometheus()
+        if url.path == "/drift":
+            if self.predictor.drift is None:
+                return 404, {"error": "pemantauan drift tidak aktif (jalankan dengan --drift)"}
+            return 200, {"tickers": self.predictor.drift.summary()}
+        if url.path != "/predict":
+            return 404, {"error": f"path {url.path} tidak dikenal"}
+        try:
+            if method == "GET":
+                tickers = [t for v in parse_qs(url.query).get("tickers", []) for t in v.split(",") if t]
+            elif method == "POST":
+                tickers = json.loads(body or b"{}").get("tickers", [])
+            else:
+                return 405, {"error": "gunakan GET atau POST"}
+        except (ValueError, AttributeError):
+            return 400, {"error": "body harus JSON {\"tickers\": [...]}"}
+        if not isinstance(tickers, list):
+            return 400, {"error": "body harus JSON {\"tickers\": [...]}"}
+        tickers = [str(t).upper() for t in tickers]
+        if not tickers:
+            return 400, {"error": "tickers kosong"}
+        unknown = [t for t in dict.fromkeys(tickers) if t not in self.universe]
+        if unknown:
+            return 400, {"error": f"ticker tidak dikenal: {', '.join(unknown)}"}
+        t0 = time.perf_counter()
+        results = await self.predict(tickers)
+        return 200, {"results": results, "ms": (time.perf_counter() - t0) * 1e3}
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        # Return asyncio.Server; panggil serve_forever() atau close()
+        self.batcher.start()
+        if self.predictor.drift is not None and self._saver is None:
+            self._saver = asyncio.get_running_loop().create_task(self._save_drift_loop())
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def _save_drift_loop(self, interval=DRIFT_SAVE_SECONDS):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            await loop.run_in_executor(self._save_pool, self.predictor.save_drift)
+
+    async def close(self):
+        # Hentikan batcher & penyimpan berkala, lalu tulis state drift terakhir
+        await self.batcher.stop()
+        if self._saver is not None:
+            self._saver.cancel()
+            try:
+                await self._saver
+            except asyncio.CancelledError:
+                pass
+            self._saver = None
+        await asyncio.get_running_loop().run_in_executor(self._save_pool, self.predictor.save_drift)
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise ConnectionError("request line tidak valid")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise BadRequest("Content-Length tidak valid")
+    if length < 0:
+        raise BadRequest("Content-Length tidak valid")
+    if length > _MAX_BODY:
+        raise ConnectionError("body terlalu besar")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _write_response(writer, status, payload, keep_alive=True, content_type="application/json"):
+    body = (payload if isinstance(payload, str) else json.dumps(payload)).encode()
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode() + body)
+
+
+# --- CLI ---
+def _predictor(offline, drift=False, retrain=False, drift_state=DRIFT_STATE):
+    source = offline_window_source() if offline else live_window_source()
+    try:
+        bundle = open_bundle()
+    except BundleError:
+        bundle = None
+    monitor = trigger = None
+    if drift:
+        from saham.drift import DriftMonitor, RetrainTrigger
+
+        monitor = DriftMonitor.load(drift_state)
+        monitor.refresh_references()
+        trigger = RetrainTrigger(monitor) if retrain else None
+    return Predictor(source, bundle=bundle, drift=monitor, retrain=trigger, pooled_dir=POOLED_DIR)
+
+
+async def _serve(args):
+    predictor = _predictor(args.offline, args.drift, args.retrain, args.drift_state)
+    service = PredictionService(predictor, args.max_batch, args.max_wait_ms)
+    server = await service.serve(args.host, args.port)
+    print(f"Layanan prediksi di http://{args.host}:{args.port} (/predict?tickers=BBCA,BBRI)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--offline", action="store_true", help="Pakai histori lokal saja, tanpa yfinance")
+    common.add_argument("--trace", action="store_true", help="Catat span waktu per tahap (lihat /metrics)")
+    parser = argparse.ArgumentParser(description="Layanan & CLI prediksi harga penutupan.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", parents=[common])
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    serve.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    serve.add_argument("--drift", action="store_true", help="Pantau drift fitur dari bar yang diskor")
+    serve.add_argument("--retrain", action="store_true", help="Dengan --drift: retrain saat ambang terlewati")
+    serve.add_argument("--drift-state", default=DRIFT_STATE)
+    predict = sub.add_parser("predict", parents=[common])
+    predict.add_argument("tickers", nargs="*", default=BANKS)
+    args = parser.parse_args(argv)
+    trace.enable(args.trace or trace.enabled())
+
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return
+    requested = [t.upper() for t in args.tickers]
+    unknown = [t for t in requested if t not in set(universe_tickers())]
+    if unknown:
+        parser.error(f"ticker tidak dikenal: {', '.join(unknown)}")
+    for row in _predictor(args.offline).predict(requested):
+        if "error" in row:
+            print(f"{row['ticker']}: {row['error']}")
+        else:
+            print(f"{row['ticker']}: close {row['last_date']} Rp {row['last_close']:,.0f} | "
+                  f"estimasi hari ini Rp {row['pred_today']:,.0f} | besok Rp {row['pred_next']:,.0f}")
+    if args.trace:
+        for sp in trace.snapshot()["spans"]:
+            labels = ",".join(f"{k}={v}" for k, v in sp["labels"].items())
+            print(f"  {sp['stage']:<20}{labels:<28}{sp['count']:>4}x {sp['total_ms']:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Span waktu ringan untuk jalur panas (fetch, fitur, scaling, inferensi, grafik).
+
+* Nonaktif secara default: span() hanya mengembalikan context manager no-op
+  bersama (satu cek boolean per panggilan, tanpa alokasi). Aktifkan dengan
+  env SAHAM_TRACE=1 atau enable().
+* Statistik agregat per (tahap, label): count, total, min, max, terakhir,
+  plus ring buffer span terbaru untuk panel diagnostik app.
+* count() untuk penghitung (cache hit/miss, memo grafik).
+* Collector: fungsi tanpa argumen yang mengembalikan dict angka (mis.
+  MarketDataCache.stats) dibaca saat ekspor.
+* Ekspor: snapshot() (dict siap JSON) dan prometheus() (format teks
+  exposition Prometheus).
+"""
+import os
+import re
+import threading
+import time
+from collections import deque
+
+RECENT_SPANS = 200
+PREFIX = "saham"
+
+_enabled = os.environ.get("SAHAM_TRACE", "") not in ("", "0")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("recorder", "stage", "labels", "t0")
+
+    def __init__(self, recorder, stage, labels):
+        self.recorder = recorder
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.stage, time.perf_counter() - self.t0, self.labels)
+        return False
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Recorder:
+
+    def __init__(self, recent=RECENT_SPANS):
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._counters = {}
+        self._collectors = {}
+        self.recent = deque(maxlen=recent)
+
+    def record(self, stage, seconds, labels):
+        key = _key(stage, labels)
+        with self._lock:
+            s = self._spans.get(key)
+            if s is None:
+                self._spans[key] = [1, seconds, seconds, seconds, seconds]
+            else:
+                s[0] += 1
+                s[1] += seconds
+                s[2] = min(s[2], seconds)
+                s[3] = max(s[3], seconds)
+                s[4] = seconds
+            self.recent.append((time.time(), stage, dict(key[1]), seconds))
+
+    def count(self, name, value, labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def register_collector(self, name, fn):
+        with self._lock:
+            self._collectors[name] = fn
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self.recent.clear()
+
+    def _collect(self):
+        out = {}
+        for name, fn in list(self._collectors.items()):
+            try:
+                values = fn()
+            except Exception:
+                continue
+            out[name] = {k: v for k, v in values.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        return out
+
+    # --- EKSPOR ---
+    def snapshot(self, recent=20):
+        with self._lock:
+            spans = [
+                {"stage": stage, "labels": dict(labels), "count": s[0], "total_ms": s[1] * 1e3,
+                 "avg_ms": s[1] / s[0] * 1e3, "min_ms": s[2] * 1e3, "max_ms": s[3] * 1e3, "last_ms": s[4] * 1e3}
+                for (stage, labels), s in self._spans.items()
+            ]
+            counters = [{"name": name, "labels": dict(labels), "value": v}
+                        for (name, labels), v in self._counters.items()]
+            latest = list(self.recent)[-recent:] if recent else []
+        return {
+            "enabled": _enabled,
+            "spans": sorted(spans, key=lambda s: -s["total_ms"]),
+            "counters": counters,
+            "collectors": self._collect(),
+            "recent": [{"time": t, "stage": stage, "labels": labels, "ms": sec * 1e3}
+                       for t, stage, labels, sec in latest],
+        }
+
+    def prometheus(self, prefix=PREFIX):
+        with self._lock:
+            spans = list(self._spans.items())
+            counters = list(self._counters.items())
+        lines = []
+        if spans:
+            metric = f"{prefix}_span_seconds"
+            lines += [f"# HELP {metric} Durasi span per tahap jalur panas.", f"# TYPE {metric} summary"]
+            for (stage, labels), s in spans:
+                lbl = _labels((("stage", stage),) + labels)
+                lines += [f"{metric}_count{lbl} {s[0]}", f"{metric}_sum{lbl} {s[1]:.9f}"]
+            lines += [f"# HELP {metric}_max Durasi span terlama per tahap.", f"# TYPE {metric}_max gauge"]
+            lines += [f"{metric}_max{_labels((('stage', stage),) + labels)} {s[3]:.9f}" for (stage, labels), s in spans]
+        for name in sorted({name for (name, _), _ in counters}):
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines += [f"{metric}{_labels(labels)} {v}" for (n, labels), v in counters if n == name]
+        for source, values in self._collect().items():
+            for key, value in values.items():
+                metric = f"{prefix}_{_metric_name(source)}_{_metric_name(key)}"
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    def escape(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{_metric_name(k)}="{escape(v)}"' for k, v in pairs) + "}"
+
+
+RECORDER = Recorder()
+
+
+# --- API MODUL ---
+def enabled():
+    return _enabled
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def span(stage, **labels):
+    # with trace.span("fitur", ticker="BBCA"): ...
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(RECORDER, stage, labels)
+
+
+def count(name, value=1, **labels):
+    if _enabled:
+        RECORDER.count(name, value, labels)
+
+
+def register_collector(name, fn):
+    RECORDER.register_collector(name, fn)
+
+
+def snapshot(recent=20):
+    return RECORDER.snapshot(recent)
+
+
+def prometheus(prefix=PREFIX):
+    return RECORDER.prometheus(prefix)
+
+
+def reset():
+    RECORDER.reset()
@@ -0,0 +1,119 @@
+"""Kalender hari bursa IDX: Senin-Jumat di luar libur bursa (Data/idx_holidays.csv).
+
+Kolom source di file libur: "data" = hari kerja yang memang tidak ada di
+Data/Raw (terverifikasi), "jadwal" = jadwal libur & cuti bersama yang
+diumumkan untuk tahun berjalan/berikutnya. Tambahkan baris setiap BEI
+merilis kalender baru; covered_until() memberi tahu sampai kapan kalender
+bisa dipercaya (setelahnya hanya akhir pekan yang dilewati).
+
+Semua perhitungan memakai np.busday_offset / np.is_busday atas
+np.busdaycalendar, jadi N hari bursa ke depan dihitung sekaligus.
+
+Cek file terhadap data: python -m saham.trading_calendar [--raw-dir Data/Raw]
+"""
+import argparse
+import csv
+import os
+from datetime import date, datetime
+from functools import lru_cache
+
+import numpy as np
+
+HOLIDAY_FILE = "Data/idx_holidays.csv"
+HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+BULAN = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agu", "Sep", "Okt", "Nov", "Des"]
+
+
+@lru_cache(maxsize=4)
+def load_holidays(path=HOLIDAY_FILE):
+    # {tanggal datetime64[D]: nama}; kosong bila file tidak ada
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline="") as f:
+        return {np.datetime64(row["date"], "D"): row["name"] for row in csv.DictReader(f)}
+
+
+@lru_cache(maxsize=4)
+def busday_calendar(path=HOLIDAY_FILE):
+    return np.busdaycalendar(holidays=sorted(load_holidays(path)))
+
+
+def covered_until(path=HOLIDAY_FILE):
+    # Tanggal terakhir yang libur bursanya tercakup file (akhir tahun terakhir)
+    holidays = load_holidays(path)
+    if not holidays:
+        return None
+    return date(max(holidays).astype(object).year, 12, 31)
+
+
+def _day(value):
+    # date / datetime / pd.Timestamp / str / datetime64 -> datetime64[D]
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+def is_trading_day(value, path=HOLIDAY_FILE):
+    return bool(np.is_busday(_day(value), busdaycal=busday_calendar(path)))
+
+
+def holiday_name(value, path=HOLIDAY_FILE):
+    return load_holidays(path).get(_day(value))
+
+
+def next_trading_days(after, n, path=HOLIDAY_FILE):
+    # n hari bursa berikutnya setelah `after` (tidak termasuk `after`),
+    # array datetime64[D]
+    start = _day(after)
+    # roll backward: `after` di hari libur dihitung dari hari bursa sebelumnya
+    return np.busday_offset(start, np.arange(1, n + 1), roll="backward", busdaycal=busday_calendar(path))
+
+
+def previous_trading_day(before, path=HOLIDAY_FILE):
+    # Hari bursa terakhir sebelum `before` (tidak termasuk `before`)
+    return np.busday_offset(_day(before), -1, roll="forward", busdaycal=busday_calendar(path))
+
+
+def trading_days_between(start, end, path=HOLIDAY_FILE):
+    # Jumlah hari bursa di (start, end]
+    return int(np.busday_count(_day(start) + 1, _day(end) + 1, busdaycal=busday_calendar(path)))
+
+
+def day_label(value):
+    # "Senin, 20 Okt 2025"
+    d = _day(value).astype(object)
+    return f"{HARI[d.weekday()]}, {d.day} {BULAN[d.month - 1]} {d.year}"
+
+
+def missing_weekdays(index):
+    # Hari kerja di antara tanggal pertama dan terakhir index yang tidak ada
+    # di index (kandidat libur bursa)
+    days = np.unique(np.asarray(index, dtype="datetime64[D]"))
+    span = np.arange(days[0], days[-1] + 1, dtype="datetime64[D]")
+    weekdays = span[np.is_busday(span)]
+    return weekdays[~np.isin(weekdays, days)]
+
+
+def main(argv=None):
+    from saham.data import BANKS, RAW_DIR, read_raw_csv
+
+    parser = argparse.ArgumentParser(description="Cocokkan file libur bursa dengan celah tanggal di Data/Raw.")
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--banks", nargs="+", default=BANKS)
+    args = parser.parse_args(argv)
+
+    dates = np.unique(np.concatenate([read_raw_csv(b, args.raw_dir).index.to_numpy() for b in args.banks]))
+    gaps = set(missing_weekdays(dates).tolist())
+    holidays = load_holidays()
+    first, last = dates[0].astype("datetime64[D]"), dates[-1].astype("datetime64[D]")
+    listed = {d.tolist() for d in holidays if first <= d <= last}
+    print(f"Data {first} s/d {last}: {len(gaps)} hari kerja tanpa data, {len(listed)} libur di file")
+    for d in sorted(gaps - listed):
+        print(f"  tidak ada di file : {d} ({HARI[d.weekday()]})")
+    for d in sorted(listed - gaps):
+        print(f"  ada data bursa    : {d} ({holidays[np.datetime64(d)]})")
+    print(f"Kalender tercakup sampai {covered_until()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""Pipeline pelatihan: Data/Raw -> artefak Models/, Predictions/, Feature_Importance/.
+
+Tahapan per bank: load -> cleaning (ffill/bfill) -> indikator -> MinMax
+scaling -> split time-series 80/20 -> fit baseline & model final ->
+evaluasi -> tulis artefak. Setiap bank dilatih di proses terpisah
+(ProcessPoolExecutor); n_jobs Random Forest di dalamnya dibagi dari anggaran
+core total sehingga jobs x n_jobs <= cores. Waktu tiap tahap dicatat ke
+data_summary.json[bank]["stage_timings"].
+
+Mode pruning (--prune bank|sector) memilih set fitur minimal dari laporan
+importance (saham.pruning) lalu melatih model final hanya pada fitur itu;
+hasil seleksi, R² test model penuh vs pruned dan importance model pruned
+dicatat di data_summary.json[bank]["pruning"]; laporan Feature_Importance
+tetap memakai model penuh.
+
+Statistik baris train untuk pemantauan drift (saham.drift) disimpan di
+data_summary.json[bank]["drift_reference"]; retrain mengganti referensi ini
+dan mereset statistik live ticker tersebut.
+
+Dengan --store DIR histori dibaca dari PriceStore (Data/Raw + bar live yang
+sudah di-refresh) alih-alih Data/Raw statis; retrain otomatis dari
+saham.drift memakai mode ini agar model dan referensinya ikut bar terbaru.
+
+Jalankan: python -m saham.training [--banks BBCA BBRI] [--cores 4] [--out DIR] [--prune bank|sector] [--store Data/Store]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.preprocessing import MinMaxScaler
+
+from saham.data import BANKS, PRICE_COLUMNS, RAW_DIR, clean_ohlcv, read_raw_csv
+from saham.drift import reference_stats
+from saham.indicators import FEATURE_CATEGORIES, FEATURE_COLUMNS, SCALER_COLUMNS, TARGET_COLUMN, compute_features
+
+TRAIN_RATIO = 0.8
+RANDOM_STATE = 42
+BASELINE_PARAMS = {"n_estimators": 100}
+R2_TARGET = 0.85
+GAP_THRESHOLD = 0.05
+# Ambang kumulatif importance untuk estimasi reduksi fitur global
+REDUCTION_THRESHOLD = 0.85
+SUMMARY_FILE = "Models/data_summary.json"
+METRICS_FILE = "Models/metrics.json"
+
+
+class StageTimer:
+
+    def __init__(self):
+        self.timings = {}
+        self._t0 = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + (now - self._t0)
+        self._t0 = now
+
+
+# --- METRIK ---
+def regression_metrics(y_true, y_pred):
+    y_true, y_pred = np.asarray(y_true), np.asarray(y_pred)
+    err = y_true - y_pred
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mape = float(np.mean(np.abs(err / y_true)) * 100)
+    return {
+        "mae": float(mean_absolute_error(y_true, y_pred)),
+        "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        "r2": float(r2_score(y_true, y_pred)),
+        "mape": mape,
+        "max_error": float(np.max(np.abs(err))),
+        "mean_error": float(np.mean(err)),
+        "std_error": float(np.std(err)),
+    }
+
+
+def _describe(frame):
+    return {col: {k: float(v) for k, v in stats.items()} for col, stats in frame.describe().to_dict().items()}
+
+
+def importance_table(model, columns=None):
+    # Selalu 20 baris FEATURE_COLUMNS; fitur di luar `columns` bernilai 0
+    if columns is None:
+        names = getattr(model, "feature_names_in_", None)
+        columns = list(names) if names is not None else FEATURE_COLUMNS
+    lookup = dict(zip(columns, model.feature_importances_))
+    table = pd.DataFrame({"Feature": FEATURE_COLUMNS, "Importance": [float(lookup.get(f, 0.0)) for f in FEATURE_COLUMNS]})
+    table = table.sort_values("Importance", ascending=False, ignore_index=True)
+    table["Percentage"] = table["Importance"] * 100
+    table["Cumulative_Percentage"] = table["Percentage"].cumsum()
+    return table
+
+
+# --- TAHAPAN PER BANK ---
+def prepare_dataset(raw, train_ratio=TRAIN_RATIO, timer=None):
+    # Dipakai bersama oleh training, tuning dan backtest
+    timer = timer or StageTimer()
+    clean = clean_ohlcv(raw)
+    timer.lap("clean")
+    data = compute_features(clean).dropna()
+    timer.lap("features")
+    scaler = MinMaxScaler().fit(data[SCALER_COLUMNS])
+    scaled = pd.DataFrame(scaler.transform(data[SCALER_COLUMNS]), index=data.index, columns=SCALER_COLUMNS)
+    timer.lap("scale")
+    n_train = int(len(scaled) * train_ratio)
+    timer.lap("split")
+    return clean, data, scaler, scaled, n_train
+
+
+def read_history(bank, raw_dir=RAW_DIR, store_dir=None):
+    # OHLCV untuk training: Data/Raw, atau PriceStore (di-seed dari Data/Raw,
+    # plus bar live hasil refresh) bila store_dir diberikan
+    if store_dir is None:
+        return read_raw_csv(bank, raw_dir)
+    from saham.price_store import open_store
+
+    return open_store(store_dir, [bank], raw_dir).read(bank)
+
+
+def train_bank(bank, params=None, n_jobs=1, raw_dir=RAW_DIR, out_dir=".", random_state=RANDOM_STATE,
+               features=None, prune=False, pruning=None, store_dir=None):
+    # Latih satu bank dan tulis artefaknya; return ringkasan untuk JSON.
+    # features: set fitur tetap (mode sektor, hasil seleksi di pruning);
+    # prune=True: seleksi set fitur minimal untuk bank ini.
+    timer = StageTimer()
+    raw = read_history(bank, raw_dir, store_dir)
+    if raw.empty:
+        raise FileNotFoundError(f"Data mentah {bank} tidak ditemukan di {store_dir or raw_dir}.")
+    timer.lap("load")
+    missing = int(raw[PRICE_COLUMNS].isna().sum().sum())
+    clean, data, scaler, scaled, n_train = prepare_dataset(raw, timer=timer)
+
+    X, y = scaled[FEATURE_COLUMNS], scaled[TARGET_COLUMN]
+    X_train, X_test, y_train, y_test = X.iloc[:n_train], X.iloc[n_train:], y.iloc[:n_train], y.iloc[n_train:]
+
+    t0 = time.perf_counter()
+    baseline = RandomForestRegressor(random_state=random_state, n_jobs=n_jobs, **BASELINE_PARAMS)
+    baseline.fit(X_train, y_train)
+    baseline_time = time.perf_counter() - t0
+    base_test_r2 = r2_score(y_test, baseline.predict(X_test))
+    baseline_perf = {
+        "train_r2": float(r2_score(y_train, baseline.predict(X_train))),
+        "test_r2": float(base_test_r2),
+        "mae": float(mean_absolute_error(y_test, baseline.predict(X_test))),
+        "time": baseline_time,
+    }
+    timer.lap("baseline_fit")
+
+    params = dict(params or BASELINE_PARAMS)
+    if prune and features is None:
+        from saham.pruning import IMPORTANCE_DIR, importance_ranking, select_features
+
+        # Laporan importance dibaca sebelum ditimpa _write_bank_artifacts
+        ranking = importance_ranking(bank, os.path.join(out_dir, IMPORTANCE_DIR)) or importance_ranking(bank)
+        pruning = {"mode": "bank", **select_features({bank: (X_train, y_train)}, params, ranking,
+                                                      random_state=random_state, n_jobs=n_jobs)}
+        features = pruning["features"]
+        timer.lap("prune")
+    if features is not None:
+        full = RandomForestRegressor(random_state=random_state, n_jobs=n_jobs, **params).fit(X_train, y_train)
+        pruning = {**(pruning or {}), "test_r2_full": float(r2_score(y_test, full.predict(X_test)))}
+        X_train, X_test = X_train[features], X_test[features]
+        timer.lap("prune")
+
+    model = RandomForestRegressor(random_state=random_state, n_jobs=n_jobs, **params)
+    model.fit(X_train, y_train)
+    timer.lap("fit")
+
+    train_pred, test_pred = model.predict(X_train), model.predict(X_test)
+    train_m, test_m = regression_metrics(y_train, train_pred), regression_metrics(y_test, test_pred)
+    # Laporan importance selalu dari model penuh (20 fitur): importance_ranking
+    # membacanya di run --prune berikutnya, jadi fitur yang dibuang tidak boleh
+    # tercatat 0. Importance model pruned disimpan di summary["pruning"].
+    importance = importance_table(model if features is None else full)
+    if features is not None:
+        pruning["importance"] = dict(zip(features, map(float, model.feature_importances_)))
+    timer.lap("evaluate")
+
+    _write_bank_artifacts(bank, out_dir, model, scaler, scaled.index, n_train,
+                          y.to_numpy(), np.concatenate([train_pred, test_pred]), importance)
+    timer.lap("write")
+
+    gap = train_m["r2"] - test_m["r2"]
+    close = clean["Close"]
+    summary = {
+        # Sumber histori sebenarnya: PriceStore (di-seed dari Data/Raw + bar live) atau Data/Raw
+        "file": (f"PriceStore {os.path.join(store_dir, bank)} (seed {bank}_raw.csv)" if store_dir
+                 else f"{bank}_raw.csv"),
+        "rows": len(raw),
+        "shape": f"{len(raw)} Rows, {len(PRICE_COLUMNS) + 1} Columns",
+        "columns": ["Date"] + PRICE_COLUMNS,
+        "date_range": f"{raw.index[0]:%Y-%m-%d} → {raw.index[-1]:%Y-%m-%d}",
+        "price_range": f"Rp {close.min():,.0f} - Rp {close.max():,.0f}",
+        "avg_volume": f"{clean['Volume'].mean():,.0f}",
+        "duplicates": int(raw.index.duplicated().sum()),
+        "missing_values": missing,
+        "desc_stats": _describe(clean[["Open", "High", "Low", "Close", "Volume"]]),
+        "status": "OK" if missing == 0 else "Imputed",
+        "norm_stats": _describe(scaled[["Close", "Volume", "RSI", "MACD"]]),
+        "norm_verification": {
+            col: {
+                "min": float(scaled[col].min()),
+                "max": float(scaled[col].max()),
+                "orig_val": (f"Rp {data[col].min():,.0f} - Rp {data[col].max():,.0f}" if col == "Close"
+                             else f"{data[col].min():,.2f} - {data[col].max():,.2f}"),
+            }
+            for col in ("Close", "Volume", "RSI", "MACD")
+        },
+        "split_details": {
+            "total_rows": len(scaled),
+            "train_rows": n_train,
+            "test_rows": len(scaled) - n_train,
+            "train_pct": f"{n_train / len(scaled) * 100:.1f}%",
+            "test_pct": f"{(len(scaled) - n_train) / len(scaled) * 100:.1f}%",
+            "split_date": f"{scaled.index[n_train]:%Y-%m-%d}",
+        },
+        "split_stats": {
+            "Close": {
+                "Train Mean": float(y_train.mean()), "Test Mean": float(y_test.mean()),
+                "Train Std": float(y_train.std()), "Test Std": float(y_test.std()),
+            },
+            "Volume": {"Train Mean": float(X["Volume"].iloc[:n_train].mean()),
+                       "Test Mean": float(X["Volume"].iloc[n_train:].mean())},
+        },
+        # Statistik train 21 kolom untuk pemantauan drift live (saham.drift)
+        "drift_reference": reference_stats(scaled.to_numpy()[:n_train], scaler.data_min_, scaler.data_max_,
+                                           scaled.index[n_train - 1]),
+        "baseline_perf": baseline_perf,
+        "tuning_results": {
+            "best_params": params,
+            "improvement": float(test_m["r2"] - base_test_r2),
+            "final_r2": test_m["r2"],
+        },
+        "prediction_metrics": {
+            "train_r2": train_m["r2"], "test_r2": test_m["r2"],
+            "test_mae": test_m["mae"], "test_rmse": test_m["rmse"],
+        },
+        "residual_stats": {
+            "mean": test_m["mean_error"],
+            "std": test_m["std_error"],
+            "status": "Stabil" if abs(test_m["mean_error"]) < test_m["std_error"] else "Bias",
+        },
+        "comprehensive_metrics": {
+            "train": train_m,
+            "test": test_m,
+            "gap_analysis": {
+                "gap": gap,
+                "status": "Good generalization" if gap < GAP_THRESHOLD else "Overfitting",
+            },
+        },
+        "feature_importance": _importance_summary(importance),
+    }
+    if pruning is not None:
+        pruning["test_r2_pruned"] = test_m["r2"]
+        summary["pruning"] = pruning
+    timer.timings["total"] = sum(timer.timings.values())
+    summary["stage_timings"] = timer.timings
+    metrics = {"r2": test_m["r2"], "mae": test_m["mae"], "mape": test_m["mape"], "rmse": test_m["rmse"]}
+    return bank, summary, metrics, dict(zip(importance["Feature"], importance["Importance"]))
+
+
+def _importance_summary(importance):
+    lookup = dict(zip(importance["Feature"], importance["Importance"]))
+    return {
+        "top_10": importance.head(10)[["Feature", "Importance", "Percentage"]].to_dict("records"),
+        "top_5_contribution": float(importance["Percentage"].head(5).sum()),
+        "features_80_count": int((importance["Cumulative_Percentage"] < 80).sum() + 1),
+        "categories": {cat: float(sum(lookup[f] for f in feats)) for cat, feats in FEATURE_CATEGORIES.items()},
+    }
+
+
+def _write_bank_artifacts(bank, out_dir, model, scaler, dates, n_train, actual, predicted, importance):
+    paths = {name: os.path.join(out_dir, name) for name in
+             ("Models/Trained", "Models/Scalers", "Predictions", "Feature_Importance")}
+    for path in paths.values():
+        os.makedirs(path, exist_ok=True)
+    joblib.dump(model, os.path.join(paths["Models/Trained"], f"{bank}_rf_model.pkl"))
+    joblib.dump(scaler, os.path.join(paths["Models/Scalers"], f"{bank}_scaler.pkl"))
+
+    sets = np.where(np.arange(len(actual)) < n_train, "Train", "Test")
+    joblib.dump(
+        {"dates": np.asarray(dates), "actual": actual, "predicted": predicted, "set": sets},
+        os.path.join(paths["Models/Trained"], f"{bank}_predictions.pkl"),
+    )
+    pd.DataFrame({
+        "Date": pd.DatetimeIndex(dates).strftime("%Y-%m-%d"),
+        "Actual": actual, "Predicted": predicted, "Residual": actual - predicted, "Set": sets,
+    }).to_csv(os.path.join(paths["Predictions"], f"{bank}_predictions.csv"), index=False)
+    importance.to_csv(os.path.join(paths["Feature_Importance"], f"{bank}_feature_importance.csv"), index=False)
+
+
+# --- RINGKASAN LINTAS BANK ---
+def _global_importance(importances, report_date):
+    table = pd.DataFrame(importances)
+    stats = pd.DataFrame({"Average": table.mean(axis=1), "Std": table.std(axis=1)})
+    stats = stats.sort_values("Average", ascending=False)
+    top10_counts = sum(table[b].rank(ascending=False) <= 10 for b in table.columns)
+    consistent = [f for f in stats.index if top10_counts[f] == len(table.columns)][:3]
+    categories = {cat: float(stats.loc[feats, "Average"].sum()) for cat, feats in FEATURE_CATEGORIES.items()}
+    top_cat = max(categories, key=categories.get)
+    cumulative = stats["Average"].cumsum() / stats["Average"].sum()
+    return {
+        "top_10_overall": [
+            {"Feature": f, "Average": float(r["Average"]), "Std": float(r["Std"])}
+            for f, r in stats.head(10).iterrows()
+        ],
+        "most_consistent": consistent,
+        "top_category": {"name": top_cat, "percentage": categories[top_cat] / sum(categories.values()) * 100},
+        "reduction_potential": {"from": len(stats), "to": int((cumulative < REDUCTION_THRESHOLD).sum() + 1)},
+        "report_gen_date": report_date,
+    }
+
+
+def _load_json(path):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+def plan_workers(n_banks, cores=None, jobs=None):
+    # Bagi anggaran core: jumlah proses bank x n_jobs per forest <= cores
+    cores = max(1, cores or os.cpu_count() or 1)
+    jobs = max(1, min(jobs or cores, n_banks, cores))
+    return jobs, max(1, cores // jobs)
+
+
+def run_pipeline(banks=BANKS, cores=None, jobs=None, raw_dir=RAW_DIR, out_dir=".", params_from=SUMMARY_FILE,
+                 param_overrides=None, tune=False, prune=None, store_dir=None):
+    # params_from: data_summary.json berisi tuning_results.best_params per bank;
+    # tune=True menjalankan successive halving (saham.tuning) lebih dulu;
+    # prune="bank" (set fitur per bank) atau "sector" (satu set untuk semua bank);
+    # store_dir: latih dari PriceStore (lihat read_history)
+    t0 = time.perf_counter()
+    banks = list(banks)
+    jobs, inner = plan_workers(len(banks), cores, jobs)
+    previous = _load_json(params_from) if params_from else {}
+    searches = {}
+    if tune:
+        from saham.tuning import tune_bank
+
+        # Tuning per bank bergantian; paralelisme ada di kandidat x fold
+        for bank in banks:
+            searches[bank] = tune_bank(bank, n_jobs=plan_workers(1, cores)[1], raw_dir=raw_dir, store_dir=store_dir)
+    params = {
+        b: (param_overrides or {}).get(b) or searches.get(b, {}).get("best_params")
+        or previous.get(b, {}).get("tuning_results", {}).get("best_params")
+        for b in banks
+    }
+
+    options = {b: {"prune": prune == "bank"} for b in banks}
+    if prune == "sector":
+        sector = _select_sector_features(banks, params, raw_dir, out_dir, plan_workers(1, cores)[1], store_dir)
+        options = {b: {"features": sector["features"], "pruning": dict(sector)} for b in banks}
+    for b in banks:
+        options[b]["store_dir"] = store_dir
+
+    if jobs == 1:
+        results = [train_bank(b, params[b], inner, raw_dir, out_dir, **options[b]) for b in banks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(train_bank, b, params[b], inner, raw_dir, out_dir, **options[b]) for b in banks]
+            results = [f.result() for f in futures]
+
+    summary_path = os.path.join(out_dir, SUMMARY_FILE)
+    metrics_path = os.path.join(out_dir, METRICS_FILE)
+    summary, metrics = _load_json(summary_path), _load_json(metrics_path)
+    report_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    importances = {}
+    for bank, bank_summary, bank_metrics, importance in results:
+        summary[bank] = {**summary.get(bank, {}), **bank_summary}
+        if "pruning" not in bank_summary:
+            # Model penuh menggantikan model pruned dari run sebelumnya
+            summary[bank].pop("pruning", None)
+        if bank in searches:
+            search = {k: v for k, v in searches[bank].items() if k != "best_params"}
+            summary[bank]["tuning_results"]["search"] = search
+            summary[bank]["stage_timings"]["tune"] = search["seconds"]
+        metrics[bank] = bank_metrics
+        importances[bank] = importance
+
+    tests = [summary[b]["comprehensive_metrics"]["test"] for b in banks]
+    aggregate = {f"avg_{k}": float(np.mean([t[k] for t in tests])) for k in ("mae", "rmse", "r2", "mape")}
+    aggregate["report_date"] = report_date
+    global_importance = _global_importance(importances, report_date) if len(banks) > 1 else None
+    for bank in banks:
+        summary[bank]["aggregate_stats"] = aggregate
+        if global_importance is not None:
+            summary[bank]["global_importance"] = global_importance
+        summary[bank]["stage_timings"]["pipeline_wall"] = time.perf_counter() - t0
+        summary[bank]["stage_timings"]["workers"] = {"processes": jobs, "n_jobs": inner}
+
+    _write_json(summary_path, summary)
+    _write_json(metrics_path, metrics)
+    return summary, metrics
+
+
+def _select_sector_features(banks, params, raw_dir, out_dir, n_jobs, store_dir=None):
+    # Satu set fitur untuk semua bank: ranking rata-rata lintas bank, R²
+    # validasi setiap bank harus dalam toleransi
+    from saham.pruning import IMPORTANCE_DIR, importance_ranking, select_features
+
+    datasets = {}
+    for bank in banks:
+        _, _, _, scaled, n_train = prepare_dataset(read_history(bank, raw_dir, store_dir))
+        datasets[bank] = (scaled[FEATURE_COLUMNS].iloc[:n_train], scaled[TARGET_COLUMN].iloc[:n_train])
+    ranking = importance_ranking(None, os.path.join(out_dir, IMPORTANCE_DIR)) or importance_ranking(None)
+    # Parameter bank pertama dipakai untuk seleksi (best_params antar bank serupa)
+    return {"mode": "sector", **select_features(datasets, params[banks[0]] or BASELINE_PARAMS, ranking, n_jobs=n_jobs)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latih ulang model Random Forest per bank.")
+    parser.add_argument("--banks", nargs="+", default=BANKS)
+    parser.add_argument("--cores", type=int, default=None, help="Anggaran core total (default: semua core)")
+    parser.add_argument("--jobs", type=int, default=None, help="Jumlah proses bank paralel")
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--out", default=".", help="Root output artefak (default: repo ini)")
+    parser.add_argument("--tune", action="store_true", help="Cari ulang hyperparameter (successive halving)")
+    parser.add_argument("--prune", choices=["bank", "sector"], default=None,
+                        help="Latih pada set fitur minimal per bank atau satu set sektor")
+    parser.add_argument("--store", default=None,
+                        help="Latih dari PriceStore ini (Data/Raw + bar live), mis. Data/Store")
+    args = parser.parse_args(argv)
+
+    summary, _ = run_pipeline(args.banks, args.cores, args.jobs, args.raw_dir, args.out, tune=args.tune,
+                              prune=args.prune, store_dir=args.store)
+    for bank in args.banks:
+        t = summary[bank]["stage_timings"]
+        stages = ", ".join(f"{k} {v:.2f}s" for k, v in t.items() if isinstance(v, float) and k != "pipeline_wall")
+        print(f"{bank}: R² {summary[bank]['tuning_results']['final_r2']:.4f} | {stages}")
+        if args.prune:
+            p = summary[bank]["pruning"]
+            print(f"  pruning {p['mode']}: {p['n_features']}/{len(FEATURE_COLUMNS)} fitur {p['features']} | "
+                  f"R² test penuh {p['test_r2_full']:.4f} -> pruned {p['test_r2_pruned']:.4f}")
+    print(f"Total wall: {summary[args.banks[0]]['stage_timings']['pipeline_wall']:.2f}s "
+          f"({t['workers']['processes']} proses x n_jobs {t['workers']['n_jobs']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Tuning hyperparameter Random Forest dengan successive halving.
+
+* Fold time-series CV (TimeSeriesSplit) dibangun sekali: matriks fitur
+  float32 & target disimpan ke folder sementara lalu dibuka worker dengan
+  np.load(mmap_mode="r"). Setiap fold berupa prefix [0, train_end) +
+  [train_end, test_end), jadi slicing tidak menyalin data.
+* Resource = n_estimators. Setiap kandidat x fold adalah forest warm_start
+  yang disimpan di folder cache; naik rung berarti menambah pohon, bukan
+  fit ulang dari nol. Dengan random_state tetap, forest warm_start N pohon
+  identik dengan fit baru N pohon.
+* Setiap rung hanya 1/eta kandidat terbaik (rata-rata RMSE fold terkecil)
+  yang lanjut; berhenti lebih awal bila RMSE terbaik tidak turun lebih dari
+  `tol`. RMSE dipakai, bukan R², karena fold awal time-series pendek dan
+  Random Forest tidak bisa ekstrapolasi tren sehingga R² per fold sering
+  negatif dan tidak stabil.
+
+Jalankan: python -m saham.tuning --bank BBCA [--jobs 4] [--compare-grid]
+"""
+import argparse
+import itertools
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import TimeSeriesSplit
+
+from saham.data import RAW_DIR
+from saham.indicators import FEATURE_COLUMNS, TARGET_COLUMN
+from saham.training import RANDOM_STATE, prepare_dataset, read_history
+
+CV_SPLITS = 5
+# Grid asal tuning_results: n_estimators adalah resource, sisanya kandidat
+PARAM_GRID = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [10, 20, 30, None],
+    "min_samples_split": [2, 5, 10],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": ["sqrt", "log2", 1.0],
+    "bootstrap": [True, False],
+}
+ETA = 2
+TOL = 1e-5
+
+
+def candidates_from_grid(grid):
+    keys = [k for k in grid if k != "n_estimators"]
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def resource_schedule(grid):
+    # Rung = nilai n_estimators di grid, sehingga hasilnya sebanding dengan grid
+    return sorted(set(grid["n_estimators"]))
+
+
+# --- CACHE FOLD ---
+def build_fold_cache(X, y, n_splits=CV_SPLITS, folder=None):
+    # X & y ditulis sekali; fold hanya berupa batas indeks
+    folder = folder or tempfile.mkdtemp(prefix="saham_cv_")
+    os.makedirs(folder, exist_ok=True)
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    np.save(os.path.join(folder, "X.npy"), X)
+    np.save(os.path.join(folder, "y.npy"), y)
+    folds = []
+    for train_idx, test_idx in TimeSeriesSplit(n_splits=n_splits).split(X):
+        assert train_idx[0] == 0 and test_idx[0] == train_idx[-1] + 1
+        folds.append((int(train_idx[-1] + 1), int(test_idx[-1] + 1)))
+    return {"folder": folder, "folds": folds}
+
+
+def _open_fold_cache(folder):
+    return (np.load(os.path.join(folder, "X.npy"), mmap_mode="r"),
+            np.load(os.path.join(folder, "y.npy"), mmap_mode="r"))
+
+
+def _forest_path(folder, cand, fold):
+    return os.path.join(folder, "forests", f"{cand}_{fold}.pkl")
+
+
+def _grow(folder, cand, fold, bounds, params, n_estimators, random_state, persist=True):
+    # Tambah pohon pada forest kandidat x fold (atau buat baru) lalu skor
+    X, y = _open_fold_cache(folder)
+    train_end, test_end = bounds
+    path = _forest_path(folder, cand, fold)
+    if persist and os.path.exists(path):
+        model = joblib.load(path)
+    else:
+        model = RandomForestRegressor(warm_start=persist, random_state=random_state, n_jobs=1, **params)
+    grown = n_estimators - len(getattr(model, "estimators_", []))
+    model.set_params(n_estimators=n_estimators)
+    model.fit(X[:train_end], y[:train_end])
+    score = np.sqrt(mean_squared_error(y[train_end:test_end], model.predict(X[train_end:test_end])))
+    if persist:
+        joblib.dump(model, path)
+    return cand, fold, float(score), grown
+
+
+# --- SUCCESSIVE HALVING ---
+def successive_halving(cache, grid=PARAM_GRID, eta=ETA, tol=TOL,
+                       n_jobs=1, random_state=RANDOM_STATE):
+    t0 = time.perf_counter()
+    folder, folds = cache["folder"], cache["folds"]
+    os.makedirs(os.path.join(folder, "forests"), exist_ok=True)
+    candidates = candidates_from_grid(grid)
+    rungs = resource_schedule(grid)
+    alive = list(range(len(candidates)))
+    history, fits, trees = [], 0, 0
+    best = None
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for rung, n_estimators in enumerate(rungs):
+            results = parallel(
+                delayed(_grow)(folder, c, f, bounds, candidates[c], n_estimators, random_state)
+                for c in alive for f, bounds in enumerate(folds)
+            )
+            scores = {}
+            for cand, _, score, grown in results:
+                scores.setdefault(cand, []).append(score)
+                fits += 1
+                trees += grown
+            ranked = sorted(alive, key=lambda c: np.mean(scores[c]))
+            top = ranked[0]
+            history.append({
+                "rung": rung, "n_estimators": n_estimators, "candidates": len(alive),
+                "best_cv_rmse": float(np.mean(scores[top])),
+            })
+            improved = best is None or np.mean(scores[top]) < best[2] - tol
+            if improved:
+                best = (top, n_estimators, float(np.mean(scores[top])))
+            elif rung > 0:
+                break
+            keep = ranked[:max(1, len(alive) // eta)]
+            for cand in set(alive) - set(keep):
+                for f in range(len(folds)):
+                    path = _forest_path(folder, cand, f)
+                    if os.path.exists(path):
+                        os.remove(path)
+            alive = keep
+
+    cand, n_estimators, cv_rmse = best
+    grid_fits = len(candidates) * len(grid["n_estimators"]) * len(folds)
+    grid_trees = len(candidates) * sum(grid["n_estimators"]) * len(folds)
+    return {
+        "method": "successive_halving",
+        "best_params": {"n_estimators": n_estimators, **candidates[cand]},
+        "cv_rmse": cv_rmse,
+        "rungs": history,
+        "n_candidates": len(candidates),
+        "cv_splits": len(folds),
+        "fits": fits,
+        "trees_grown": trees,
+        "grid_fits": grid_fits,
+        "grid_trees": grid_trees,
+        "fits_saved": grid_fits - fits,
+        "trees_saved": grid_trees - trees,
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def grid_search(cache, grid=PARAM_GRID, n_jobs=1, random_state=RANDOM_STATE):
+    # Pembanding: setiap kombinasi x fold di-fit dari nol
+    t0 = time.perf_counter()
+    folder, folds = cache["folder"], cache["folds"]
+    combos = [{"n_estimators": n, **c} for n in grid["n_estimators"] for c in candidates_from_grid(grid)]
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_grow)(folder, i, f, bounds, {k: v for k, v in combos[i].items() if k != "n_estimators"},
+                       combos[i]["n_estimators"], random_state, persist=False)
+        for i in range(len(combos)) for f, bounds in enumerate(folds)
+    )
+    scores = {}
+    for i, _, score, _ in results:
+        scores.setdefault(i, []).append(score)
+    best = min(scores, key=lambda i: np.mean(scores[i]))
+    return {
+        "method": "grid",
+        "best_params": combos[best],
+        "cv_rmse": float(np.mean(scores[best])),
+        "fits": len(results),
+        "trees_grown": sum(c["n_estimators"] for c in combos) * len(folds),
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def tune_bank(bank, grid=PARAM_GRID, n_jobs=1, raw_dir=RAW_DIR, compare_grid=False, store_dir=None, **halving):
+    # Fold CV dibangun dari bagian train saja (tanpa melihat data test)
+    _, _, _, scaled, n_train = prepare_dataset(read_history(bank, raw_dir, store_dir))
+    train = scaled.iloc[:n_train]
+    cache = build_fold_cache(train[FEATURE_COLUMNS].to_numpy(), train[TARGET_COLUMN].to_numpy())
+    try:
+        report = successive_halving(cache, grid, n_jobs=n_jobs, **halving)
+        if compare_grid:
+            reference = grid_search(cache, grid, n_jobs=n_jobs)
+            report["grid_seconds"] = reference["seconds"]
+            report["grid_best_params"] = reference["best_params"]
+            report["grid_cv_rmse"] = reference["cv_rmse"]
+            report["speedup"] = reference["seconds"] / report["seconds"]
+    finally:
+        shutil.rmtree(cache["folder"], ignore_errors=True)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Successive halving hyperparameter Random Forest.")
+    parser.add_argument("--bank", default="BBCA")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--compare-grid", action="store_true", help="Jalankan juga grid penuh sebagai pembanding")
+    args = parser.parse_args(argv)
+
+    report = tune_bank(args.bank, n_jobs=args.jobs, raw_dir=args.raw_dir, compare_grid=args.compare_grid)
+    for rung in report["rungs"]:
+        print(f"rung {rung['rung']}: {rung['candidates']:>3} kandidat x {rung['n_estimators']:>3} pohon "
+              f"-> CV RMSE terbaik {rung['best_cv_rmse']:.4f}")
+    print(f"best_params: {report['best_params']} (CV RMSE {report['cv_rmse']:.4f})")
+    print(f"fit: {report['fits']} vs grid {report['grid_fits']} (hemat {report['fits_saved']}), "
+          f"pohon: {report['trees_grown']} vs {report['grid_trees']}, waktu {report['seconds']:.1f}s")
+    if "grid_seconds" in report:
+        print(f"grid: {report['grid_seconds']:.1f}s, CV RMSE {report['grid_cv_rmse']:.4f} -> speedup {report['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Registry universe ticker (Data/universe.csv).
+
+Satu baris per emiten: ticker (kode IDX tanpa .JK), sektor, dan flag
+featured (punya artefak riset lengkap: CSV Data/Raw, model & grafik per
+bank). Universe diperluas cukup dengan menambah baris, mis. seluruh ~900
+emiten IDX; model pooled (saham.pooled) melayani semua ticker yang ikut
+dilatih tanpa satu forest per ticker. Bila file tidak ada, dipakai daftar
+bawaan saham.data. Sengaja tanpa pandas agar murah diimpor app.py.
+"""
+import csv
+import os
+
+from saham.data import BANKS, IDX_BANKING_SECTOR
+
+UNIVERSE_FILE = "Data/universe.csv"
+DEFAULT_SECTOR = "Perbankan"
+
+
+def load_universe(path=UNIVERSE_FILE):
+    # List dict {"ticker", "sector", "featured"} sesuai urutan file
+    if not os.path.exists(path):
+        return [{"ticker": t, "sector": DEFAULT_SECTOR, "featured": t in BANKS} for t in IDX_BANKING_SECTOR]
+    rows, seen = [], set()
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            ticker = row["ticker"].strip().upper()
+            if not ticker or ticker in seen:
+                continue
+            seen.add(ticker)
+            rows.append({
+                "ticker": ticker,
+                "sector": (row.get("sector") or DEFAULT_SECTOR).strip(),
+                "featured": (row.get("featured") or "0").strip() in ("1", "true", "True"),
+            })
+    return rows
+
+
+def tickers(sector=None, path=UNIVERSE_FILE):
+    return [r["ticker"] for r in load_universe(path) if sector is None or r["sector"] == sector]
+
+
+def featured(path=UNIVERSE_FILE):
+    # Ticker dengan artefak riset lengkap (pilihan "Bank Fokus" di app)
+    return [r["ticker"] for r in load_universe(path) if r["featured"]] or list(BANKS)
+
+
+def sectors(path=UNIVERSE_FILE):
+    return sorted({r["sector"] for r in load_universe(path)})
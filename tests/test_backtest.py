@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from saham.backtest import backtest_many, plan_memory, plan_windows
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    index = pd.bdate_range("2024-01-01", periods=n, name="Date")
+    return pd.DataFrame({"Close": close, "High": close * 1.01, "Low": close * 0.99, "Open": close,
+                         "Volume": rng.uniform(1e6, 2e6, n)}, index=index)
+
+
+def test_plan_windows_cover_each_day_once():
+    for expanding in (False, True):
+        for horizon in (0, 1):
+            windows = plan_windows(100, train_size=30, refit_every=7, expanding=expanding, horizon=horizon)
+            days = np.concatenate([np.arange(p_lo, p_hi) for _, _, p_lo, p_hi in windows])
+            assert days.tolist() == list(range(30, 100 - horizon))
+            for lo, hi, p_lo, _ in windows:
+                assert hi + horizon <= p_lo
+                assert lo == 0 if expanding else hi + horizon - lo == 30
+
+
+def test_plan_windows_short_history_is_empty():
+    assert plan_windows(10, train_size=30) == []
+
+
+def test_plan_memory_without_windows():
+    assert plan_memory(4, 1024, {"n_estimators": 100}, 0) == (1, 0)
+
+
+def test_plan_memory_caps_workers_by_budget():
+    workers, per_worker = plan_memory(8, 1, {"n_estimators": 100}, 1000)
+    assert workers == 1 and per_worker > 2 ** 20
+    assert plan_memory(2, 10 ** 6, {"n_estimators": 10}, 100)[0] == 2
+
+
+def test_backtest_short_and_empty_history():
+    outputs, report = backtest_many({"A": random_walk(40), "B": random_walk(0)}, train_size=5000)
+    assert outputs == {}
+    assert report["windows"] == 0 and report["workers"] == 1
+
+
+def test_backtest_out_of_sample_rows():
+    outputs, report = backtest_many({"A": random_walk(120)}, train_size=60, refit_every=10,
+                                    params={"n_estimators": 5})
+    out = outputs["A"]
+    assert report["windows"] == len(out["Window"].unique())
+    assert (pd.to_datetime(out["Train_End"]) < pd.to_datetime(out["Date"])).all()
+    assert out["Date"].is_unique
+    assert np.isfinite(out["Predicted"]).all()
@@ -0,0 +1,84 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import MinMaxScaler
+
+from saham.bundle import BundleError, ModelBundle, open_bundle, write_bundle
+from saham.indicators import FEATURE_COLUMNS, SCALER_COLUMNS
+
+
+def fitted(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = pd.DataFrame(rng.normal(size=(200, len(SCALER_COLUMNS))), columns=SCALER_COLUMNS)
+    scaler = MinMaxScaler().fit(rows)
+    scaled = pd.DataFrame(scaler.transform(rows), columns=SCALER_COLUMNS)
+    model = RandomForestRegressor(n_estimators=5, max_depth=4, random_state=seed)
+    model.fit(scaled[FEATURE_COLUMNS], scaled["Close"])
+    return model, scaler, scaled[FEATURE_COLUMNS]
+
+
+def export(tmp_path, model, scaler):
+    model_path, scaler_path = str(tmp_path / "BBCA_rf_model.pkl"), str(tmp_path / "BBCA_scaler.pkl")
+    joblib.dump(model, model_path)
+    joblib.dump(scaler, scaler_path)
+    path = str(tmp_path / "sector.bundle")
+    write_bundle(path, {"BBCA": (model, scaler, {"mape": 1.0})}, sources={"BBCA": [model_path, scaler_path]})
+    return path, model_path
+
+
+def test_round_trip_matches_model(tmp_path):
+    model, scaler, x = fitted()
+    path, _ = export(tmp_path, model, scaler)
+    bundle = open_bundle(path)
+    assert bundle.tickers == ["BBCA"]
+    assert bundle.metrics("BBCA") == {"mape": 1.0}
+    forest, bundled = bundle.assets("BBCA")
+    np.testing.assert_allclose(forest.predict(x.to_numpy()), model.predict(x), rtol=1e-5)
+    np.testing.assert_array_equal(bundled.data_max_, scaler.data_max_)
+
+
+def test_missing_bundle_is_none(tmp_path):
+    assert open_bundle(str(tmp_path / "none.bundle")) is None
+
+
+def test_corrupt_bytes_rejected(tmp_path):
+    model, scaler, _ = fitted()
+    path, _ = export(tmp_path, model, scaler)
+    bundle = ModelBundle(path)
+    spec = bundle.header["tickers"]["BBCA"]["arrays"]["value"]
+    with open(path, "r+b") as f:
+        f.seek(bundle._data_start + spec["offset"])
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    with pytest.raises(BundleError, match="checksum"):
+        ModelBundle(path).assets("BBCA")
+
+
+def test_stale_bundle_rejected_after_retrain(tmp_path):
+    model, scaler, _ = fitted()
+    path, model_path = export(tmp_path, model, scaler)
+    # Model dilatih ulang setelah bundle dibuat
+    joblib.dump(fitted(seed=1)[0], model_path)
+    with pytest.raises(BundleError, match="berubah sejak bundle dibuat"):
+        ModelBundle(path).assets("BBCA")
+
+
+def test_touched_but_identical_source_accepted(tmp_path):
+    model, scaler, _ = fitted()
+    path, model_path = export(tmp_path, model, scaler)
+    st = os.stat(model_path)
+    os.utime(model_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert ModelBundle(path).assets("BBCA")[0] is not None
+
+
+def test_lfs_pointer_source_ignored(tmp_path):
+    model, scaler, _ = fitted()
+    path, model_path = export(tmp_path, model, scaler)
+    with open(model_path, "wb") as f:
+        f.write(b"version https://git-lfs.github.com/spec/v1\noid sha256:abc\nsize 1\n")
+    assert ModelBundle(path).assets("BBCA")[0] is not None
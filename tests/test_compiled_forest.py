@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from saham.compiled_forest import PREDICT_ATOL, PREDICT_ATOL_F32, compile_forest, load_compiled, save_compiled
+from saham.indicators import FEATURE_COLUMNS
+
+
+def toy_forest(seed=0, rows=400):
+    # Forest kecil atas FEATURE_COLUMNS terskala 0-1, seperti model per bank
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.uniform(size=(rows, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    y = X.iloc[:, 0] + 0.5 * X.iloc[:, 1] ** 2 + rng.normal(0, 0.05, rows)
+    model = RandomForestRegressor(n_estimators=12, max_depth=8, random_state=seed).fit(X, y)
+    X_test = pd.DataFrame(rng.uniform(size=(200, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    return model, X_test
+
+
+def test_float64_matches_sklearn_exactly():
+    model, X = toy_forest()
+    forest = compile_forest(model, "float64")
+    leaves = forest.apply(X.to_numpy()) - forest.roots
+    np.testing.assert_array_equal(leaves, model.apply(X))
+    # Daun identik; rata-rata bisa beda di ulp terakhir karena urutan penjumlahan
+    np.testing.assert_allclose(forest.predict(X.to_numpy()), model.predict(X), rtol=0, atol=PREDICT_ATOL)
+
+
+def test_float32_within_tolerance():
+    model, X = toy_forest(1)
+    forest = compile_forest(model, "float32", value_dtype=np.float32)
+    assert forest.threshold.dtype == np.float32
+    np.testing.assert_array_equal(forest.apply(X.to_numpy()) - forest.roots, model.apply(X))
+    np.testing.assert_allclose(forest.predict(X.to_numpy()), model.predict(X), rtol=0, atol=PREDICT_ATOL_F32)
+
+
+def test_quantized_within_tolerance(tmp_path):
+    model, X = toy_forest(2)
+    forest = compile_forest(model, "quantized")
+    assert forest.threshold.dtype == np.uint16
+    # Nilai tepat di threshold: x <= t harus tetap ke kiri setelah dikodekan
+    edges = X.to_numpy().copy()
+    edges[:, 0] = np.resize(forest.bins[0], len(edges))
+    for data in (X.to_numpy(), edges):
+        frame = pd.DataFrame(data, columns=FEATURE_COLUMNS)
+        np.testing.assert_array_equal(forest.apply(data) - forest.roots, model.apply(frame))
+        np.testing.assert_allclose(forest.predict(data), model.predict(frame), rtol=0, atol=PREDICT_ATOL)
+
+    path = str(tmp_path / "BBCA.npz")
+    save_compiled(forest, path)
+    np.testing.assert_array_equal(load_compiled(path).predict(X.to_numpy()), forest.predict(X.to_numpy()))
+
+
+def test_nan_goes_right_in_every_mode():
+    model, X = toy_forest(3)
+    data = X.to_numpy()[:5].copy()
+    data[:, 0] = np.nan
+    preds = [compile_forest(model, mode).predict(data) for mode in ("float64", "float32", "quantized")]
+    np.testing.assert_allclose(preds[1], preds[0], atol=PREDICT_ATOL)
+    np.testing.assert_allclose(preds[2], preds[0], atol=PREDICT_ATOL)
+    # Sama dengan mengganti NaN dengan +inf (selalu di atas threshold)
+    right = np.where(np.isnan(data), np.inf, data)
+    np.testing.assert_allclose(preds[0], compile_forest(model, "float64").predict(right), atol=PREDICT_ATOL)
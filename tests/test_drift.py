@@ -0,0 +1,117 @@
+import json
+import sys
+
+import numpy as np
+
+from saham.drift import DriftMonitor, RetrainTrigger, load_reference, reference_stats, retrain_commands
+from saham.indicators import SCALER_COLUMNS
+from saham.service import Predictor
+
+
+def reference(seed=0, rows=200):
+    x = np.random.default_rng(seed).uniform(size=(rows, len(SCALER_COLUMNS)))
+    return reference_stats(x, np.zeros(len(SCALER_COLUMNS)), np.ones(len(SCALER_COLUMNS)), "2024-12-31")
+
+
+def stream(monitor, ticker, days, value):
+    # Bar harian dengan semua fitur = value (skala data_min 0 / data_max 1)
+    dates = np.arange("2025-01-01", "2025-12-31", dtype="datetime64[D]")[:days]
+    monitor.observe({ticker: (dates, np.full((days, len(SCALER_COLUMNS)), value))})
+
+
+class FakeJob:
+    def __init__(self, code=None):
+        self.returncode = code
+
+    def poll(self):
+        return self.returncode
+
+
+def drifted_monitor(ref):
+    monitor = DriftMonitor(reference_loader=lambda t: ref)
+    monitor.add("BBCA", ref)
+    stream(monitor, "BBCA", 40, 1.5)
+    return monitor
+
+
+def test_unchanged_reference_keeps_state():
+    ref = reference()
+    monitor = drifted_monitor(ref)
+    weight = monitor.arrays["weight"].copy()
+    # Retrain yang menghasilkan referensi identik (mis. job gagal): tidak ada reset
+    monitor.refresh_references()
+    np.testing.assert_array_equal(monitor.arrays["weight"], weight)
+    assert "BBCA" in monitor.retrain_candidates()
+
+
+def test_changed_reference_resets_state():
+    monitor = drifted_monitor(reference(0))
+    monitor.reference_loader = lambda t: reference(1)
+    monitor.refresh_references()
+    assert monitor.arrays["weight"].sum() == 0
+    assert monitor.retrain_candidates() == {}
+
+
+def test_trigger_cooldown_and_poll():
+    monitor = drifted_monitor(reference())
+    jobs = []
+
+    def job(tickers):
+        jobs.append(FakeJob())
+        return [jobs[-1]]
+
+    trigger = RetrainTrigger(monitor, job=job, cooldown=20)
+    assert trigger.check("2025-03-03") == ["BBCA"]
+    assert trigger.check("2025-03-04") == []
+    assert trigger.poll() == []
+    jobs[0].returncode = 0
+    assert trigger.poll() == [0]
+    assert trigger.running == []
+    assert trigger.check("2025-04-30") == ["BBCA"]
+
+
+def test_retrain_commands_use_store_history(tmp_path):
+    (tmp_path / "BBCA_raw.csv").write_text("Date,Close\n")
+    commands = retrain_commands(["BBCA", "BBYB"], raw_dir=str(tmp_path), store_dir="store")
+    training, pooled = commands
+    assert training[:3] == [sys.executable, "-m", "saham.training"]
+    assert "BBYB" not in training and training[training.index("--store") + 1] == "store"
+    assert pooled[2] == "saham.pooled" and "--refresh" in pooled and "store" in pooled
+
+
+def test_pooled_ticker_reference(tmp_path):
+    pooled_file = tmp_path / "drift_reference.json"
+    pooled_file.write_text(json.dumps({"BBYB": reference(2)}))
+    ref = load_reference("BBYB", summary_file=str(tmp_path / "none.json"), raw_dir=str(tmp_path),
+                         pooled_file=str(pooled_file))
+    assert ref == json.loads(json.dumps(reference(2)))
+    assert load_reference("XXXX", summary_file=str(tmp_path / "none.json"), raw_dir=str(tmp_path),
+                          pooled_file=str(pooled_file)) is None
+
+
+def test_state_saved_to_loaded_path(tmp_path):
+    path = str(tmp_path / "drift_state_service.npz")
+    monitor = DriftMonitor.load(path, reference_loader=None)
+    monitor.add("BBCA", reference())
+    monitor.save()
+    assert DriftMonitor.load(path, reference_loader=None).tickers == ["BBCA"]
+
+
+def test_predictor_reloads_after_retrain():
+    refs = {"BBCA": reference(0)}
+    monitor = DriftMonitor(reference_loader=lambda t: refs[t])
+    monitor.add("BBCA", refs["BBCA"])
+    stream(monitor, "BBCA", 40, 1.5)
+    monitor.save = lambda path=None: None
+    job = FakeJob()
+    trigger = RetrainTrigger(monitor, job=lambda tickers: [job])
+    predictor = Predictor(lambda t: None, assets={"BBCA": ("model lama", None)}, drift=monitor, retrain=trigger)
+    assert trigger.check("2025-03-03") == ["BBCA"]
+
+    predictor.observe({}, {})
+    assert "BBCA" in predictor.assets
+    job.returncode = 0
+    refs["BBCA"] = reference(1)
+    predictor.observe({}, {})
+    assert predictor.assets == {}
+    assert monitor.arrays["weight"].sum() == 0
@@ -0,0 +1,89 @@
+import pandas as pd
+
+from saham.market_cache import FakeMarketFetcher, FetchError, MarketDataCache, Prefetcher, store_loader
+from saham.price_store import PriceStore
+from tests.test_price_store import bars
+
+
+class SessionFetcher:
+    # Yahoo tiruan: bar hari berjalan berubah antar panggilan
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = 0
+
+    def __call__(self, ticker, start, end):
+        self.calls += 1
+        df = self.frame
+        return df.loc[(df.index >= start) & (df.index < end)]
+
+
+def session_store(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append("BBCA", bars(["2025-01-06", "2025-01-07"], close=[100, 101]))
+    fetcher = SessionFetcher(bars(["2025-01-06", "2025-01-07", "2025-01-08"], close=[100, 101, 105],
+                                  volume=[1e6, 1e6, 2e5]))
+    return store, fetcher
+
+
+def test_forced_refresh_replaces_session_bar(tmp_path, monkeypatch):
+    monkeypatch.setattr(pd.Timestamp, "today", classmethod(lambda cls: pd.Timestamp("2025-01-08 10:00")))
+    store, fetcher = session_store(tmp_path)
+    cache = MarketDataCache(store_loader(store, fetcher), ttl=3600)
+    assert cache.get("BBCA", "1d", "60d")["Close"].iloc[-1] == 105
+
+    fetcher.frame = bars(["2025-01-06", "2025-01-07", "2025-01-08"], close=[100, 101, 98], volume=[1e6, 1e6, 3e6])
+    assert cache.get("BBCA", "1d", "60d")["Close"].iloc[-1] == 105  # masih dalam TTL
+    window = cache.get("BBCA", "1d", "60d", force=True)
+    assert window["Close"].iloc[-1] == 98
+    assert window["Volume"].iloc[-1] == 3e6
+    assert len(window) == 3
+
+
+def test_prefetcher_rounds_track_session_close(tmp_path, monkeypatch):
+    monkeypatch.setattr(pd.Timestamp, "today", classmethod(lambda cls: pd.Timestamp("2025-01-08 10:00")))
+    store, fetcher = session_store(tmp_path)
+    cache = MarketDataCache(store_loader(store, fetcher), ttl=3600)
+    prefetcher = Prefetcher(cache, ["BBCA"], is_open=lambda: True)
+    closes = []
+    for close in (105, 103, 98):
+        fetcher.frame = bars(["2025-01-06", "2025-01-07", "2025-01-08"], close=[100, 101, close])
+        prefetcher.run_once()
+        closes.append(cache.get("BBCA", "1d", "60d")["Close"].iloc[-1])
+    assert closes == [105, 103, 98]
+    assert store.rows("BBCA") == 3
+
+
+def test_failed_fetch_serves_stale_then_raises_without_entry():
+    frames = {"BBCA": bars(["2025-01-06", "2025-01-07"])}
+    fetch = FakeMarketFetcher(frames)
+    cache = MarketDataCache(fetch, retries=2, backoff=0.0, sleep=lambda s: None)
+    first = cache.get("BBCA")
+    fetch.failures = 2
+    assert cache.get("BBCA", force=True) is first
+    fetch.failures = 2
+    try:
+        cache.get("BBRI")
+    except FetchError:
+        pass
+    else:
+        raise AssertionError("FetchError diharapkan tanpa entri lama")
+
+
+def test_store_loader_empty_download_is_fetch_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(pd.Timestamp, "today", classmethod(lambda cls: pd.Timestamp("2025-01-08 10:00")))
+    store = PriceStore(str(tmp_path))
+    store.append("BBCA", bars(["2025-01-03", "2025-01-06"], close=[100, 101]))
+    # Seperti YahooFetcher saat unduhan gagal: frame kosong, bukan exception
+    down = SessionFetcher(bars(["2025-01-03"], close=100))
+    cache = MarketDataCache(store_loader(store, down), retries=2, backoff=0.0, sleep=lambda s: None)
+    try:
+        cache.get("BBCA", "1d", "60d")
+        raise AssertionError("FetchError diharapkan: bar 2025-01-07 belum ada")
+    except FetchError:
+        pass
+    assert down.calls == 2
+    assert cache.stats()["errors"] == 2
+
+    # Sesi berjalan tanpa bar baru (bar terakhir = sesi tutup terakhir): bukan error
+    store.append("BBCA", bars(["2025-01-07"], close=102))
+    assert cache.get("BBCA", "1d", "60d")["Close"].iloc[-1] == 102
@@ -0,0 +1,91 @@
+import pandas as pd
+
+from saham.market_cache import MarketDataCache, Prefetcher, store_loader
+from saham.market_fetch import fetch_many, refresh_many, split_download, store_fallback
+from saham.price_store import FakeFetcher, PriceStore
+from tests.test_market_cache import SessionFetcher, session_store
+from tests.test_price_store import bars
+
+DATES = ["2025-01-06", "2025-01-07", "2025-01-08"]
+
+
+def test_split_download_multiindex():
+    frames = {f"{t}.JK": bars(DATES, close=c) for t, c in (("BBCA", 100), ("BBRI", 50))}
+    data = pd.concat(frames, axis=1)
+    out = split_download(data, ["BBCA", "BBRI", "BMRI"])
+    assert sorted(out) == ["BBCA", "BBRI"]
+    assert out["BBRI"]["Close"].tolist() == [50, 50, 50]
+
+
+def test_bulk_failure_falls_back_to_store(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append("BBCA", bars(DATES, close=[100, 101, 102]))
+
+    def bulk(tickers, start, end):
+        raise ConnectionError("yahoo down")
+
+    frames, report = fetch_many(["BBCA", "BBRI"], "2025-01-01", "2025-01-09", bulk=bulk,
+                                fallback=store_fallback(store))
+    assert list(frames) == ["BBCA"]
+    assert frames["BBCA"]["Close"].tolist() == [100, 101, 102]
+    assert report["sources"] == {"BBCA": "fallback", "BBRI": "missing"}
+    assert "yahoo down" in report["errors"]["BBRI"]
+
+
+def test_per_ticker_partial_failure(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append("BBRI", bars(DATES, close=50))
+
+    def one(ticker, start, end):
+        if ticker == "BBRI":
+            raise ConnectionError("timeout")
+        return bars(DATES, close=100)
+
+    frames, report = fetch_many(["BBCA", "BBRI"], "2025-01-01", "2025-01-09", fetch_one=one,
+                                fallback=store_fallback(store))
+    assert report["sources"] == {"BBCA": "network", "BBRI": "fallback"}
+    assert frames["BBRI"]["Close"].iloc[-1] == 50
+
+
+def test_refresh_many_reports_errors(tmp_path):
+    store = PriceStore(str(tmp_path))
+    fetcher = FakeFetcher({"BBCA": bars(DATES)})
+
+    class Broken:
+        def __call__(self, ticker, start, end):
+            if ticker == "BBRI":
+                raise ConnectionError("timeout")
+            return fetcher(ticker, start, end)
+
+    result = refresh_many(store, ["BBCA", "BBRI"], Broken(), today="2025-01-08")
+    assert result["BBCA"] == 3
+    assert "timeout" in result["BBRI"]
+
+
+def test_prefetcher_store_path_fills_cache_without_second_fetch(tmp_path, monkeypatch):
+    monkeypatch.setattr(pd.Timestamp, "today", classmethod(lambda cls: pd.Timestamp("2025-01-08 10:00")))
+    store, fetcher = session_store(tmp_path)
+    cache = MarketDataCache(store_loader(store, fetcher), ttl=3600)
+    prefetcher = Prefetcher(cache, ["BBCA"], is_open=lambda: True, store=store, fetcher=fetcher)
+    closes = []
+    for close in (105, 98):
+        fetcher.frame = bars(DATES, close=[100, 101, close])
+        prefetcher.run_once()
+        closes.append(cache.get("BBCA", "1d", "60d")["Close"].iloc[-1])
+    assert closes == [105, 98]
+    assert fetcher.calls == 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_prefetcher_store_path_keeps_entry_on_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(pd.Timestamp, "today", classmethod(lambda cls: pd.Timestamp("2025-01-08 10:00")))
+    store, fetcher = session_store(tmp_path)
+    cache = MarketDataCache(store_loader(store, fetcher), ttl=3600)
+    first = cache.get("BBCA", "1d", "60d")
+
+    class Down(SessionFetcher):
+        def __call__(self, ticker, start, end):
+            raise ConnectionError("timeout")
+
+    Prefetcher(cache, ["BBCA"], store=store, fetcher=Down(None)).run_once()
+    assert cache.get("BBCA", "1d", "60d") is first
@@ -0,0 +1,41 @@
+import numpy as np
+
+from benchmarks._synthetic import synthetic_ohlcv, synthetic_tickers
+from saham.panel import Panel
+from saham.pooled import fit_pooled, panel_minmax
+
+
+def panel(n=3, years=1):
+    return Panel.from_frames({t: synthetic_ohlcv(t, years) for t in synthetic_tickers(n)})
+
+
+def test_minmax_uses_selected_rows_only():
+    p = panel()
+    train = p.train_mask(0.8)
+    data_min, data_max = panel_minmax(p, train)
+    values = np.column_stack([p.close, p.X])
+    for i in range(len(p.tickers)):
+        block = slice(p.offsets[i], p.offsets[i + 1])
+        rows = values[block][train[block]]
+        np.testing.assert_array_equal(data_min[i], rows.min(axis=0))
+        np.testing.assert_array_equal(data_max[i], rows.max(axis=0))
+
+
+def test_minmax_without_selected_rows_falls_back_to_all():
+    p = panel(n=2)
+    rows = np.zeros(p.n_rows, dtype=bool)
+    rows[p.offsets[0]:p.offsets[1]] = True
+    full_min, full_max = panel_minmax(p)
+    data_min, data_max = panel_minmax(p, rows)
+    np.testing.assert_array_equal(data_min[1], full_min[1])
+    np.testing.assert_array_equal(data_max[1], full_max[1])
+
+
+def test_fit_pooled_scaler_ignores_test_rows():
+    p = panel()
+    pooled = fit_pooled(p, {"n_estimators": 5, "max_depth": 4}, train_ratio=0.8)
+    train = p.train_mask(0.8)
+    for i in range(len(p.tickers)):
+        block = slice(p.offsets[i], p.offsets[i + 1])
+        assert pooled.data_max[i, 0] == p.close[block][train[block]].max()
+    assert pooled.metrics["rows"]["test"] == int((~train).sum())
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from saham.price_store import FakeFetcher, PriceStore
+
+
+def bars(dates, close=100.0, volume=1e6):
+    index = pd.DatetimeIndex(pd.to_datetime(dates), name="Date")
+    close = np.broadcast_to(np.asarray(close, dtype=float), (len(index),))
+    return pd.DataFrame({"Close": close, "High": close + 1, "Low": close - 1, "Open": close,
+                         "Volume": np.broadcast_to(np.asarray(volume, dtype=float), (len(index),))}, index=index)
+
+
+def test_empty_store_reads_and_refresh(tmp_path):
+    store = PriceStore(str(tmp_path))
+    assert store.read("BBCA").empty
+    assert store.tail("BBCA", 60).empty
+    assert store.last_date("BBCA") is None
+    assert store.refresh("BBCA", FakeFetcher({}), today="2025-01-10") == 0
+    assert not store.has("BBCA")
+
+
+def test_append_skips_old_and_unchanged_bars(tmp_path):
+    store = PriceStore(str(tmp_path))
+    df = bars(["2025-01-06", "2025-01-07", "2025-01-08"], close=[100, 101, 102])
+    assert store.append("BBCA", df) == 3
+    assert store.append("BBCA", df) == 0
+    assert store.rows("BBCA") == 3
+
+
+def test_same_day_refresh_replaces_partial_bar(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append("BBCA", bars(["2025-01-06", "2025-01-07"], close=[100, 101]))
+    # Refresh di tengah sesi 2025-01-08: bar belum final
+    partial = bars(["2025-01-06", "2025-01-07", "2025-01-08"], close=[100, 101, 105], volume=[1e6, 1e6, 2e5])
+    assert store.refresh("BBCA", FakeFetcher({"BBCA": partial}), today="2025-01-08") == 1
+    # Refresh berikutnya di hari yang sama membawa bar final
+    final = bars(["2025-01-06", "2025-01-07", "2025-01-08"], close=[100, 101, 98], volume=[1e6, 1e6, 3e6])
+    assert store.refresh("BBCA", FakeFetcher({"BBCA": final}), today="2025-01-08") == 1
+    stored = store.read("BBCA")
+    assert len(stored) == 3
+    assert stored["Close"].iloc[-1] == 98
+    assert stored["Volume"].iloc[-1] == 3e6
+    assert stored["Close"].iloc[:2].tolist() == [100, 101]
+
+
+def test_refresh_replaces_last_bar_and_appends_new(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append("BBCA", bars(["2025-01-06", "2025-01-07"], close=[100, 101]))
+    later = bars(["2025-01-07", "2025-01-08", "2025-01-09"], close=[99, 102, 103])
+    assert store.refresh("BBCA", FakeFetcher({"BBCA": later}), today="2025-01-09") == 3
+    assert store.read("BBCA")["Close"].tolist() == [100, 99, 102, 103]
+    assert store.last_date("BBCA") == pd.Timestamp("2025-01-09")
+
+
+def test_unrecorded_tail_is_truncated(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append("BBCA", bars(["2025-01-06", "2025-01-07"], close=[100, 101]))
+    # Simulasi proses terhenti: byte ekstra di file kolom tanpa update meta.json
+    with open(tmp_path / "BBCA" / "Close.f64", "ab") as f:
+        f.write(np.float64(555.0).tobytes())
+    store.append("BBCA", bars(["2025-01-08"], close=[102]))
+    assert store.read("BBCA")["Close"].tolist() == [100, 101, 102]
+    assert (tmp_path / "BBCA" / "Close.f64").stat().st_size == 3 * 8
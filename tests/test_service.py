@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+import pandas as pd
+
+from saham.service import MicroBatcher, Predictor, PredictionService
+
+
+class Source:
+    # window_source yang mencatat ticker yang diminta
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def __call__(self, ticker):
+        self.calls.append(ticker)
+        if self.error is not None:
+            raise self.error
+        raise AssertionError("tidak dipakai")
+
+
+def request(service, raw):
+    async def run():
+        server = await service.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            data = await reader.read()
+            writer.close()
+            return data
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+    head, _, body = asyncio.run(run()).partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def get(path):
+    return f"GET {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n".encode()
+
+
+def test_unknown_ticker_rejected_before_fetch():
+    source = Source()
+    service = PredictionService(Predictor(source), universe=["BBCA"])
+    status, payload = request(service, get("/predict?tickers=BBCA,../../etc/passwd"))
+    assert status == 400
+    assert "../../ETC/PASSWD" in payload["error"]
+    assert source.calls == []
+
+
+def test_post_tickers_must_be_list():
+    service = PredictionService(Predictor(Source()), universe=["BBCA"])
+    body = b'{"tickers": "BBCA"}'
+    raw = (f"POST /predict HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body
+    assert request(service, raw)[0] == 400
+
+
+def test_bad_content_length_is_400():
+    service = PredictionService(Predictor(Source()), universe=["BBCA"])
+    raw = b"POST /predict HTTP/1.1\r\nContent-Length: abc\r\n\r\n"
+    status, payload = request(service, raw)
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_unexpected_error_is_500():
+    source = Source(error=RuntimeError("store rusak"))
+    service = PredictionService(Predictor(source, assets={"BBCA": ("model", None)}), universe=["BBCA"])
+    status, payload = request(service, get("/predict?tickers=BBCA"))
+    assert status == 500
+    assert "store rusak" in payload["error"]
+    assert source.calls == ["BBCA"]
+
+
+def test_missing_model_not_cached(monkeypatch):
+    import saham.service as service
+
+    calls = []
+
+    def fake_load(ticker, compiled=False):
+        calls.append(ticker)
+        return (None, None) if len(calls) == 1 else ("model", "scaler")
+
+    monkeypatch.setattr(service, "load_assets", fake_load)
+    predictor = Predictor(Source())
+    assert predictor.load("BBCA") == (None, None)
+    assert predictor.load("BBCA") == ("model", "scaler")
+    assert predictor.load("BBCA") == ("model", "scaler")
+    assert calls == ["BBCA", "BBCA"]
+
+
+def test_pooled_fallback_and_no_fetch_without_model(monkeypatch):
+    import saham.service as service
+
+    class Pooled:
+        def __contains__(self, ticker):
+            return ticker == "BBYB"
+
+        def assets(self, ticker):
+            return "forest pooled", f"scaler {ticker}"
+
+    monkeypatch.setattr(service, "load_assets", lambda ticker, compiled=False: (None, None))
+    monkeypatch.setattr(service, "load_pooled", lambda folder: Pooled())
+    source = Source()
+    predictor = Predictor(source, pooled_dir="pooled")
+    assert predictor.load("BBYB") == ("forest pooled", "scaler BBYB")
+    status, payload = request(PredictionService(predictor, universe=["XXXX"]), get("/predict?tickers=XXXX"))
+    assert status == 200
+    assert payload["results"] == [{"ticker": "XXXX", "error": "model atau data tidak tersedia"}]
+    assert source.calls == []
+
+
+class FlakyPredictor:
+    # Skoring gagal bila batch memuat ticker BAD
+    drift = None
+
+    def __init__(self):
+        self.calls = []
+
+    def score(self, windows):
+        self.calls.append(sorted(windows))
+        if "BAD" in windows:
+            raise ValueError("window BAD rusak")
+        return pd.DataFrame({"last_date": "2025-01-08", "last_close": 100.0, "pred_today": 101.0,
+                             "pred_next": 102.0}, index=list(windows))
+
+
+def test_batch_failure_stays_with_ticker():
+    predictor = FlakyPredictor()
+
+    async def run():
+        batcher = MicroBatcher(predictor, max_batch=4, max_wait_ms=50).start()
+        try:
+            return await asyncio.gather(batcher.submit("BBCA", None), batcher.submit("BAD", None),
+                                        return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    good, bad = asyncio.run(run())
+    assert good["pred_next"] == 102.0
+    assert isinstance(bad, ValueError)
+    assert predictor.calls[0] == ["BAD", "BBCA"]
+
+
+def test_drift_state_saved_outside_scoring():
+    class Monitor:
+        saves = 0
+
+        def observe_windows(self, windows):
+            return ["BBCA"]
+
+        def save(self):
+            self.saves += 1
+
+    monitor = Monitor()
+    predictor = Predictor(Source(), drift=monitor)
+    for _ in range(3):
+        predictor.observe({}, {})
+    assert monitor.saves == 0
+    assert predictor.save_drift() and not predictor.save_drift()
+    assert monitor.saves == 1
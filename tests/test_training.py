@@ -0,0 +1,80 @@
+from saham.price_store import FakeFetcher, PriceStore
+from saham.training import read_history
+from tests.test_price_store import bars
+
+
+def write_raw(folder, ticker, df):
+    # Format Data/Raw hasil yf.download: baris header kedua berisi simbol
+    lines = ["Date,Close,High,Low,Open,Volume", f",{ticker}.JK,{ticker}.JK,{ticker}.JK,{ticker}.JK,{ticker}.JK"]
+    lines += [f"{d:%Y-%m-%d},{r.Close},{r.High},{r.Low},{r.Open},{r.Volume}" for d, r in df.iterrows()]
+    (folder / f"{ticker}_raw.csv").write_text("\n".join(lines) + "\n")
+
+
+def test_store_history_includes_live_bars(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    write_raw(raw_dir, "BBCA", bars(["2025-01-06", "2025-01-07"], close=[100, 101]))
+    store_dir = str(tmp_path / "store")
+    assert read_history("BBCA", str(raw_dir))["Close"].tolist() == [100, 101]
+
+    live = bars(["2025-01-07", "2025-01-08"], close=[101, 102])
+    store = PriceStore(store_dir)
+    store.seed_from_raw("BBCA", str(raw_dir))
+    store.refresh("BBCA", FakeFetcher({"BBCA": live}), today="2025-01-08")
+    assert read_history("BBCA", str(raw_dir), store_dir)["Close"].tolist() == [100, 101, 102]
+    # Data/Raw statis tidak berubah
+    assert len(read_history("BBCA", str(raw_dir))) == 2
+
+
+def test_store_retrain_artifacts_descale_with_store_range(tmp_path, monkeypatch):
+    from benchmarks._synthetic import synthetic_ohlcv
+    from saham import charts
+    from saham.training import run_pipeline
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    history = synthetic_ohlcv("BBCA", 2)
+    write_raw(raw_dir, "BBCA", history.iloc[:-20])
+    store_dir = str(tmp_path / "store")
+    store = PriceStore(store_dir)
+    store.seed_from_raw("BBCA", str(raw_dir))
+    # Bar live dengan Close jauh di atas rentang Data/Raw
+    live = history.iloc[-20:].copy()
+    live[["Close", "High", "Low", "Open"]] *= 1.5
+    store.append("BBCA", live)
+
+    summary, _ = run_pipeline(["BBCA"], jobs=1, raw_dir=str(raw_dir), out_dir=str(tmp_path), params_from=None,
+                              param_overrides={"BBCA": {"n_estimators": 5, "max_depth": 4}}, store_dir=store_dir)
+    assert summary["BBCA"]["file"].startswith("PriceStore")
+    assert summary["BBCA"]["rows"] == len(history)
+
+    monkeypatch.chdir(tmp_path)
+    pred = charts._predictions("BBCA")
+    expected = store.read("BBCA")["Close"].reindex(pred.index)
+    assert abs(pred["Actual"] - expected).max() < 1e-6 * expected.max()
+    assert pred.index[-1] == history.index[-1]
+
+
+def test_prune_keeps_full_importance_report(tmp_path):
+    import pandas as pd
+
+    from benchmarks._synthetic import synthetic_ohlcv
+    from saham.indicators import FEATURE_COLUMNS
+    from saham.training import run_pipeline
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    write_raw(raw_dir, "BBCA", synthetic_ohlcv("BBCA", 2))
+    params = {"BBCA": {"n_estimators": 5, "max_depth": 4}}
+    for _ in range(2):
+        summary, _ = run_pipeline(["BBCA"], jobs=1, raw_dir=str(raw_dir), out_dir=str(tmp_path), params_from=None,
+                                  param_overrides=params, prune="bank")
+        report = pd.read_csv(tmp_path / "Feature_Importance" / "BBCA_feature_importance.csv")
+        pruning = summary["BBCA"]["pruning"]
+        # Laporan dari model penuh: fitur yang dibuang tetap punya importance,
+        # jadi run --prune berikutnya tidak hanya memilih ulang set lama
+        dropped = report[~report["Feature"].isin(pruning["features"])]
+        assert sorted(report["Feature"]) == sorted(FEATURE_COLUMNS)
+        assert dropped["Importance"].sum() > 0
+    assert sorted(pruning["importance"]) == sorted(pruning["features"])
+    assert len(pruning["features"]) < len(FEATURE_COLUMNS)